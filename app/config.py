@@ -1,21 +1,24 @@
 import os
 import logging
 import sys
+import tempfile
 
 from dotenv import load_dotenv
 from datetime import timedelta
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
+from redis.asyncio import Redis
 
 from app.models.user import User
 from app.models.coach_profile import CoachProfile
 from app.models.coach_code import CoachCode
 from app.models.mentee_profile import MenteeProfile
-from app.models.physical_data import WeightRecord, ChestMeasurement, WaistMeasurement, HipsMeasurement, NeckMeasurement, \
-    LegMeasurement, ArmMeasurement, CalfMeasurement
+from app.models.physical_data import BodyMeasurement
+from app.models.latest_measurements import LatestMeasurements
 from app.models.workout_plan import WorkoutPlan
 from app.models.macronutrients import Macronutrients
 from app.models.meal_plan import MealPlan
+from app.utils.mongo_metrics import MongoCommandMetrics
 
 load_dotenv()
 
@@ -29,9 +32,44 @@ MONGO_URI = os.getenv("MONGO_URI")
 DATABASE_NAME = os.getenv("DATABASE_NAME")
 REDIS_URL = os.getenv("REDIS_URL")
 
-client = AsyncIOMotorClient(MONGO_URI)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "32"))
+PASSWORD_HASH_TIMEOUT_SECONDS = float(os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "5"))
+
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+TOKEN_CACHE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "300"))
+TOKEN_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("TOKEN_CACHE_NEGATIVE_TTL_SECONDS", "60"))
+
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_LOCAL_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_LOCAL_TTL_SECONDS", "30"))
+
+CMS_CACHE_SOFT_TTL_SECONDS = int(os.getenv("CMS_CACHE_SOFT_TTL_SECONDS", "900"))
+CMS_CACHE_HARD_TTL_SECONDS = int(os.getenv("CMS_CACHE_HARD_TTL_SECONDS", "86400"))
+SWR_REFRESH_LOCK_SECONDS = int(os.getenv("SWR_REFRESH_LOCK_SECONDS", "30"))
+SWR_PARTIAL_SOFT_TTL_SECONDS = int(os.getenv("SWR_PARTIAL_SOFT_TTL_SECONDS", "60"))
+CMS_FAN_OUT_DEADLINE_SECONDS = float(os.getenv("CMS_FAN_OUT_DEADLINE_SECONDS", "5"))
+
+CONTENT_SNAPSHOT_PATH = os.getenv(
+    "CONTENT_SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "dreamfit-content.snapshot")
+)
+CONTENT_SNAPSHOT_REFRESH_SECONDS = int(os.getenv("CONTENT_SNAPSHOT_REFRESH_SECONDS", "600"))
+CONTENT_SNAPSHOT_CHECK_SECONDS = int(os.getenv("CONTENT_SNAPSHOT_CHECK_SECONDS", "15"))
+
+CMS_WEBHOOK_SECRET = os.getenv("CMS_WEBHOOK_SECRET")
+CMS_WEBHOOK_TOLERANCE_SECONDS = int(os.getenv("CMS_WEBHOOK_TOLERANCE_SECONDS", "300"))
+
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+HTTP_MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTP_MAX_KEEPALIVE_PER_HOST", "10"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+
+client = AsyncIOMotorClient(MONGO_URI, event_listeners=[MongoCommandMetrics()])
 db = client[DATABASE_NAME]
 
+redis_client = Redis.from_url(REDIS_URL) if REDIS_URL else None
+
 
 def setup_logging():
     log_format = "%(asctime)s | %(levelname)s | %(name)s:%(lineno)d | %(funcName)s | %(message)s"
@@ -62,30 +100,69 @@ def setup_logging():
 app_logger = setup_logging()
 
 
+DOCUMENT_MODELS = [
+    User,
+    CoachProfile,
+    CoachCode,
+    MenteeProfile,
+    BodyMeasurement,
+    LatestMeasurements,
+    WorkoutPlan,
+    Macronutrients,
+    MealPlan,
+]
+
+
+async def sync_indexes(document_models) -> int:
+    drift_count = 0
+
+    for model in document_models:
+        declared = {index.document["name"]: index for index in model.get_settings().indexes or []}
+        if not declared:
+            continue
+
+        collection = model.get_motor_collection()
+        existing = await collection.index_information()
+
+        for name, index in declared.items():
+            declared_keys = list(index.document["key"].items())
+            if name in existing:
+                if list(existing[name]["key"]) != declared_keys or \
+                        bool(existing[name].get("unique")) != bool(index.document.get("unique")):
+                    drift_count += 1
+                    app_logger.warning(
+                        f"INDEX_DRIFT | Collection: {collection.name} | Index: {name} | "
+                        f"Declared: {declared_keys} | Existing: {existing[name]['key']}"
+                    )
+                continue
+
+            try:
+                await collection.create_indexes([index])
+                app_logger.info(f"INDEX_CREATED | Collection: {collection.name} | Index: {name}")
+            except Exception as e:
+                drift_count += 1
+                app_logger.error(
+                    f"INDEX_CREATE_FAILED | Collection: {collection.name} | Index: {name} | Error: {str(e)}"
+                )
+
+        for name in existing:
+            if name != "_id_" and name not in declared:
+                drift_count += 1
+                app_logger.warning(f"INDEX_UNDECLARED | Collection: {collection.name} | Index: {name}")
+
+    return drift_count
+
+
 async def init_db():
     try:
         app_logger.info("Iniciando conexión a la base de datos...")
         await init_beanie(
             database=db,
-            document_models=[
-                User,
-                CoachProfile,
-                CoachCode,
-                MenteeProfile,
-                WeightRecord,
-                ChestMeasurement,
-                WaistMeasurement,
-                HipsMeasurement,
-                NeckMeasurement,
-                LegMeasurement,
-                ArmMeasurement,
-                CalfMeasurement,
-                WorkoutPlan,
-                Macronutrients,
-                MealPlan,
-            ]
+            document_models=DOCUMENT_MODELS,
+            skip_indexes=True
         )
-        app_logger.info("Base de datos inicializada correctamente")
+        drift_count = await sync_indexes(DOCUMENT_MODELS)
+        app_logger.info(f"Base de datos inicializada correctamente | Index drift: {drift_count}")
     except Exception as e:
         app_logger.error(f"Error al inicializar la base de datos: {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
@@ -144,4 +144,39 @@ class AuthController:
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content=ResponsePayload.create("Internal server error", {})
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    @router.post("/logout")
+    async def logout(token_request: TokenRefreshRequest, request: Request):
+        client_ip = request.client.host if request.client else "unknown"
+
+        auth_logger.info(f"LOGOUT_ATTEMPT | IP: {client_ip}")
+
+        try:
+            await UserService.logout(token_request.refresh_token)
+
+            auth_logger.info(f"LOGOUT_SUCCESS | IP: {client_ip}")
+
+            return JSONResponse(
+                status_code=status.HTTP_200_OK,
+                content=ResponsePayload.create("User logged out successfully", {})
+            )
+
+        except HTTPException as e:
+            auth_logger.warning(
+                f"LOGOUT_FAILED | Error: {e.detail} | "
+                f"Status: {e.status_code} | IP: {client_ip}"
+            )
+            return JSONResponse(
+                status_code=e.status_code,
+                content=ResponsePayload.create(e.detail, {})
+            )
+        except Exception as e:
+            auth_logger.error(
+                f"LOGOUT_ERROR | Unexpected error: {str(e)} | IP: {client_ip}"
+            )
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content=ResponsePayload.create("Internal server error", {})
+            )
@@ -1,10 +1,14 @@
 import logging
-from fastapi import APIRouter, status, Depends, HTTPException, Request
+import time
+from fastapi import APIRouter, BackgroundTasks, status, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 
 from app.services.content_service import ContentService
+from app.schemas.content_schema import CmsWebhookEvent
 from app.schemas.response_schemas import ResponsePayload
+from app.utils.compression_utils import CompressionUtils
 from app.security.auth_middleware import require_roles
+from app.security.webhook_signature import require_cms_signature
 from app.utils.enums import RoleName
 
 content_logger = logging.getLogger("dreamfit_api.content")
@@ -26,7 +30,15 @@ class ContentController:
         )
 
         try:
-            workouts = await ContentService.get_workouts()
+            rendered = ContentService.get_rendered("workouts")
+            if rendered is not None:
+                body, cache_age = rendered
+                content_logger.info(f"GET_WORKOUTS_SUCCESS | Source: snapshot | RequestedBy: {logged_user_id} | IP: {client_ip}")
+                response = CompressionUtils.json_response(request, body)
+                response.headers["X-Cache-Age"] = str(cache_age)
+                return response
+
+            workouts, cache_age = await ContentService.get_workouts()
             workout_count = len(workouts) if workouts else 0
 
             content_logger.info(
@@ -37,6 +49,7 @@ class ContentController:
             payload = {"muscularGroups": workouts}
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
+                headers={"X-Cache-Age": str(cache_age)},
                 content=ResponsePayload.create("OK", payload)
             )
 
@@ -72,7 +85,15 @@ class ContentController:
         )
 
         try:
-            training_options = await ContentService.get_training_options()
+            rendered = ContentService.get_rendered("training-options")
+            if rendered is not None:
+                body, cache_age = rendered
+                content_logger.info(f"GET_TRAINING_OPTIONS_SUCCESS | Source: snapshot | RequestedBy: {logged_user_id} | IP: {client_ip}")
+                response = CompressionUtils.json_response(request, body)
+                response.headers["X-Cache-Age"] = str(cache_age)
+                return response
+
+            training_options, cache_age = await ContentService.get_training_options()
 
             elements_count = len(training_options.get("elements", []))
             technics_count = len(training_options.get("technics", []))
@@ -86,6 +107,7 @@ class ContentController:
 
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
+                headers={"X-Cache-Age": str(cache_age)},
                 content=ResponsePayload.create("OK", training_options)
             )
 
@@ -118,7 +140,15 @@ class ContentController:
         )
 
         try:
-            plans = await ContentService.get_plans()
+            rendered = ContentService.get_rendered("plans")
+            if rendered is not None:
+                body, cache_age = rendered
+                content_logger.info(f"GET_PLANS_SUCCESS | Source: snapshot | IP: {client_ip}")
+                response = CompressionUtils.json_response(request, body)
+                response.headers["X-Cache-Age"] = str(cache_age)
+                return response
+
+            plans, cache_age = await ContentService.get_plans()
             plan_count = len(plans) if plans else 0
 
             content_logger.info(
@@ -128,6 +158,7 @@ class ContentController:
             payload = {"plans": plans}
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
+                headers={"X-Cache-Age": str(cache_age)},
                 content=ResponsePayload.create("OK", payload)
             )
 
@@ -147,4 +178,26 @@ class ContentController:
             return JSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content=ResponsePayload.create("Internal server error", {})
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    @router.post("/webhook", dependencies=[Depends(require_cms_signature)])
+    async def cms_webhook(
+            event: CmsWebhookEvent,
+            request: Request,
+            background_tasks: BackgroundTasks
+    ):
+        client_ip = request.client.host if request.client else "unknown"
+        sections = ContentService.sections_for_event(event.event, event.model)
+
+        content_logger.info(
+            f"CMS_WEBHOOK | Event: {event.event} | Model: {event.model} | Sections: {sections} | IP: {client_ip}"
+        )
+
+        if sections:
+            background_tasks.add_task(ContentService.handle_cms_event, sections, time.time())
+
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=ResponsePayload.create("Accepted", {"sections": sections})
+        )
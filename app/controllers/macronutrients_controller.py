@@ -11,6 +11,7 @@ from app.schemas.macronutrients_schema import (
 from app.schemas.response_schemas import ResponsePayload
 from app.security.auth_middleware import require_roles
 from app.utils.enums import RoleName
+from app.utils.response_cache import ResponseCache
 
 macronutrients_logger = logging.getLogger("dreamfit_api.macronutrients")
 
@@ -117,6 +118,7 @@ class MacronutrientsController:
 
     @staticmethod
     @router.get("/mentee/{mentee_id}/latest")
+    @ResponseCache.cached("latest_macronutrients", ttl=300, tags=lambda params: [f"macros:{params['mentee_id']}"])
     async def get_latest_macronutrients_by_mentee(
             mentee_id: str,
             request: Request,
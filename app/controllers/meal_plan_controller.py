@@ -6,7 +6,9 @@ from app.services.meal_plan_service import MealPlanService
 from app.schemas.meal_plan_schema import CreateMealPlanRequest
 from app.schemas.response_schemas import ResponsePayload
 from app.security.auth_middleware import require_roles
+from app.utils.compression_utils import CompressionUtils
 from app.utils.enums import RoleName
+from app.utils.response_cache import ResponseCache
 
 meal_plan_logger = logging.getLogger("dreamfit_api.meal_plan")
 
@@ -68,6 +70,7 @@ class MealPlanController:
 
     @staticmethod
     @router.get("/mentee/{mentee_id}")
+    @ResponseCache.cached("meal_plan", ttl=300, tags=lambda params: [f"meal-plan:{params['mentee_id']}"])
     async def get_meal_plan(
             mentee_id: str,
             request: Request,
@@ -81,20 +84,17 @@ class MealPlanController:
         )
 
         try:
-            meal_plan = await MealPlanService.get_meal_plan_by_mentee(
+            plan_id, body = await MealPlanService.get_meal_plan_by_mentee(
                 mentee_id=mentee_id,
                 logged_user_id=logged_user_id
             )
 
             meal_plan_logger.info(
-                f"GET_MEAL_PLAN_SUCCESS | MenteeID: {mentee_id} | "
+                f"GET_MEAL_PLAN_SUCCESS | MenteeID: {mentee_id} | PlanID: {plan_id} | "
                 f"RequestedBy: {logged_user_id} | IP: {client_ip}"
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_200_OK,
-                content=ResponsePayload.create("OK", meal_plan)
-            )
+            return CompressionUtils.json_response(request, body)
 
         except HTTPException as e:
             meal_plan_logger.warning(
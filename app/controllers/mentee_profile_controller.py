@@ -1,11 +1,11 @@
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, status, Depends, HTTPException, Request
+from fastapi import APIRouter, status, Depends, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
 from fastapi.encoders import jsonable_encoder
 
-from app.services.mentee_profile_service import MenteeProfileService
+from app.services.mentee_profile_service import MenteeProfileService, MENTEES_DEFAULT_LIMIT, MENTEES_MAX_LIMIT
 from app.schemas.physical_data_schema import RequestPhysicalData
 from app.schemas.response_schemas import ResponsePayload
 from app.schemas.mentee_profile_schema import MenteeProfileResponse, UpdateMenteeProfileRequest, \
@@ -13,6 +13,7 @@ from app.schemas.mentee_profile_schema import MenteeProfileResponse, UpdateMente
 from app.security.auth_middleware import require_roles
 from app.utils.requestor_utils import RequestorUtils
 from app.utils.enums import RoleName
+from app.utils.response_cache import ResponseCache
 
 mentee_logger = logging.getLogger("dreamfit_api.mentee_profile")
 
@@ -25,6 +26,9 @@ class MenteeProfileController:
     async def get_by_coach(
             coach_id: str,
             request: Request,
+            name: Optional[str] = Query(None, min_length=1, max_length=100),
+            cursor: Optional[str] = None,
+            limit: int = Query(MENTEES_DEFAULT_LIMIT, ge=1, le=MENTEES_MAX_LIMIT),
             logged_user_id: str = Depends(require_roles([RoleName.coach]))
     ):
         client_ip = request.client.host if request.client else "unknown"
@@ -38,17 +42,20 @@ class MenteeProfileController:
             RequestorUtils.validate_requestor_id(logged_user_id, coach_id)
             mentee_logger.debug(f"REQUESTOR_VALIDATION_PASSED | CoachID: {coach_id}")
 
-            mentees = await MenteeProfileService.get_by_coach(coach_id)
-            mentee_count = len(mentees) if mentees else 0
+            result = await MenteeProfileService.get_by_coach(coach_id, name, cursor, limit)
+            mentees = result["mentees"]
+            mentee_count = len(mentees)
 
             mentee_logger.info(
                 f"GET_MENTEES_SUCCESS | CoachID: {coach_id} | "
                 f"MenteeCount: {mentee_count} | IP: {client_ip}"
             )
 
+            headers = {"X-Next-Cursor": result["next_cursor"]} if result["next_cursor"] else None
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
-                content=ResponsePayload.create("OK", mentees)
+                content=ResponsePayload.create("OK", mentees),
+                headers=headers
             )
 
         except HTTPException as e:
@@ -168,7 +175,7 @@ class MenteeProfileController:
             RequestorUtils.validate_requestor_id(logged_user_id, mentee_id)
             mentee_logger.debug(f"REQUESTOR_VALIDATION_PASSED | MenteeID: {mentee_id}")
 
-            await MenteeProfileService.add_physical_data(request_data, mentee_id)
+            record_ids = await MenteeProfileService.add_physical_data(request_data, mentee_id)
 
             mentee_logger.info(
                 f"ADD_PHYSICAL_DATA_SUCCESS | MenteeID: {mentee_id} | "
@@ -177,7 +184,7 @@ class MenteeProfileController:
 
             return JSONResponse(
                 status_code=status.HTTP_201_CREATED,
-                content=ResponsePayload.create("CREATED")
+                content=ResponsePayload.create("CREATED", record_ids)
             )
 
         except HTTPException as e:
@@ -201,6 +208,7 @@ class MenteeProfileController:
 
     @staticmethod
     @router.get("/info/{mentee_id}")
+    @ResponseCache.cached("mentee_info", ttl=120, tags=lambda params: [f"mentee:{params['mentee_id']}"])
     async def get_mentee_info(
             mentee_id: str,
             request: Request,
@@ -1,11 +1,14 @@
 import logging
-from fastapi import APIRouter, status, Depends, HTTPException, Request
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, status, Depends, HTTPException, Request, Query
 from fastapi.responses import JSONResponse
 
-from app.services.physical_data_service import PhysicalDataService
+from app.services.physical_data_service import PhysicalDataService, WEIGHT_RECORDS_DEFAULT_LIMIT, \
+    WEIGHT_RECORDS_MAX_LIMIT
 from app.schemas.response_schemas import ResponsePayload
 from app.security.auth_middleware import require_roles
-from app.utils.enums import RoleName
+from app.utils.enums import RoleName, WeightResolution
 
 physical_logger = logging.getLogger("dreamfit_api.physical_data")
 
@@ -18,25 +21,32 @@ class PhysicalDataController:
     async def get_weight_records(
             mentee_id: str,
             request: Request,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            resolution: WeightResolution = WeightResolution.raw,
+            cursor: Optional[str] = None,
+            limit: int = Query(WEIGHT_RECORDS_DEFAULT_LIMIT, ge=1, le=WEIGHT_RECORDS_MAX_LIMIT),
             logged_user_id: str = Depends(require_roles([RoleName.coach, RoleName.mentee]))
     ):
         client_ip = request.client.host if request.client else "unknown"
 
         physical_logger.info(
-            f"GET_WEIGHT_RECORDS | MenteeID: {mentee_id} | "
+            f"GET_WEIGHT_RECORDS | MenteeID: {mentee_id} | Resolution: {resolution.value} | "
             f"RequestedBy: {logged_user_id} | IP: {client_ip}"
         )
 
         try:
-            weight_records = await PhysicalDataService.get_weight_records_by_user_id(mentee_id)
-            record_count = len(weight_records) if weight_records else 0
+            result = await PhysicalDataService.get_weight_records_by_user_id(
+                mentee_id, start, end, resolution, cursor, limit
+            )
+            record_count = len(result["records"])
 
             physical_logger.info(
                 f"GET_WEIGHT_RECORDS_SUCCESS | MenteeID: {mentee_id} | "
                 f"RecordCount: {record_count} | IP: {client_ip}"
             )
 
-            payload = {"weightRecords": weight_records}
+            payload = {"weightRecords": result["records"], "nextCursor": result["next_cursor"]}
             return JSONResponse(
                 status_code=status.HTTP_200_OK,
                 content=ResponsePayload.create("OK", payload)
@@ -6,7 +6,8 @@ from fastapi.encoders import jsonable_encoder
 from app.services.user_service import UserService
 from app.schemas.user_schemas import UpdateUserRequest, UserProfileResponse, ChangePasswordRequest
 from app.schemas.response_schemas import ResponsePayload
-from app.security.auth_middleware import require_roles, get_current_user
+from app.security.auth_middleware import get_current_user
+from app.security.principal import Principal
 from app.utils.enums import RoleName
 
 user_logger = logging.getLogger("dreamfit_api.user")
@@ -19,20 +20,20 @@ class UserController:
     @router.get("/profile")
     async def get_user_profile(
             request: Request,
-            current_user=Depends(get_current_user)
+            current_user: Principal = Depends(get_current_user)
     ):
         client_ip = request.client.host if request.client else "unknown"
 
         user_logger.info(
-            f"GET_USER_PROFILE | UserID: {current_user['userId']} | "
+            f"GET_USER_PROFILE | UserID: {current_user.user_id} | "
             f"IP: {client_ip}"
         )
 
         try:
-            user_profile = await UserService.get_user_profile(current_user['userId'])
+            user_profile = await UserService.get_user_profile(current_user.user_id)
 
             user_logger.info(
-                f"GET_USER_PROFILE_SUCCESS | UserID: {current_user['userId']} | "
+                f"GET_USER_PROFILE_SUCCESS | UserID: {current_user.user_id} | "
                 f"IP: {client_ip}"
             )
 
@@ -43,7 +44,7 @@ class UserController:
 
         except HTTPException as e:
             user_logger.warning(
-                f"GET_USER_PROFILE_HTTP_ERROR | UserID: {current_user['userId']} | "
+                f"GET_USER_PROFILE_HTTP_ERROR | UserID: {current_user.user_id} | "
                 f"Error: {e.detail} | Status: {e.status_code} | IP: {client_ip}"
             )
             return JSONResponse(
@@ -52,7 +53,7 @@ class UserController:
             )
         except Exception as e:
             user_logger.error(
-                f"GET_USER_PROFILE_ERROR | UserID: {current_user['userId']} | "
+                f"GET_USER_PROFILE_ERROR | UserID: {current_user.user_id} | "
                 f"Unexpected error: {str(e)} | IP: {client_ip}"
             )
             return JSONResponse(
@@ -65,24 +66,24 @@ class UserController:
     async def update_user_profile(
             update_data: UpdateUserRequest,
             request: Request,
-            current_user=Depends(get_current_user)
+            current_user: Principal = Depends(get_current_user)
     ):
         client_ip = request.client.host if request.client else "unknown"
 
         user_logger.info(
-            f"UPDATE_USER_PROFILE | UserID: {current_user['userId']} | "
+            f"UPDATE_USER_PROFILE | UserID: {current_user.user_id} | "
             f"IP: {client_ip}"
         )
 
         try:
             updated_profile = await UserService.update_user_profile(
-                user_id=current_user['userId'],
-                role=current_user['role'],
+                user_id=current_user.user_id,
+                role=current_user.role,
                 update_data=update_data
             )
 
             user_logger.info(
-                f"UPDATE_USER_PROFILE_SUCCESS | UserID: {current_user['userId']} | "
+                f"UPDATE_USER_PROFILE_SUCCESS | UserID: {current_user.user_id} | "
                 f"IP: {client_ip}"
             )
 
@@ -93,7 +94,7 @@ class UserController:
 
         except HTTPException as e:
             user_logger.warning(
-                f"UPDATE_USER_PROFILE_HTTP_ERROR | UserID: {current_user['userId']} | "
+                f"UPDATE_USER_PROFILE_HTTP_ERROR | UserID: {current_user.user_id} | "
                 f"Error: {e.detail} | Status: {e.status_code} | IP: {client_ip}"
             )
             return JSONResponse(
@@ -102,7 +103,7 @@ class UserController:
             )
         except Exception as e:
             user_logger.error(
-                f"UPDATE_USER_PROFILE_ERROR | UserID: {current_user['userId']} | "
+                f"UPDATE_USER_PROFILE_ERROR | UserID: {current_user.user_id} | "
                 f"Unexpected error: {str(e)} | IP: {client_ip}"
             )
             return JSONResponse(
@@ -115,24 +116,24 @@ class UserController:
     async def change_password(
             password_data: ChangePasswordRequest,
             request: Request,
-            current_user=Depends(get_current_user)
+            current_user: Principal = Depends(get_current_user)
     ):
         client_ip = request.client.host if request.client else "unknown"
 
         user_logger.info(
-            f"CHANGE_PASSWORD | UserID: {current_user['userId']} | "
+            f"CHANGE_PASSWORD | UserID: {current_user.user_id} | "
             f"IP: {client_ip}"
         )
 
         try:
             await UserService.change_password(
-                user_id=current_user['userId'],
+                user_id=current_user.user_id,
                 current_password=password_data.current_password,
                 new_password=password_data.new_password
             )
 
             user_logger.info(
-                f"CHANGE_PASSWORD_SUCCESS | UserID: {current_user['userId']} | "
+                f"CHANGE_PASSWORD_SUCCESS | UserID: {current_user.user_id} | "
                 f"IP: {client_ip}"
             )
 
@@ -143,7 +144,7 @@ class UserController:
 
         except HTTPException as e:
             user_logger.warning(
-                f"CHANGE_PASSWORD_HTTP_ERROR | UserID: {current_user['userId']} | "
+                f"CHANGE_PASSWORD_HTTP_ERROR | UserID: {current_user.user_id} | "
                 f"Error: {e.detail} | Status: {e.status_code} | IP: {client_ip}"
             )
             return JSONResponse(
@@ -152,7 +153,7 @@ class UserController:
             )
         except Exception as e:
             user_logger.error(
-                f"CHANGE_PASSWORD_ERROR | UserID: {current_user['userId']} | "
+                f"CHANGE_PASSWORD_ERROR | UserID: {current_user.user_id} | "
                 f"Unexpected error: {str(e)} | IP: {client_ip}"
             )
             return JSONResponse(
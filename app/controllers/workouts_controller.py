@@ -1,12 +1,14 @@
 import logging
 from fastapi import APIRouter, status, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from app.services.workout_plan_service import WorkoutPlanService
-from app.schemas.workout_plan_schema import CreateWorkoutPlanRequest
+from app.schemas.workout_plan_schema import CreateWorkoutPlanRequest, PatchWorkoutPlanRequest
 from app.schemas.response_schemas import ResponsePayload
 from app.security.auth_middleware import require_roles
-from app.utils.enums import RoleName
+from app.utils.compression_utils import CompressionUtils
+from app.utils.enums import RoleName, PlanView
+from app.utils.response_cache import ResponseCache
 
 workouts_logger = logging.getLogger("dreamfit_api.workouts")
 
@@ -118,6 +120,58 @@ class WorkoutsController:
                 content=ResponsePayload.create("Error updating workout plan", {})
             )
 
+    @staticmethod
+    @router.patch("/{plan_id}")
+    async def patch_workout_plan(
+            plan_id: str,
+            request_data: PatchWorkoutPlanRequest,
+            request: Request,
+            logged_user_id: str = Depends(require_roles([RoleName.coach]))
+    ):
+        client_ip = request.client.host if request.client else "unknown"
+
+        workouts_logger.info(
+            f"PATCH_WORKOUT_PLAN | PlanID: {plan_id} | CoachID: {logged_user_id} | "
+            f"Operations: {len(request_data.operations)} | IP: {client_ip}"
+        )
+
+        try:
+            result = await WorkoutPlanService.patch_workout_plan(
+                plan_id=plan_id,
+                coach_id=logged_user_id,
+                request_data=request_data
+            )
+
+            workouts_logger.info(
+                f"PATCH_WORKOUT_PLAN_SUCCESS | PlanID: {plan_id} | CoachID: {logged_user_id} | "
+                f"Revision: {result.get('revision')} | IP: {client_ip}"
+            )
+
+            return JSONResponse(
+                status_code=status.HTTP_200_OK,
+                content=ResponsePayload.create("Workout plan updated successfully", result)
+            )
+
+        except HTTPException as e:
+            workouts_logger.warning(
+                f"PATCH_WORKOUT_PLAN_HTTP_ERROR | PlanID: {plan_id} | CoachID: {logged_user_id} | "
+                f"Error: {e.detail} | Status: {e.status_code} | IP: {client_ip}"
+            )
+            return JSONResponse(
+                status_code=e.status_code,
+                content=ResponsePayload.create(e.detail, {})
+            )
+
+        except Exception as e:
+            workouts_logger.error(
+                f"PATCH_WORKOUT_PLAN_ERROR | PlanID: {plan_id} | CoachID: {logged_user_id} | "
+                f"Unexpected error: {str(e)} | IP: {client_ip}"
+            )
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content=ResponsePayload.create("Error updating workout plan", {})
+            )
+
     @staticmethod
     @router.get("/{plan_id}")
     async def get_workout_plan(
@@ -140,9 +194,10 @@ class WorkoutsController:
                 f"RequestedBy: {logged_user_id} | IP: {client_ip}"
             )
 
-            return JSONResponse(
+            return Response(
                 status_code=status.HTTP_200_OK,
-                content=ResponsePayload.create("Workout plan retrieved successfully", result)
+                content=ResponsePayload.encode("Workout plan retrieved successfully", result),
+                media_type="application/json"
             )
 
         except HTTPException as e:
@@ -170,17 +225,18 @@ class WorkoutsController:
     async def get_coach_workout_plans(
             coach_id: str,
             request: Request,
+            view: PlanView = PlanView.full,
             logged_user_id: str = Depends(require_roles([RoleName.coach]))
     ):
         client_ip = request.client.host if request.client else "unknown"
 
         workouts_logger.info(
-            f"GET_COACH_WORKOUT_PLANS | CoachID: {coach_id} | "
+            f"GET_COACH_WORKOUT_PLANS | CoachID: {coach_id} | View: {view.value} | "
             f"RequestedBy: {logged_user_id} | IP: {client_ip}"
         )
 
         try:
-            result = await WorkoutPlanService.get_workout_plans_by_coach(coach_id, logged_user_id)
+            result = await WorkoutPlanService.get_workout_plans_by_coach(coach_id, logged_user_id, view)
             plan_count = len(result) if result else 0
 
             workouts_logger.info(
@@ -188,9 +244,10 @@ class WorkoutsController:
                 f"PlanCount: {plan_count} | IP: {client_ip}"
             )
 
-            return JSONResponse(
+            return Response(
                 status_code=status.HTTP_200_OK,
-                content=ResponsePayload.create("Workout plans retrieved successfully", result)
+                content=ResponsePayload.encode("Workout plans retrieved successfully", result),
+                media_type="application/json"
             )
 
         except HTTPException as e:
@@ -217,17 +274,18 @@ class WorkoutsController:
     async def get_mentee_workout_plans(
             mentee_id: str,
             request: Request,
+            view: PlanView = PlanView.full,
             logged_user_id: str = Depends(require_roles([RoleName.coach, RoleName.mentee]))
     ):
         client_ip = request.client.host if request.client else "unknown"
 
         workouts_logger.info(
-            f"GET_MENTEE_WORKOUT_PLANS | MenteeID: {mentee_id} | "
+            f"GET_MENTEE_WORKOUT_PLANS | MenteeID: {mentee_id} | View: {view.value} | "
             f"RequestedBy: {logged_user_id} | IP: {client_ip}"
         )
 
         try:
-            result = await WorkoutPlanService.get_workout_plans_by_mentee(mentee_id, logged_user_id)
+            result = await WorkoutPlanService.get_workout_plans_by_mentee(mentee_id, logged_user_id, view)
             plan_count = len(result) if result else 0
 
             workouts_logger.info(
@@ -235,9 +293,10 @@ class WorkoutsController:
                 f"PlanCount: {plan_count} | IP: {client_ip}"
             )
 
-            return JSONResponse(
+            return Response(
                 status_code=status.HTTP_200_OK,
-                content=ResponsePayload.create("Workout plans retrieved successfully", result)
+                content=ResponsePayload.encode("Workout plans retrieved successfully", result),
+                media_type="application/json"
             )
 
         except HTTPException as e:
@@ -261,6 +320,7 @@ class WorkoutsController:
 
     @staticmethod
     @router.get("/current/{mentee_id}")
+    @ResponseCache.cached("current_workout_plan", ttl=300, tags=lambda params: [f"workout-plan:{params['mentee_id']}"])
     async def get_current_workout_plan(
             mentee_id: str,
             request: Request,
@@ -274,17 +334,14 @@ class WorkoutsController:
         )
 
         try:
-            result = await WorkoutPlanService.get_current_workout_plan_by_mentee(mentee_id, logged_user_id)
+            plan_id, body = await WorkoutPlanService.get_current_workout_plan_by_mentee(mentee_id, logged_user_id)
 
             workouts_logger.info(
                 f"GET_CURRENT_WORKOUT_PLAN_SUCCESS | MenteeID: {mentee_id} | "
-                f"PlanID: {result.get('_id')} | IP: {client_ip}"
+                f"PlanID: {plan_id} | IP: {client_ip}"
             )
 
-            return JSONResponse(
-                status_code=status.HTTP_200_OK,
-                content=ResponsePayload.create("Current workout plan retrieved successfully", result)
-            )
+            return CompressionUtils.json_response(request, body)
 
         except HTTPException as e:
             workouts_logger.warning(
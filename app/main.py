@@ -1,13 +1,23 @@
 import logging
 import time
 import traceback
-from fastapi import FastAPI, Request, Response
+from fastapi import Depends, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv, find_dotenv
 
-from app.config import init_db, app_logger
+from app.config import init_db, app_logger, redis_client
+from app.security.auth_middleware import require_roles
+from app.utils.enums import RoleName
+from app.utils.metrics import Metrics
+from app.utils.password_hasher import PasswordHasher
+from app.utils.redis_events import RedisEvents
+from app.utils.response_cache import ResponseCache
+from app.utils.http_client import HttpClient
+from app.utils.content_snapshot import ContentSnapshot
+from app.services.token_revocation_service import TokenRevocationService
 from app.controllers.content_controller import ContentController
+from app.services.content_service import ContentService
 from app.controllers.auth_controller import AuthController
 from app.controllers.mentee_profile_controller import MenteeProfileController
 from app.controllers.user_controller import UserController
@@ -32,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Cache-Age"],
 )
 
 
@@ -54,10 +65,12 @@ async def logging_middleware(request: Request, call_next):
         response = await call_next(request)
 
         process_time = time.time() - start_time
+        principal = getattr(request.state, "principal", None)
 
         app_logger.info(
             f"RESPONSE | {request.method} {request.url.path} | "
-            f"Status: {response.status_code} | Time: {process_time:.3f}s"
+            f"Status: {response.status_code} | Time: {process_time:.3f}s | "
+            f"UserID: {principal.user_id if principal else 'anonymous'}"
         )
 
         return response
@@ -112,6 +125,13 @@ async def on_startup():
     app_logger.info("=== INICIANDO DREAMFIT API ===")
     try:
         await init_db()
+        PasswordHasher.start()
+        HttpClient.start(ContentService.cms_url)
+        TokenRevocationService.start()
+        ResponseCache.start()
+        ContentService.start()
+        ContentSnapshot.start(ContentService.build_snapshot)
+        RedisEvents.start()
         app_logger.info("=== API INICIADA CORRECTAMENTE ===")
     except Exception as e:
         app_logger.critical(f"CRITICAL ERROR AL INICIAR LA API: {str(e)}")
@@ -121,9 +141,20 @@ async def on_startup():
 @app.on_event("shutdown")
 async def on_shutdown():
     app_logger.info("=== CERRANDO DREAMFIT API ===")
+    PasswordHasher.stop()
+    await ContentSnapshot.stop()
+    await HttpClient.stop()
+    await RedisEvents.stop()
+    if redis_client is not None:
+        await redis_client.aclose()
 
 
 @app.get("/health")
 async def health_check():
     app_logger.info("HEALTH_CHECK requested")
-    return {"status": "healthy", "service": "dreamfit-api"}
\ No newline at end of file
+    return {"status": "healthy", "service": "dreamfit-api"}
+
+
+@app.get("/metrics", dependencies=[Depends(require_roles([RoleName.dreamer]))])
+async def metrics():
+    return Metrics.snapshot()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from beanie import Document
 from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
 from uuid import uuid4
 
 
@@ -9,6 +10,10 @@ class CoachCode(Document):
 
     class Settings:
         collection = "coach_codes"
+        indexes = [
+            IndexModel([("code", ASCENDING)], name="code_unique", unique=True),
+            IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+        ]
 
     @classmethod
     def create_code(cls, user_id: str) -> "CoachCode":
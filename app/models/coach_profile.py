@@ -1,4 +1,5 @@
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 
 
 class CoachProfile(Document):
@@ -8,3 +9,6 @@ class CoachProfile(Document):
 
     class Settings:
         collection = "coach_profiles"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+        ]
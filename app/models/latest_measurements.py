@@ -0,0 +1,27 @@
+from beanie import Document
+from datetime import datetime
+from typing import Dict, Optional
+from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
+
+from app.models.physical_data import DualMeasurement
+from app.utils.enums import WeightUnit, LengthUnit
+
+
+class LatestMeasurement(BaseModel):
+    date: datetime
+    value: Optional[float] = None
+    units: Optional[WeightUnit | LengthUnit] = None
+    measurements: Optional[DualMeasurement] = None
+
+
+class LatestMeasurements(Document):
+    user_id: str
+    measurements: Dict[str, LatestMeasurement] = {}
+    updated_at: datetime
+
+    class Settings:
+        name = "latest_measurements"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+        ]
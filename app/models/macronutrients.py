@@ -1,24 +1,31 @@
 from beanie import Document
 from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from typing import Optional
 from datetime import datetime, timezone
 
+from app.utils.macros_utils import Calories, Grams
+
 
 class Macros(BaseModel):
-    protein: str
-    fat: str
-    carbs: str
+    protein: Grams
+    fat: Grams
+    carbs: Grams
 
 
 class Macronutrients(Document):
     mentee_id: str
     coach_id: str
-    calories: str
+    calories: Calories
     macros: Macros
     created_at: Optional[datetime] = None
 
     class Settings:
         collection = "macronutrients"
+        indexes = [
+            IndexModel([("mentee_id", ASCENDING), ("created_at", DESCENDING)], name="mentee_id_created_at"),
+            IndexModel([("coach_id", ASCENDING), ("created_at", DESCENDING)], name="coach_id_created_at"),
+        ]
 
     def __init__(self, **data):
         if 'created_at' not in data:
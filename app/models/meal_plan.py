@@ -1,13 +1,16 @@
 from beanie import Document
 from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
 from typing import List, Optional
 from datetime import datetime, timezone
 
+from app.utils.macros_utils import Calories, Grams
+
 
 class MealMacros(BaseModel):
-    protein: str
-    fat: str
-    carbs: str
+    protein: Grams
+    fat: Grams
+    carbs: Grams
 
 
 class Meal(BaseModel):
@@ -23,21 +26,27 @@ class DayPlan(BaseModel):
 
 
 class DailyMacros(BaseModel):
-    protein: str
-    fat: str
-    carbs: str
+    protein: Grams
+    fat: Grams
+    carbs: Grams
 
 
 class MealPlan(Document):
     mentee_id: str
     coach_id: str
-    calories: str
+    calories: Calories
     dailyMacros: DailyMacros
     days: List[DayPlan]
     created_at: Optional[datetime] = None
+    revision: Optional[str] = None
+    rendered: Optional[bytes] = None
+    rendered_revision: Optional[str] = None
 
     class Settings:
         collection = "meal_plans"
+        indexes = [
+            IndexModel([("mentee_id", ASCENDING)], name="mentee_id_unique", unique=True),
+        ]
 
     def __init__(self, **data):
         if 'created_at' not in data:
@@ -1,5 +1,6 @@
 from beanie import Document
 from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
 from typing import List, Optional
 
 from app.utils.enums import LengthUnit, Gender, ActivityLevel, Suplement, ExerciseFrequency
@@ -32,3 +33,7 @@ class MenteeProfile(Document):
 
     class Settings:
         collection = "mentee_profiles"
+        indexes = [
+            IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+            IndexModel([("coach_id", ASCENDING), ("name", ASCENDING), ("_id", ASCENDING)], name="coach_id_name"),
+        ]
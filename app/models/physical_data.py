@@ -1,8 +1,10 @@
-from beanie import Document
+from beanie import Document, TimeSeriesConfig, Granularity
 from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING, DESCENDING
 
-from app.utils.enums import WeightUnit, LengthUnit
+from app.utils.enums import WeightUnit, LengthUnit, MeasurementKind
 
 
 class SideMeasurement(BaseModel):
@@ -15,78 +17,25 @@ class DualMeasurement(BaseModel):
     right: SideMeasurement
 
 
-class WeightRecord(Document):
+class MeasurementMeta(BaseModel):
     user_id: str
-    value: float
-    date: datetime
-    units: WeightUnit
-
-    class Settings:
-        collection = "weight_records"
-
-
-class ChestMeasurement(Document):
-    user_id: str
-    value: float
-    date: datetime
-    units: LengthUnit
-
-    class Settings:
-        collection = "chest_measurements"
-
+    kind: MeasurementKind
 
-class WaistMeasurement(Document):
-    user_id: str
-    value: float
-    date: datetime
-    units: LengthUnit
-
-    class Settings:
-        collection = "waist_measurements"
-
-
-class HipsMeasurement(Document):
-    user_id: str
-    value: float
-    date: datetime
-    units: LengthUnit
 
-    class Settings:
-        collection = "hips_measurements"
-
-
-class NeckMeasurement(Document):
-    user_id: str
-    value: float
-    date: datetime
-    units: LengthUnit
-
-    class Settings:
-        collection = "neck_measurements"
-
-
-class LegMeasurement(Document):
-    user_id: str
-    date: datetime
-    measurements: DualMeasurement
-
-    class Settings:
-        collection = "leg_measurements"
-
-
-class ArmMeasurement(Document):
-    user_id: str
-    date: datetime
-    measurements: DualMeasurement
-
-    class Settings:
-        collection = "arm_measurements"
-
-
-class CalfMeasurement(Document):
-    user_id: str
+class BodyMeasurement(Document):
+    meta: MeasurementMeta
     date: datetime
-    measurements: DualMeasurement
+    value: Optional[float] = None
+    units: Optional[WeightUnit | LengthUnit] = None
+    measurements: Optional[DualMeasurement] = None
 
     class Settings:
-        collection = "calf_measurements"
\ No newline at end of file
+        name = "body_measurements"
+        timeseries = TimeSeriesConfig(time_field="date", meta_field="meta", granularity=Granularity.hours)
+        indexes = [
+            IndexModel([("meta", ASCENDING), ("date", ASCENDING)], name="meta_1_date_1"),
+            IndexModel(
+                [("meta.user_id", ASCENDING), ("meta.kind", ASCENDING), ("date", DESCENDING)],
+                name="user_id_kind_date"
+            ),
+        ]
@@ -1,4 +1,5 @@
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from pydantic import EmailStr
 from typing import Optional
 from datetime import datetime
@@ -12,3 +13,6 @@ class User(Document):
 
     class Settings:
         collection = "users"
+        indexes = [
+            IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        ]
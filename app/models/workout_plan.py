@@ -1,5 +1,6 @@
 from beanie import Document
 from pydantic import BaseModel
+from pymongo import IndexModel, ASCENDING
 from typing import List, Optional
 from datetime import datetime, timezone
 
@@ -39,9 +40,16 @@ class WorkoutPlan(Document):
     trainingObjective: str
     days: List[Day]
     created_at: Optional[datetime] = None
+    revision: Optional[str] = None
+    rendered: Optional[bytes] = None
+    rendered_revision: Optional[str] = None
 
     class Settings:
         collection = "workout_plans"
+        indexes = [
+            IndexModel([("mentee_id", ASCENDING)], name="mentee_id_unique", unique=True),
+            IndexModel([("coach_id", ASCENDING)], name="coach_id"),
+        ]
 
     def __init__(self, **data):
         if 'created_at' not in data:
@@ -5,7 +5,7 @@ from typing import Optional
 class CoachCodeRepository:
     @staticmethod
     async def get_by_code(code: str) -> Optional[CoachCode]:
-        return await CoachCode.find_one(CoachCode.code == code)
+        return await CoachCode.find_one(CoachCodeRepository.code_query(code))
 
     @staticmethod
     async def create(coach_code: CoachCode) -> CoachCode:
@@ -14,4 +14,12 @@ class CoachCodeRepository:
 
     @staticmethod
     async def get_by_user_id(user_id: str) -> CoachCode:
-        return await CoachCode.find_one(CoachCode.user_id == user_id)
\ No newline at end of file
+        return await CoachCode.find_one(CoachCodeRepository.user_query(user_id))
+
+    @staticmethod
+    def code_query(code: str) -> dict:
+        return {"code": code}
+
+    @staticmethod
+    def user_query(user_id: str) -> dict:
+        return {"user_id": user_id}
\ No newline at end of file
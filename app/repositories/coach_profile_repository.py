@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from app.models.coach_profile import CoachProfile
+from app.repositories.partial_update import PartialUpdate
 from app.schemas.coach_profile_schema import CoachProfileResponse
 
 class CoachProfileRepository:
@@ -12,4 +13,16 @@ class CoachProfileRepository:
 
     @staticmethod
     async def get_by_user_id(user_id: str) -> Optional[CoachProfile]:
-        return await CoachProfile.find_one(CoachProfile.user_id == user_id)
+        return await CoachProfile.find_one(CoachProfileRepository.user_query(user_id))
+
+    @staticmethod
+    async def update_by_user_id(
+            user_id: str,
+            fields: Dict[str, Any],
+            projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[dict]:
+        return await PartialUpdate.apply(CoachProfile, CoachProfileRepository.user_query(user_id), fields, projection)
+
+    @staticmethod
+    def user_query(user_id: str) -> dict:
+        return {"user_id": user_id}
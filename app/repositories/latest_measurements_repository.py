@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from app.models.latest_measurements import LatestMeasurements
+from app.models.physical_data import BodyMeasurement
+from app.repositories.physical_data_repository import PhysicalDataRepository
+
+EPOCH = datetime(1970, 1, 1)
+SNAPSHOT_FIELDS = {"date", "value", "units", "measurements"}
+
+
+class LatestMeasurementsRepository:
+    @staticmethod
+    async def get_by_user_id(user_id: str) -> Optional[LatestMeasurements]:
+        return await LatestMeasurements.find_one(LatestMeasurementsRepository.user_query(user_id))
+
+    @staticmethod
+    def user_query(user_id: str) -> dict:
+        return {"user_id": user_id}
+
+    @staticmethod
+    async def apply_records(user_id: str, records: Iterable[BodyMeasurement]) -> None:
+        latest = {}
+        for record in records:
+            field = f"measurements.{record.meta.kind.value}"
+            latest[field] = {
+                "$cond": [
+                    {"$gt": [record.date, {"$ifNull": [f"${field}.date", EPOCH]}]},
+                    {"$literal": record.model_dump(include=SNAPSHOT_FIELDS, exclude_none=True)},
+                    f"${field}"
+                ]
+            }
+
+        latest["updated_at"] = datetime.now(timezone.utc)
+
+        await LatestMeasurements.get_motor_collection().update_one(
+            LatestMeasurementsRepository.user_query(user_id),
+            [{"$set": latest}],
+            upsert=True
+        )
+
+    @staticmethod
+    async def rebuild(user_id: str) -> LatestMeasurements:
+        # Merged through apply_records rather than replaced, so a record written concurrently
+        # by add_physical_data is never overwritten by the older one read here.
+        records = await PhysicalDataRepository.get_latest_measurements(user_id)
+        await LatestMeasurementsRepository.apply_records(user_id, records.values())
+        return await LatestMeasurementsRepository.get_by_user_id(user_id)
+
+    @staticmethod
+    async def delete_by_user_id(user_id: str) -> None:
+        await LatestMeasurements.find(LatestMeasurementsRepository.user_query(user_id)).delete()
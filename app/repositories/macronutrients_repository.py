@@ -3,6 +3,8 @@ from bson import ObjectId
 
 from app.models.macronutrients import Macronutrients
 
+LATEST_FIRST = [("created_at", -1)]
+
 
 class MacronutrientsRepository:
     @staticmethod
@@ -21,33 +23,28 @@ class MacronutrientsRepository:
     @staticmethod
     async def get_by_mentee_id(mentee_id: str) -> List[Macronutrients]:
         return await Macronutrients.find(
-            Macronutrients.mentee_id == mentee_id
-        ).sort([("created_at", -1)]).to_list()
+            MacronutrientsRepository.mentee_query(mentee_id)
+        ).sort(LATEST_FIRST).to_list()
 
     @staticmethod
     async def get_by_coach_id(coach_id: str) -> List[Macronutrients]:
         return await Macronutrients.find(
-            Macronutrients.coach_id == coach_id
-        ).sort([("created_at", -1)]).to_list()
+            MacronutrientsRepository.coach_query(coach_id)
+        ).sort(LATEST_FIRST).to_list()
 
     @staticmethod
     async def get_latest_by_mentee(mentee_id: str) -> Optional[Macronutrients]:
         return await Macronutrients.find(
-            Macronutrients.mentee_id == mentee_id
-        ).sort([("created_at", -1)]).limit(1).first_or_none()
+            MacronutrientsRepository.mentee_query(mentee_id)
+        ).sort(LATEST_FIRST).limit(1).first_or_none()
 
     @staticmethod
-    async def update(macronutrients_id: str, update_data: Dict[str, Any]) -> Optional[Macronutrients]:
-        try:
-            macronutrients = await Macronutrients.get(ObjectId(macronutrients_id))
-            if macronutrients:
-                for key, value in update_data.items():
-                    setattr(macronutrients, key, value)
-                await macronutrients.save()
-                return macronutrients
-            return None
-        except:
-            return None
+    def mentee_query(mentee_id: str) -> dict:
+        return {"mentee_id": mentee_id}
+
+    @staticmethod
+    def coach_query(coach_id: str) -> dict:
+        return {"coach_id": coach_id}
 
     @staticmethod
     async def delete(macronutrients_id: str) -> bool:
@@ -62,4 +59,4 @@ class MacronutrientsRepository:
 
     @staticmethod
     async def delete_by_mentee_id(mentee_id: str) -> None:
-        await Macronutrients.find(Macronutrients.mentee_id == mentee_id).delete()
\ No newline at end of file
+        await Macronutrients.find(MacronutrientsRepository.mentee_query(mentee_id)).delete()
\ No newline at end of file
@@ -1,15 +1,60 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 from app.models.meal_plan import MealPlan
+from app.utils.macros_utils import MacrosUtils
+
+
+RESPONSE_PROJECTION = {
+    "_id": {"$toString": "$_id"},
+    "coach_id": 1,
+    "mentee_id": 1,
+    "created_at": 1,
+    "mealPlan": {
+        "calories": {"$toString": "$calories"},
+        "dailyMacros": MacrosUtils.macros_expression("$dailyMacros"),
+        "days": {
+            "$map": {
+                "input": "$days",
+                "as": "day",
+                "in": {
+                    "dayNumber": "$$day.dayNumber",
+                    "meals": {
+                        "$map": {
+                            "input": "$$day.meals",
+                            "as": "meal",
+                            "in": {
+                                "mealnumber": "$$meal.mealnumber",
+                                "name": "$$meal.name",
+                                "recipee": "$$meal.recipee",
+                                "mealMacros": MacrosUtils.macros_expression("$$meal.mealMacros")
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+RENDERED_PROJECTION = {"revision": 1, "rendered": 1, "rendered_revision": 1}
+LATEST_FIRST = [("created_at", -1)]
 
 
 class MealPlanRepository:
     @staticmethod
-    async def create(plan_data: dict) -> MealPlan:
+    async def replace_for_mentee(plan_data: Dict[str, Any]) -> dict:
         plan = MealPlan(**plan_data)
-        await plan.insert()
-        return plan
+        fields = plan.model_dump(exclude={"id", "revision_id", "rendered", "rendered_revision"})
+
+        return await MealPlan.get_motor_collection().find_one_and_update(
+            MealPlanRepository.mentee_query(plan.mentee_id),
+            {"$set": fields, "$setOnInsert": {"_id": ObjectId()}},
+            projection=RESPONSE_PROJECTION,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
 
     @staticmethod
     async def get_by_id(plan_id: str) -> Optional[MealPlan]:
@@ -20,26 +65,45 @@ class MealPlanRepository:
 
     @staticmethod
     async def get_by_mentee_id(mentee_id: str) -> Optional[MealPlan]:
-        plans = await MealPlan.find(MealPlan.mentee_id == mentee_id).sort(-MealPlan.created_at).limit(1).to_list()
+        query = MealPlanRepository.mentee_query(mentee_id)
+        plans = await MealPlan.find(query).sort(LATEST_FIRST).limit(1).to_list()
         return plans[0] if plans else None
 
     @staticmethod
-    async def get_all_by_mentee_id(mentee_id: str) -> List[MealPlan]:
-        return await MealPlan.find(MealPlan.mentee_id == mentee_id).sort(-MealPlan.created_at).to_list()
+    def mentee_query(mentee_id: str) -> dict:
+        return {"mentee_id": mentee_id}
 
     @staticmethod
-    async def delete_previous_plans(mentee_id: str) -> None:
-        await MealPlan.find(MealPlan.mentee_id == mentee_id).delete()
+    async def get_response_by_id(plan_id: str) -> Optional[dict]:
+        if not ObjectId.is_valid(plan_id):
+            return None
+        pipeline = MealPlanRepository.response_pipeline(ObjectId(plan_id))
+        documents = await MealPlan.aggregate(pipeline).to_list()
+        return documents[0] if documents else None
 
     @staticmethod
-    async def update(plan_id: str, update_data: dict) -> Optional[MealPlan]:
-        try:
-            plan = await MealPlan.get(ObjectId(plan_id))
-            if plan:
-                for key, value in update_data.items():
-                    setattr(plan, key, value)
-                await plan.save()
-                return plan
-            return None
-        except:
-            return None
\ No newline at end of file
+    def response_pipeline(plan_id: ObjectId) -> list:
+        return [
+            {"$match": {"_id": plan_id}},
+            {"$project": RESPONSE_PROJECTION}
+        ]
+
+    @staticmethod
+    async def get_rendered_by_mentee_id(mentee_id: str) -> Optional[dict]:
+        return await MealPlan.get_motor_collection().find_one(
+            MealPlanRepository.mentee_query(mentee_id),
+            RENDERED_PROJECTION,
+            sort=LATEST_FIRST
+        )
+
+    @staticmethod
+    async def set_rendered(plan_id: str, expected_revision: Optional[str], revision: str, rendered: bytes) -> bool:
+        result = await MealPlan.get_motor_collection().update_one(
+            {"_id": ObjectId(plan_id), "revision": expected_revision},
+            {"$set": {"revision": revision, "rendered": rendered, "rendered_revision": revision}}
+        )
+        return result.modified_count == 1
+
+    @staticmethod
+    async def get_all_by_mentee_id(mentee_id: str) -> List[MealPlan]:
+        return await MealPlan.find(MealPlanRepository.mentee_query(mentee_id)).sort(LATEST_FIRST).to_list()
@@ -1,6 +1,14 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
 from app.models.mentee_profile import MenteeProfile
+from app.repositories.partial_update import PartialUpdate
 from app.schemas.mentee_profile_schema import MenteeProfileResponse
 
+COACH_PAGE_SORT = [("name", 1), ("_id", 1)]
+
 
 class MenteeProfileRepository:
     @staticmethod
@@ -10,10 +18,54 @@ class MenteeProfileRepository:
         return profile
 
     @staticmethod
-    async def get_by_coach(coach_id: str):
-        mentees = await MenteeProfile.find(MenteeProfile.coach_id == coach_id).to_list()
-        return [MenteeProfileResponse.from_orm(mentee) for mentee in mentees]
+    async def get_by_coach(
+            coach_id: str,
+            name_prefix: Optional[str] = None,
+            after: Optional[Tuple[str, ObjectId]] = None,
+            limit: int = 50
+    ) -> List[dict]:
+        query = MenteeProfileRepository.coach_page_query(coach_id, name_prefix, after)
+        projection = {field: 1 for field in MenteeProfileResponse.model_fields}
+        cursor = MenteeProfile.get_motor_collection().find(query, projection)
+        return await cursor.sort(COACH_PAGE_SORT).limit(limit).to_list(length=limit)
+
+    @staticmethod
+    def coach_page_query(
+            coach_id: str,
+            name_prefix: Optional[str] = None,
+            after: Optional[Tuple[str, ObjectId]] = None
+    ) -> dict:
+        query = {"coach_id": coach_id}
+        if name_prefix:
+            query["name"] = {"$regex": f"^{re.escape(name_prefix)}"}
+        if after:
+            after_name, after_id = after
+            query["$or"] = [
+                {"name": {"$gt": after_name}},
+                {"name": after_name, "_id": {"$gt": after_id}}
+            ]
+        return query
 
     @staticmethod
     async def get_by_user_id(user_id: str) -> MenteeProfile:
-        return await MenteeProfile.find_one(MenteeProfile.user_id == user_id)
+        return await MenteeProfile.find_one(MenteeProfileRepository.user_query(user_id))
+
+    @staticmethod
+    def user_query(user_id: str) -> dict:
+        return {"user_id": user_id}
+
+    @staticmethod
+    async def update_by_user_id(
+            user_id: str,
+            fields: Dict[str, Any],
+            projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[dict]:
+        return await PartialUpdate.apply(MenteeProfile, MenteeProfileRepository.user_query(user_id), fields, projection)
+
+    @staticmethod
+    async def set_plan_pointer(user_id: str, plan_type: str, plan_id: str) -> bool:
+        result = await MenteeProfile.get_motor_collection().update_one(
+            MenteeProfileRepository.user_query(user_id),
+            {"$set": {f"userPlans.{plan_type}.active": True, f"userPlans.{plan_type}.planId": plan_id}}
+        )
+        return result.matched_count == 1
@@ -0,0 +1,33 @@
+from typing import Any, Dict, Optional, Type, Union
+
+from beanie import Document
+from beanie.odm.utils.encoder import Encoder
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+
+
+class PartialUpdate:
+    @staticmethod
+    def to_set(patch: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+        if isinstance(patch, BaseModel):
+            patch = patch.model_dump(exclude_unset=True)
+
+        return Encoder().encode({field: value for field, value in patch.items() if value is not None})
+
+    @staticmethod
+    async def apply(
+            model: Type[Document],
+            query: Dict[str, Any],
+            fields: Dict[str, Any],
+            projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[dict]:
+        collection = model.get_motor_collection()
+        if not fields:
+            return await collection.find_one(query, projection)
+
+        return await collection.find_one_and_update(
+            query,
+            {"$set": fields},
+            projection=projection,
+            return_document=ReturnDocument.AFTER
+        )
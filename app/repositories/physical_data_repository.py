@@ -1,118 +1,145 @@
-from typing import Dict, Any, List, Optional
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
-from app.models.physical_data import WeightRecord, ChestMeasurement, WaistMeasurement, HipsMeasurement, NeckMeasurement, \
-    LegMeasurement, ArmMeasurement, CalfMeasurement
+from beanie import PydanticObjectId
+from bson import ObjectId
+from beanie.operators import In
 
+from app.models.physical_data import BodyMeasurement
+from app.utils.enums import MeasurementKind, WeightResolution, WeightUnit
 
-class PhysicalDataRepository:
-    @staticmethod
-    async def create_weight_record(record_data: Dict[str, Any]) -> WeightRecord:
-        record = WeightRecord(**record_data)
-        await record.insert()
-        return record
-
-    @staticmethod
-    async def create_chest_measurement(record_data: Dict[str, Any]) -> ChestMeasurement:
-        record = ChestMeasurement(**record_data)
-        await record.insert()
-        return record
+physical_repository_logger = logging.getLogger("dreamfit_api.physical_repository")
 
-    @staticmethod
-    async def create_waist_measurement(record_data: Dict[str, Any]) -> WaistMeasurement:
-        record = WaistMeasurement(**record_data)
-        await record.insert()
-        return record
-
-    @staticmethod
-    async def create_hips_measurement(record_data: Dict[str, Any]) -> HipsMeasurement:
-        record = HipsMeasurement(**record_data)
-        await record.insert()
-        return record
+WEIGHT_SORT = [("date", -1), ("_id", -1)]
+KG_PER_LB = 0.45359237
 
-    @staticmethod
-    async def create_leg_measurement(record_data: Dict[str, Any]) -> LegMeasurement:
-        record = LegMeasurement(**record_data)
-        await record.insert()
-        return record
 
+class PhysicalDataRepository:
     @staticmethod
-    async def create_neck_measurement(record_data: Dict[str, Any]) -> NeckMeasurement:
-        record = NeckMeasurement(**record_data)
-        await record.insert()
-        return record
+    async def create_snapshot(records: Dict[str, BodyMeasurement]) -> Dict[str, BodyMeasurement]:
+        for record in records.values():
+            record.id = record.id or PydanticObjectId()
 
-    @staticmethod
-    async def create_arm_measurement(record_data: Dict[str, Any]) -> ArmMeasurement:
-        record = ArmMeasurement(**record_data)
-        await record.insert()
-        return record
+        try:
+            await BodyMeasurement.insert_many(list(records.values()))
+        except Exception:
+            record_ids = [record.id for record in records.values()]
+            await BodyMeasurement.find(In(BodyMeasurement.id, record_ids)).delete()
+            physical_repository_logger.warning(f"SNAPSHOT_ROLLED_BACK | Records: {len(record_ids)}")
+            raise
 
-    @staticmethod
-    async def create_calf_measurement(record_data: Dict[str, Any]) -> CalfMeasurement:
-        record = CalfMeasurement(**record_data)
-        await record.insert()
-        return record
+        return records
 
     @staticmethod
-    async def get_weight_records_by_user_id(user_id: str) -> List[WeightRecord]:
-        weight_records = await WeightRecord.find(
-            WeightRecord.user_id == user_id
-        ).sort([("date", -1)]).to_list()
+    async def get_weight_records(
+            user_id: str,
+            start: Optional[datetime],
+            end: Optional[datetime],
+            before: Optional[Tuple[datetime, ObjectId]],
+            limit: int
+    ) -> List[BodyMeasurement]:
+        before_date, before_id = before if before else (None, None)
+        query = PhysicalDataRepository.weight_query(user_id, start, end, before_date, before_id)
+        weight_records = await BodyMeasurement.find(query).sort(WEIGHT_SORT).limit(limit).to_list()
 
         return weight_records
 
     @staticmethod
-    async def get_latest_arm_measurement(user_id: str) -> Optional[ArmMeasurement]:
-        arm_record = await ArmMeasurement.find(
-            ArmMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return arm_record
-
-    @staticmethod
-    async def get_latest_calf_measurement(user_id: str) -> Optional[CalfMeasurement]:
-        calf_record = await CalfMeasurement.find(
-            CalfMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return calf_record
-
-    @staticmethod
-    async def get_latest_chest_measurement(user_id: str) -> Optional[ChestMeasurement]:
-        chest_record = await ChestMeasurement.find(
-            ChestMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return chest_record
-
-    @staticmethod
-    async def get_latest_hips_measurement(user_id: str) -> Optional[HipsMeasurement]:
-        hips_record = await HipsMeasurement.find(
-            HipsMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return hips_record
-
-    @staticmethod
-    async def get_latest_leg_measurement(user_id: str) -> Optional[LegMeasurement]:
-        leg_record = await LegMeasurement.find(
-            LegMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return leg_record
-
-    @staticmethod
-    async def get_latest_neck_measurement(user_id: str) -> Optional[NeckMeasurement]:
-        neck_record = await NeckMeasurement.find(
-            NeckMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return neck_record
-
-    @staticmethod
-    async def get_latest_waist_measurement(user_id: str) -> Optional[WaistMeasurement]:
-        waist_record = await WaistMeasurement.find(
-            WaistMeasurement.user_id == user_id
-        ).sort([("date", -1)]).limit(1).first_or_none()
-
-        return waist_record
\ No newline at end of file
+    async def get_weight_buckets(
+            user_id: str,
+            resolution: WeightResolution,
+            start: Optional[datetime],
+            end: Optional[datetime],
+            before: Optional[datetime],
+            limit: int,
+            units: WeightUnit
+    ) -> List[dict]:
+        pipeline = PhysicalDataRepository.weight_buckets_pipeline(
+            user_id, resolution, start, end, before, limit, units
+        )
+        return await BodyMeasurement.aggregate(pipeline).to_list()
+
+    @staticmethod
+    def weight_buckets_pipeline(
+            user_id: str,
+            resolution: WeightResolution,
+            start: Optional[datetime],
+            end: Optional[datetime],
+            before: Optional[datetime],
+            limit: int,
+            units: WeightUnit
+    ) -> list:
+        factor = KG_PER_LB if units == WeightUnit.kg else 1 / KG_PER_LB
+        date_trunc = {"date": "$date", "unit": resolution.value}
+        if resolution == WeightResolution.week:
+            date_trunc["startOfWeek"] = "monday"
+
+        return [
+            {"$match": PhysicalDataRepository.weight_query(user_id, start, end, before)},
+            {"$set": {"value": {"$cond": [
+                {"$eq": [{"$ifNull": ["$units", units.value]}, units.value]},
+                "$value",
+                {"$multiply": ["$value", factor]}
+            ]}}},
+            {"$group": {
+                "_id": {"$dateTrunc": date_trunc},
+                "min": {"$min": "$value"},
+                "max": {"$max": "$value"},
+                "avg": {"$avg": "$value"},
+                "count": {"$sum": 1}
+            }},
+            {"$sort": {"_id": -1}},
+            {"$limit": limit},
+            {"$project": {
+                "_id": 0,
+                "date": "$_id",
+                "min": {"$round": ["$min", 2]},
+                "max": {"$round": ["$max", 2]},
+                "avg": {"$round": ["$avg", 2]},
+                "count": 1,
+                "units": {"$literal": units.value}
+            }}
+        ]
+
+    @staticmethod
+    def weight_query(
+            user_id: str,
+            start: Optional[datetime],
+            end: Optional[datetime],
+            before: Optional[datetime],
+            before_id: Optional[ObjectId] = None
+    ) -> dict:
+        date_range = {}
+        if start:
+            date_range["$gte"] = start
+        if end:
+            date_range["$lte"] = end
+        if before and not before_id:
+            date_range["$lt"] = before
+
+        query = {"meta.user_id": user_id, "meta.kind": MeasurementKind.weight.value}
+        if date_range:
+            query["date"] = date_range
+        if before and before_id:
+            query["$or"] = [
+                {"date": {"$lt": before}},
+                {"date": before, "_id": {"$lt": before_id}}
+            ]
+        return query
+
+    @staticmethod
+    async def get_latest_measurements(user_id: str) -> Dict[MeasurementKind, BodyMeasurement]:
+        pipeline = PhysicalDataRepository.latest_measurements_pipeline(user_id)
+        records = await BodyMeasurement.aggregate(pipeline, projection_model=BodyMeasurement).to_list()
+
+        return {record.meta.kind: record for record in records}
+
+    @staticmethod
+    def latest_measurements_pipeline(user_id: str) -> list:
+        return [
+            {"$match": {"meta.user_id": user_id}},
+            {"$sort": {"meta.user_id": 1, "meta.kind": 1, "date": -1}},
+            {"$group": {"_id": "$meta.kind", "record": {"$first": "$$ROOT"}}},
+            {"$replaceRoot": {"newRoot": "$record"}}
+        ]
@@ -1,6 +1,9 @@
 from typing import Optional
 
 from app.models.user import User
+from app.models.coach_profile import CoachProfile
+from app.models.coach_code import CoachCode
+from app.models.mentee_profile import MenteeProfile
 
 
 class UserRepository:
@@ -12,8 +15,59 @@ class UserRepository:
 
     @staticmethod
     async def get_by_email(email: str) -> Optional[User]:
-        return await User.find_one(User.email == email)
+        return await User.find_one(UserRepository.email_query(email))
 
     @staticmethod
     async def get_by_id(user_id: str) -> Optional[User]:
-        return await User.get(user_id)
\ No newline at end of file
+        return await User.get(user_id)
+
+    @staticmethod
+    async def get_with_profile_by_email(email: str) -> Optional[dict]:
+        pipeline = UserRepository.with_profile_pipeline(email)
+        results = await User.aggregate(pipeline).to_list(length=1)
+        return results[0] if results else None
+
+    @staticmethod
+    def email_query(email: str) -> dict:
+        return {"email": email}
+
+    @staticmethod
+    def with_profile_pipeline(email: str) -> list:
+        return [
+            {"$match": UserRepository.email_query(email)},
+            {"$limit": 1},
+            {"$addFields": {"user_id": {"$toString": "$_id"}}},
+            {"$lookup": {
+                "from": CoachProfile.get_collection_name(),
+                "localField": "user_id",
+                "foreignField": "user_id",
+                "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+                "as": "coach_profile"
+            }},
+            {"$lookup": {
+                "from": CoachCode.get_collection_name(),
+                "localField": "user_id",
+                "foreignField": "user_id",
+                "pipeline": [{"$project": {"_id": 0, "code": 1}}],
+                "as": "coach_code"
+            }},
+            {"$lookup": {
+                "from": MenteeProfile.get_collection_name(),
+                "localField": "user_id",
+                "foreignField": "user_id",
+                "pipeline": [{"$project": {"_id": 0, "name": 1}}],
+                "as": "mentee_profile"
+            }},
+            {"$project": {
+                "_id": 0,
+                "user_id": 1,
+                "email": 1,
+                "password": 1,
+                "role": 1,
+                "first_name": {"$ifNull": [
+                    {"$first": "$coach_profile.name"},
+                    {"$first": "$mentee_profile.name"}
+                ]},
+                "coach_code": {"$first": "$coach_code.code"}
+            }}
+        ]
@@ -1,15 +1,40 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
 
 from app.models.workout_plan import WorkoutPlan
+from app.repositories.partial_update import PartialUpdate
+
+
+RESPONSE_PROJECTION = {
+    "_id": {"$toString": "$_id"},
+    "coach_id": 1,
+    "mentee_id": 1,
+    "created_at": 1,
+    "revision": 1,
+    "workoutPlan": {
+        "trainingObjective": "$trainingObjective",
+        "days": "$days"
+    }
+}
+
+RENDERED_PROJECTION = {"revision": 1, "rendered": 1, "rendered_revision": 1}
 
 
 class WorkoutPlanRepository:
     @staticmethod
-    async def create(plan_data: Dict[str, Any]) -> WorkoutPlan:
+    async def replace_for_mentee(plan_data: Dict[str, Any]) -> dict:
         plan = WorkoutPlan(**plan_data)
-        await plan.insert()
-        return plan
+        fields = plan.model_dump(exclude={"id", "revision_id", "rendered", "rendered_revision"})
+
+        return await WorkoutPlan.get_motor_collection().find_one_and_update(
+            WorkoutPlanRepository.mentee_query(plan.mentee_id),
+            {"$set": fields, "$setOnInsert": {"_id": ObjectId()}},
+            projection=RESPONSE_PROJECTION,
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
 
     @staticmethod
     async def get_by_id(plan_id: str) -> WorkoutPlan:
@@ -19,30 +44,118 @@ class WorkoutPlanRepository:
             return None
 
     @staticmethod
-    async def update(plan_id: str, update_data: Dict[str, Any]) -> WorkoutPlan:
+    async def update(plan_id: str, update_data: Dict[str, Any], coach_id: Optional[str] = None) -> Optional[dict]:
         try:
-            plan = await WorkoutPlan.get(ObjectId(plan_id))
-            if plan:
-                for key, value in update_data.items():
-                    setattr(plan, key, value)
-                await plan.save()
-                return plan
+            query = {"_id": ObjectId(plan_id)}
+        except InvalidId:
             return None
-        except:
+        if coach_id:
+            query["coach_id"] = coach_id
+
+        return await PartialUpdate.apply(WorkoutPlan, query, PartialUpdate.to_set(update_data), RESPONSE_PROJECTION)
+
+    @staticmethod
+    async def apply_patch(
+            plan_id: str,
+            coach_id: str,
+            expected_revision: Optional[str],
+            revision: str,
+            patch: Dict[str, Any]
+    ) -> Optional[dict]:
+        if not ObjectId.is_valid(plan_id):
             return None
 
+        query = {"_id": ObjectId(plan_id), "coach_id": coach_id, "revision": expected_revision}
+        query.update({path: {"$exists": True} for path in patch["required"]})
+
+        return await WorkoutPlan.get_motor_collection().find_one_and_update(
+            query,
+            [{"$set": {**patch["set"], "revision": revision}}],
+            projection=RESPONSE_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+
     @staticmethod
     async def get_by_mentee_id(mentee_id: str) -> list[WorkoutPlan]:
-        return await WorkoutPlan.find(WorkoutPlan.mentee_id == mentee_id).to_list()
+        return await WorkoutPlan.find(WorkoutPlanRepository.mentee_query(mentee_id)).to_list()
 
     @staticmethod
     async def get_by_coach_id(coach_id: str) -> list[WorkoutPlan]:
-        return await WorkoutPlan.find(WorkoutPlan.coach_id == coach_id).to_list()
+        return await WorkoutPlan.find(WorkoutPlanRepository.coach_query(coach_id)).to_list()
+
+    @staticmethod
+    def mentee_query(mentee_id: str) -> dict:
+        return {"mentee_id": mentee_id}
+
+    @staticmethod
+    def coach_query(coach_id: str) -> dict:
+        return {"coach_id": coach_id}
+
+    @staticmethod
+    async def get_response_by_id(plan_id: str) -> Optional[dict]:
+        if not ObjectId.is_valid(plan_id):
+            return None
+        documents = await WorkoutPlanRepository.get_response_documents({"_id": ObjectId(plan_id)}, limit=1)
+        return documents[0] if documents else None
+
+    @staticmethod
+    async def get_response_documents(match: Dict[str, Any], limit: Optional[int] = None) -> List[dict]:
+        pipeline = WorkoutPlanRepository.response_pipeline(match, limit)
+        return await WorkoutPlan.aggregate(pipeline).to_list()
+
+    @staticmethod
+    def response_pipeline(match: Dict[str, Any], limit: Optional[int] = None) -> list:
+        pipeline = [{"$match": match}]
+        if limit:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": RESPONSE_PROJECTION})
+        return pipeline
+
+    @staticmethod
+    async def get_rendered_by_mentee(mentee_id: str) -> Optional[dict]:
+        return await WorkoutPlan.get_motor_collection().find_one(
+            WorkoutPlanRepository.mentee_query(mentee_id), RENDERED_PROJECTION
+        )
+
+    @staticmethod
+    async def set_rendered(plan_id: str, expected_revision: Optional[str], revision: str, rendered: bytes) -> bool:
+        result = await WorkoutPlan.get_motor_collection().update_one(
+            {"_id": ObjectId(plan_id), "revision": expected_revision},
+            {"$set": {"revision": revision, "rendered": rendered, "rendered_revision": revision}}
+        )
+        return result.modified_count == 1
+
+    @staticmethod
+    async def get_summaries(match: Dict[str, Any]) -> List[dict]:
+        pipeline = WorkoutPlanRepository.summaries_pipeline(match)
+        return await WorkoutPlan.aggregate(pipeline).to_list()
 
     @staticmethod
-    async def delete_previous_plans(mentee_id: str) -> None:
-        await WorkoutPlan.find(WorkoutPlan.mentee_id == mentee_id).delete()
+    def summaries_pipeline(match: Dict[str, Any]) -> list:
+        return [
+            {"$match": match},
+            {"$project": {
+                "_id": {"$toString": "$_id"},
+                "coach_id": 1,
+                "mentee_id": 1,
+                "created_at": 1,
+                "trainingObjective": 1,
+                "days": {"$map": {
+                    "input": {"$ifNull": ["$days", []]},
+                    "as": "day",
+                    "in": {
+                        "dayNumber": "$$day.dayNumber",
+                        "muscularGroups": {"$size": {"$ifNull": ["$$day.muscularGroups", []]}},
+                        "workouts": {"$sum": {"$map": {
+                            "input": {"$ifNull": ["$$day.muscularGroups", []]},
+                            "as": "group",
+                            "in": {"$size": {"$ifNull": ["$$group.workouts", []]}}
+                        }}}
+                    }
+                }}
+            }}
+        ]
 
     @staticmethod
     async def get_active_plan_by_mentee(mentee_id: str) -> WorkoutPlan:
-        return await WorkoutPlan.find_one(WorkoutPlan.mentee_id == mentee_id)
\ No newline at end of file
+        return await WorkoutPlan.find_one(WorkoutPlanRepository.mentee_query(mentee_id))
\ No newline at end of file
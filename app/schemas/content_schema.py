@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class CmsWebhookEvent(BaseModel):
+    event: str = Field(..., description="Evento del CMS, p. ej. entry.publish")
+    model: Optional[str] = Field(None, description="Modelo del CMS afectado, p. ej. workout")
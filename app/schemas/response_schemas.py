@@ -1,3 +1,8 @@
+import json
+from datetime import datetime
+from enum import Enum
+
+from bson import ObjectId
 from pydantic import BaseModel
 from typing import Optional
 
@@ -9,3 +14,23 @@ class ResponsePayload(BaseModel):
     @classmethod
     def create(cls, message: str, data: dict|list = None) -> dict:
         return {"message": message, "data": data}
+
+    @classmethod
+    def encode(cls, message: str, data: dict|list = None) -> bytes:
+        return json.dumps(
+            cls.create(message, data),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+            default=_encode_value
+        ).encode("utf-8")
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
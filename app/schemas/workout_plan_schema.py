@@ -1,5 +1,7 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+
+from app.utils.enums import PatchOp
 
 
 class WeightRequest(BaseModel):
@@ -37,6 +39,17 @@ class CreateWorkoutPlanRequest(BaseModel):
     days: List[DayRequest]
 
 
+class PatchOperation(BaseModel):
+    op: PatchOp
+    path: str
+    value: Optional[Any] = None
+
+
+class PatchWorkoutPlanRequest(BaseModel):
+    revision: Optional[str]
+    operations: List[PatchOperation] = Field(..., min_length=1, max_length=100)
+
+
 class WorkoutPlanResponse(BaseModel):
     id: str
     coach_id: str
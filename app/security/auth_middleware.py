@@ -1,130 +1,167 @@
 import logging
-from datetime import datetime
+import time
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError, ExpiredSignatureError, jwt
 from typing import List
 
-from app.config import SECRET_KEY, ALGORITHM
+from app.config import SECRET_KEY, ALGORITHM, TOKEN_CACHE_TTL_SECONDS, TOKEN_CACHE_NEGATIVE_TTL_SECONDS
+from app.security.principal import Principal
+from app.security.token_cache import TokenCache, TokenOutcome
+from app.utils.metrics import Metrics
 
 auth_middleware_logger = logging.getLogger("dreamfit_api.auth_middleware")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
-def require_roles(allowed_roles: List[str]):
-    async def role_checker(token: str = Depends(oauth2_scheme), request: Request = None):
-        client_ip = request.client.host if request and request.client else "unknown"
-        endpoint = request.url.path if request else "unknown"
-        method = request.method if request else "unknown"
-
-        auth_middleware_logger.debug(
-            f"AUTH_CHECK_START | Endpoint: {method} {endpoint} | IP: {client_ip}"
-        )
+def _verify_token(token: str) -> TokenOutcome:
+    key = TokenCache.key_for(token)
+    outcome = TokenCache.get(key)
+    if outcome is not None:
+        Metrics.increment("auth.token_cache.hit")
+        return outcome
 
-        credentials_exception = HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    Metrics.increment("auth.token_cache.miss")
+    now = time.time()
+    negative_expires_at = now + TOKEN_CACHE_NEGATIVE_TTL_SECONDS
 
-        try:
-            auth_middleware_logger.debug("DECODING_JWT_TOKEN")
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    try:
+        auth_middleware_logger.debug("DECODING_JWT_TOKEN")
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except ExpiredSignatureError:
+        outcome = TokenOutcome(None, "expired")
+        TokenCache.set(key, outcome, negative_expires_at)
+        return outcome
+    except JWTError as je:
+        auth_middleware_logger.debug(f"JWT_DECODE_FAILED | Error: {str(je)}")
+        outcome = TokenOutcome(None, "invalid")
+        TokenCache.set(key, outcome, negative_expires_at)
+        return outcome
+
+    exp = payload.get("exp")
+    if payload.get("type") == "refresh":
+        outcome = TokenOutcome(None, "invalid")
+        TokenCache.set(key, outcome, negative_expires_at)
+    elif exp is None:
+        outcome = TokenOutcome(payload, "no_expiration")
+        TokenCache.set(key, outcome, negative_expires_at)
+    elif exp <= now:
+        outcome = TokenOutcome(payload, "expired")
+        TokenCache.set(key, outcome, negative_expires_at)
+    elif payload.get("role") is None:
+        outcome = TokenOutcome(payload, "no_role")
+        TokenCache.set(key, outcome, min(exp, negative_expires_at))
+    else:
+        outcome = TokenOutcome(payload, None)
+        TokenCache.set(key, outcome, min(exp, now + TOKEN_CACHE_TTL_SECONDS))
+
+    return outcome
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
-            user_role: str = payload.get("role")
-            exp = payload.get("exp")
-            logged_user_id = payload.get("userId")
-            email = payload.get("sub")
 
-            if exp is None:
-                auth_middleware_logger.warning(
-                    f"TOKEN_NO_EXPIRATION | IP: {client_ip} | Endpoint: {endpoint}"
-                )
-                raise credentials_exception
+async def get_principal(request: Request, token: str = Depends(oauth2_scheme)) -> Principal:
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
 
-            if datetime.fromtimestamp(exp) < datetime.now():
-                auth_middleware_logger.warning(
-                    f"TOKEN_EXPIRED | Email: {email} | IP: {client_ip} | "
-                    f"Endpoint: {endpoint} | ExpiredAt: {datetime.fromtimestamp(exp)}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token has expired"
-                )
+    client_ip = request.client.host if request.client else "unknown"
+    endpoint = request.url.path
 
-            if user_role is None:
-                auth_middleware_logger.warning(
-                    f"TOKEN_NO_ROLE | Email: {email} | IP: {client_ip} | Endpoint: {endpoint}"
-                )
-                raise credentials_exception
+    auth_middleware_logger.debug(
+        f"AUTH_CHECK_START | Endpoint: {request.method} {endpoint} | IP: {client_ip}"
+    )
 
-            if user_role not in allowed_roles:
-                auth_middleware_logger.warning(
-                    f"ROLE_FORBIDDEN | Email: {email} | UserRole: {user_role} | "
-                    f"RequiredRoles: {allowed_roles} | IP: {client_ip} | Endpoint: {endpoint}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You don't have permission to perform this action"
-                )
+    try:
+        payload, error = _verify_token(token)
 
-            auth_middleware_logger.debug(
-                f"AUTH_SUCCESS | Email: {email} | Role: {user_role} | "
-                f"UserID: {logged_user_id} | IP: {client_ip} | Endpoint: {endpoint}"
+        if error == "invalid":
+            auth_middleware_logger.warning(
+                f"JWT_ERROR | IP: {client_ip} | "
+                f"Endpoint: {endpoint} | TokenPrefix: {token[:20]}..."
             )
+            raise _credentials_exception()
 
-            return logged_user_id
-
-        except HTTPException as he:
+        if error == "expired":
             auth_middleware_logger.warning(
-                f"AUTH_HTTP_ERROR | Status: {he.status_code} | "
-                f"Detail: {he.detail} | IP: {client_ip} | Endpoint: {endpoint}"
+                f"TOKEN_EXPIRED | Email: {payload.get('sub') if payload else None} | IP: {client_ip} | "
+                f"Endpoint: {endpoint}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has expired"
             )
-            raise he
 
-        except JWTError as je:
+        if error == "no_expiration":
             auth_middleware_logger.warning(
-                f"JWT_ERROR | Error: {str(je)} | IP: {client_ip} | "
-                f"Endpoint: {endpoint} | TokenPrefix: {token[:20]}..."
+                f"TOKEN_NO_EXPIRATION | IP: {client_ip} | Endpoint: {endpoint}"
             )
-            raise credentials_exception
+            raise _credentials_exception()
 
-        except Exception as e:
-            auth_middleware_logger.error(
-                f"AUTH_UNEXPECTED_ERROR | Error: {str(e)} | "
-                f"IP: {client_ip} | Endpoint: {endpoint}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Authentication error"
+        if error == "no_role":
+            auth_middleware_logger.warning(
+                f"TOKEN_NO_ROLE | Email: {payload.get('sub')} | IP: {client_ip} | Endpoint: {endpoint}"
             )
+            raise _credentials_exception()
 
-    return role_checker
+        principal = Principal.from_claims(payload)
+        request.state.principal = principal
 
+        auth_middleware_logger.debug(
+            f"AUTH_SUCCESS | Email: {principal.email} | Role: {principal.role} | "
+            f"UserID: {principal.user_id} | IP: {client_ip} | Endpoint: {endpoint}"
+        )
 
-async def get_current_user(request: Request) -> dict:
-    """Get current user from JWT token"""
-    auth_header = request.headers.get("Authorization")
+        return principal
 
-    if not auth_header or not auth_header.startswith("Bearer "):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token not provided"
+    except HTTPException as he:
+        auth_middleware_logger.warning(
+            f"AUTH_HTTP_ERROR | Status: {he.status_code} | "
+            f"Detail: {he.detail} | IP: {client_ip} | Endpoint: {endpoint}"
         )
+        raise he
 
-    token = auth_header.split(" ")[1]
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
+    except Exception as e:
+        auth_middleware_logger.error(
+            f"AUTH_UNEXPECTED_ERROR | Error: {str(e)} | "
+            f"IP: {client_ip} | Endpoint: {endpoint}"
+        )
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Authentication error"
         )
 
 
+def require_roles(allowed_roles: List[str]):
+    async def role_checker(request: Request, principal: Principal = Depends(get_principal)):
+        if principal.role not in allowed_roles:
+            auth_middleware_logger.warning(
+                f"ROLE_FORBIDDEN | Email: {principal.email} | UserRole: {principal.role} | "
+                f"RequiredRoles: {allowed_roles} | "
+                f"IP: {request.client.host if request.client else 'unknown'} | Endpoint: {request.url.path}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You don't have permission to perform this action"
+            )
+
+        return principal.user_id
+
+    return role_checker
+
+
+async def get_current_user(principal: Principal = Depends(get_principal)) -> Principal:
+    """Get current user from the request principal"""
+    return principal
+
+
 def log_suspicious_activity(request: Request, reason: str, details: str = ""):
     client_ip = request.client.host if request.client else "unknown"
     user_agent = request.headers.get("user-agent", "unknown")
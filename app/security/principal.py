@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    user_id: str
+    role: str
+    email: Optional[str] = None
+    coach_code: Optional[str] = None
+
+    @classmethod
+    def from_claims(cls, claims: dict) -> "Principal":
+        return cls(
+            user_id=claims.get("userId"),
+            role=claims.get("role"),
+            email=claims.get("sub"),
+            coach_code=claims.get("coachCode"),
+        )
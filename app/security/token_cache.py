@@ -0,0 +1,47 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, NamedTuple
+
+from app.config import TOKEN_CACHE_MAX_ENTRIES
+
+
+class TokenOutcome(NamedTuple):
+    claims: Optional[dict]
+    error: Optional[str]
+
+
+class TokenCache:
+    """LRU of verified token outcomes, keyed by token digest and bounded by the token's exp."""
+
+    _entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+
+    @staticmethod
+    def key_for(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    @classmethod
+    def get(cls, key: bytes) -> Optional[TokenOutcome]:
+        entry = cls._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, outcome = entry
+        if expires_at <= time.time():
+            del cls._entries[key]
+            return None
+
+        cls._entries.move_to_end(key)
+        return outcome
+
+    @classmethod
+    def set(cls, key: bytes, outcome: TokenOutcome, expires_at: float) -> None:
+        cls._entries[key] = (expires_at, outcome)
+        cls._entries.move_to_end(key)
+
+        while len(cls._entries) > TOKEN_CACHE_MAX_ENTRIES:
+            cls._entries.popitem(last=False)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
@@ -0,0 +1,59 @@
+import hashlib
+import hmac
+import logging
+import time
+
+from fastapi import HTTPException, Request, status
+
+from app.config import redis_client, CMS_WEBHOOK_SECRET, CMS_WEBHOOK_TOLERANCE_SECONDS
+from app.utils.metrics import Metrics
+
+webhook_signature_logger = logging.getLogger("dreamfit_api.webhook_signature")
+
+TIMESTAMP_HEADER = "X-Dreamfit-Timestamp"
+SIGNATURE_HEADER = "X-Dreamfit-Signature"
+SEEN_KEY_PREFIX = "cms-webhook:seen:"
+
+
+def _rejected(reason: str, client_ip: str) -> HTTPException:
+    Metrics.increment("cms_webhook.rejected")
+    webhook_signature_logger.warning(f"CMS_WEBHOOK_REJECTED | Reason: {reason} | IP: {client_ip}")
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid webhook signature"
+    )
+
+
+async def require_cms_signature(request: Request) -> None:
+    """Checks the HMAC-SHA256 of "<timestamp>.<raw body>" sent by the CMS within the timestamp tolerance.
+
+    Accepted signatures are remembered in Redis for as long as their timestamp is valid, so a
+    captured request cannot be replayed. Without Redis only the timestamp window limits replays.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    if not CMS_WEBHOOK_SECRET:
+        raise _rejected("CMS_WEBHOOK_SECRET not configured", client_ip)
+
+    timestamp = request.headers.get(TIMESTAMP_HEADER, "")
+    signature = request.headers.get(SIGNATURE_HEADER, "").removeprefix("sha256=")
+    if not timestamp.isdigit() or not signature:
+        raise _rejected("Missing signature headers", client_ip)
+    if abs(time.time() - int(timestamp)) > CMS_WEBHOOK_TOLERANCE_SECONDS:
+        raise _rejected("Timestamp outside tolerance", client_ip)
+
+    body = await request.body()
+    expected = hmac.new(CMS_WEBHOOK_SECRET.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    # Header values are latin-1 decoded; comparing bytes keeps non-ASCII input a mismatch, not a 500.
+    if not hmac.compare_digest(expected.encode(), signature.encode("latin-1")):
+        raise _rejected("Signature mismatch", client_ip)
+
+    if redis_client is not None:
+        try:
+            first_use = await redis_client.set(
+                f"{SEEN_KEY_PREFIX}{signature}", timestamp, nx=True, ex=2 * CMS_WEBHOOK_TOLERANCE_SECONDS
+            )
+        except Exception as e:
+            webhook_signature_logger.error(f"CMS_WEBHOOK_REPLAY_CHECK_ERROR | IP: {client_ip} | Error: {str(e)}")
+            first_use = True
+        if not first_use:
+            raise _rejected("Replayed signature", client_ip)
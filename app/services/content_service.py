@@ -1,12 +1,46 @@
 import os
+import asyncio
 import logging
-import requests
+import time
+import httpx
 import json
 from fastapi import HTTPException, status
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+from app.config import redis_client, CMS_CACHE_SOFT_TTL_SECONDS, CMS_CACHE_HARD_TTL_SECONDS, \
+    CMS_FAN_OUT_DEADLINE_SECONDS
+from app.schemas.response_schemas import ResponsePayload
+from app.utils.compression_utils import CompressionUtils
+from app.utils.content_snapshot import ContentSnapshot
+from app.utils.http_client import HttpClient
+from app.utils.metrics import Metrics
+from app.utils.redis_events import RedisEvents
+from app.utils.swr_cache import SWRCache
 
 service_logger = logging.getLogger("dreamfit_api.content_service")
 
+CONTENT_INVALIDATIONS_CHANNEL = "dreamfit:content-invalidations"
+WORKOUTS_KEY = "cms:workouts"
+TRAINING_OPTIONS_KEY = "cms:training-options"
+PLANS_KEY = "cms:plans"
+TRAINING_OPTION_SECTIONS = ("elements", "technics", "rirs")
+SECTION_KEYS = {"workouts": WORKOUTS_KEY, "training-options": TRAINING_OPTIONS_KEY, "plans": PLANS_KEY}
+
+CMS_MODEL_SECTIONS = {
+    "muscular-group": "workouts",
+    "workout": "workouts",
+    "element": "training-options",
+    "technic": "training-options",
+    "rir": "training-options",
+    "plan": "plans",
+    "graphic": "plans"
+}
+CMS_INVALIDATING_EVENTS = {"entry.publish", "entry.unpublish", "entry.update", "entry.delete"}
+
+
+def _training_options_complete(options: Dict[str, Any]) -> bool:
+    return all(outcome == "ok" for outcome in options["sectionStatus"].values())
+
 
 class ContentService:
     cms_url = ""
@@ -18,7 +52,100 @@ class ContentService:
         cms_url = f"https://{os.getenv('CMS_URL')}/api"
 
     @classmethod
-    async def get_workouts(cls):
+    def start(cls) -> None:
+        if redis_client is None:
+            service_logger.warning("REDIS_NOT_CONFIGURED | Content invalidations stay local to this worker")
+            return
+        RedisEvents.subscribe(CONTENT_INVALIDATIONS_CHANNEL, cls._on_content_invalidated)
+
+    @classmethod
+    async def get_workouts(cls) -> Tuple[List[Any], int]:
+        return await SWRCache.get(
+            WORKOUTS_KEY, cls._fetch_workouts, CMS_CACHE_SOFT_TTL_SECONDS, CMS_CACHE_HARD_TTL_SECONDS
+        )
+
+    @classmethod
+    async def get_training_options(cls) -> Tuple[Dict[str, Any], int]:
+        return await SWRCache.get(
+            TRAINING_OPTIONS_KEY,
+            cls._fetch_training_options,
+            CMS_CACHE_SOFT_TTL_SECONDS,
+            CMS_CACHE_HARD_TTL_SECONDS,
+            is_complete=_training_options_complete
+        )
+
+    @classmethod
+    async def get_plans(cls) -> Tuple[List[Dict[str, Any]], int]:
+        return await SWRCache.get(
+            PLANS_KEY, cls._fetch_plans, CMS_CACHE_SOFT_TTL_SECONDS, CMS_CACHE_HARD_TTL_SECONDS
+        )
+
+    @classmethod
+    def get_rendered(cls, section: str) -> Optional[Tuple[bytes, int]]:
+        return ContentSnapshot.section(section)
+
+    @classmethod
+    def sections_for_event(cls, event: str, model: Optional[str]) -> List[str]:
+        if event not in CMS_INVALIDATING_EVENTS or model not in CMS_MODEL_SECTIONS:
+            return []
+        return [CMS_MODEL_SECTIONS[model]]
+
+    @classmethod
+    async def handle_cms_event(cls, sections: List[str], received_at: float) -> None:
+        started = time.perf_counter()
+        try:
+            await cls.refresh_sections(sections)
+        except Exception as e:
+            Metrics.increment("content_invalidation.error")
+            service_logger.error(f"CONTENT_REFRESH_FAILED | Sections: {sections} | Error: {str(e)}")
+            return
+        Metrics.observe("content_invalidation.refresh", time.perf_counter() - started)
+
+        await RedisEvents.publish(CONTENT_INVALIDATIONS_CHANNEL, {"sections": sections, "received_at": received_at})
+        service_logger.info(f"CONTENT_INVALIDATED | Sections: {sections}")
+
+    @classmethod
+    async def refresh_sections(cls, sections: Iterable[str]) -> None:
+        loaders = {
+            "workouts": (cls._fetch_workouts, None),
+            "training-options": (cls._fetch_training_options, _training_options_complete),
+            "plans": (cls._fetch_plans, None)
+        }
+        sections = [section for section in sections if section in loaders]
+        await asyncio.gather(*[SWRCache.refresh(SECTION_KEYS[section], *loaders[section]) for section in sections])
+        await ContentSnapshot.refresh_now(lambda: cls.build_snapshot(sections))
+
+    @classmethod
+    async def build_snapshot(cls, only: Optional[Iterable[str]] = None) -> Dict[str, Tuple[float, bytes, bool]]:
+        builders = {
+            "workouts": (cls.get_workouts, lambda data: {"muscularGroups": data}, None),
+            "training-options": (cls.get_training_options, lambda data: data, _training_options_complete),
+            "plans": (cls.get_plans, lambda data: {"plans": data}, None)
+        }
+        if only is not None:
+            builders = {name: builder for name, builder in builders.items() if name in only}
+        results = await asyncio.gather(*[get() for get, _, _ in builders.values()], return_exceptions=True)
+
+        sections = {}
+        for (name, (_, shape, is_complete)), result in zip(builders.items(), results):
+            if isinstance(result, Exception):
+                service_logger.error(f"SNAPSHOT_SECTION_FAILED | Section: {name} | Error: {str(result)}")
+                continue
+            data, age = result
+            body = CompressionUtils.compress(ResponsePayload.encode("OK", shape(data)))
+            sections[name] = (time.time() - age, body, is_complete(data) if is_complete else True)
+        return sections
+
+    @classmethod
+    def _on_content_invalidated(cls, message: dict) -> None:
+        for section in message.get("sections", []):
+            if section in SECTION_KEYS:
+                SWRCache.forget(SECTION_KEYS[section])
+        ContentSnapshot.reload()
+        Metrics.observe("content_invalidation.propagation", max(0.0, time.time() - message["received_at"]))
+
+    @classmethod
+    async def _fetch_workouts(cls):
         service_logger.info("FETCHING_WORKOUTS_FROM_CMS")
 
         try:
@@ -26,13 +153,13 @@ class ContentService:
 
             service_logger.debug(f"CMS_REQUEST | URL: {cls.cms_url}/muscular-groups")
 
-            response = requests.get(
-                f"{cls.cms_url}/muscular-groups?fields=name&populate[workouts][fields]=name,videoUrl",
+            response = await HttpClient.client(cls.cms_url).get(
+                "/muscular-groups?fields=name&populate[workouts][fields]=name,videoUrl",
                 headers=headers,
                 timeout=5
             )
 
-            if response.ok:
+            if response.is_success:
                 data = response.json()["data"]
                 service_logger.info(f"CMS_REQUEST_SUCCESS | WorkoutGroups: {len(data)}")
                 return data
@@ -46,7 +173,7 @@ class ContentService:
                     detail="Unable to retrieve workouts"
                 )
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             service_logger.error(f"CMS_REQUEST_EXCEPTION | Error: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -60,116 +187,95 @@ class ContentService:
             )
 
     @classmethod
-    async def get_training_options(cls) -> Dict[str, List[str]]:
+    async def _fetch_training_options(cls) -> Dict[str, Any]:
         service_logger.info("FETCHING_TRAINING_OPTIONS_FROM_CMS")
 
-        try:
-            headers = {"Authorization": f"Bearer {cls.cms_api_key}"}
-
-            training_options = {
-                "elements": [],
-                "technics": [],
-                "rirs": []
-            }
-
-            service_logger.debug(f"CMS_REQUEST | URL: {cls.cms_url}/elements")
-            elements_response = requests.get(
-                f"{cls.cms_url}/elements?fields=name&pagination[limit]=100",
-                headers=headers,
-                timeout=5
-            )
-
-            if elements_response.ok:
-                elements_data = elements_response.json()["data"]
-                training_options["elements"] = [item["name"] for item in elements_data if item.get("name")]
-                service_logger.info(f"ELEMENTS_FETCHED | Count: {len(training_options['elements'])}")
+        headers = {"Authorization": f"Bearer {cls.cms_api_key}"}
+        last_good = SWRCache.peek(TRAINING_OPTIONS_KEY) or {}
+
+        tasks = {
+            section: asyncio.create_task(cls._fetch_option_names(section, headers))
+            for section in TRAINING_OPTION_SECTIONS
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=CMS_FAN_OUT_DEADLINE_SECONDS)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        training_options: Dict[str, Any] = {"sectionStatus": {}}
+        for section, task in tasks.items():
+            if task in pending:
+                outcome = "timeout"
+                service_logger.error(f"{section.upper()}_REQUEST_TIMEOUT | Deadline: {CMS_FAN_OUT_DEADLINE_SECONDS}s")
+            elif task.exception() is not None:
+                outcome = "error"
+                service_logger.error(f"{section.upper()}_REQUEST_FAILED | Error: {str(task.exception())}")
             else:
-                service_logger.error(
-                    f"ELEMENTS_REQUEST_FAILED | Status: {elements_response.status_code} | "
-                    f"Response: {elements_response.text[:200]}"
-                )
+                training_options[section] = task.result()
+                training_options["sectionStatus"][section] = "ok"
+                continue
 
-            service_logger.debug(f"CMS_REQUEST | URL: {cls.cms_url}/technics")
-            technics_response = requests.get(
-                f"{cls.cms_url}/technics?fields=name&pagination[limit]=100",
-                headers=headers,
-                timeout=5
-            )
-
-            if technics_response.ok:
-                technics_data = technics_response.json()["data"]
-                training_options["technics"] = [item["name"] for item in technics_data if item.get("name")]
-                service_logger.info(f"TECHNICS_FETCHED | Count: {len(training_options['technics'])}")
+            if last_good.get("sectionStatus", {}).get(section) in ("ok", "stale"):
+                training_options[section] = last_good[section]
+                training_options["sectionStatus"][section] = "stale"
             else:
-                service_logger.error(
-                    f"TECHNICS_REQUEST_FAILED | Status: {technics_response.status_code} | "
-                    f"Response: {technics_response.text[:200]}"
-                )
-
-            service_logger.debug(f"CMS_REQUEST | URL: {cls.cms_url}/rirs")
-            rirs_response = requests.get(
-                f"{cls.cms_url}/rirs?fields=name&pagination[limit]=100",
-                headers=headers,
-                timeout=5
-            )
-
-            if rirs_response.ok:
-                rirs_data = rirs_response.json()["data"]
-                training_options["rirs"] = [item["name"] for item in rirs_data if item.get("name")]
-                service_logger.info(f"RIRS_FETCHED | Count: {len(training_options['rirs'])}")
-            else:
-                service_logger.error(
-                    f"RIRS_REQUEST_FAILED | Status: {rirs_response.status_code} | "
-                    f"Response: {rirs_response.text[:200]}"
-                )
+                training_options[section] = []
+                training_options["sectionStatus"][section] = outcome
 
-            if not any([training_options["elements"], training_options["technics"], training_options["rirs"]]):
-                service_logger.warning("NO_TRAINING_OPTIONS_RETRIEVED")
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="No training options found in CMS"
-                )
-
-            service_logger.info(
-                f"TRAINING_OPTIONS_SUCCESS | Elements: {len(training_options['elements'])} | "
-                f"Technics: {len(training_options['technics'])} | RIRs: {len(training_options['rirs'])}"
-            )
-
-            return training_options
-
-        except requests.RequestException as e:
-            service_logger.error(f"CMS_REQUEST_EXCEPTION | Error: {str(e)}")
+        section_status = training_options["sectionStatus"]
+        if all(outcome in ("error", "timeout") for outcome in section_status.values()):
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Content service unavailable"
             )
-        except HTTPException:
-            raise
-        except Exception as e:
-            service_logger.error(f"CMS_UNEXPECTED_ERROR | Error: {str(e)}")
+
+        if not any(training_options[section] for section in TRAINING_OPTION_SECTIONS):
+            service_logger.warning("NO_TRAINING_OPTIONS_RETRIEVED")
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error retrieving training options"
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No training options found in CMS"
             )
 
+        service_logger.info(
+            f"TRAINING_OPTIONS_SUCCESS | Elements: {len(training_options['elements'])} | "
+            f"Technics: {len(training_options['technics'])} | RIRs: {len(training_options['rirs'])} | "
+            f"Status: {section_status}"
+        )
+
+        return training_options
+
+    @classmethod
+    async def _fetch_option_names(cls, section: str, headers: Dict[str, str]) -> List[str]:
+        service_logger.debug(f"CMS_REQUEST | URL: {cls.cms_url}/{section}")
+        response = await HttpClient.client(cls.cms_url).get(
+            f"/{section}?fields=name&pagination[limit]=100",
+            headers=headers,
+            timeout=CMS_FAN_OUT_DEADLINE_SECONDS
+        )
+        response.raise_for_status()
+
+        names = [item["name"] for item in response.json()["data"] if item.get("name")]
+        service_logger.info(f"{section.upper()}_FETCHED | Count: {len(names)}")
+        return names
+
     import json
 
     @classmethod
-    async def get_plans(cls):
+    async def _fetch_plans(cls):
         service_logger.info("FETCHING_PLANS_FROM_CMS")
 
         try:
             headers = {"Authorization": f"Bearer {cls.cms_api_key}"} if cls.cms_api_key else {}
 
             url = (
-                f"{cls.cms_url}/plans"
+                "/plans"
                 "?populate[graphics][fields]=name,slug"
                 "&fields=name,slug,monthlyPrice,anualPrice,maxDailyMealPlans,maxMentees,contactButton"
                 "&pagination[limit]=100"
             )
-            service_logger.debug(f"CMS_REQUEST | URL: {url} | Auth present: {bool(cls.cms_api_key)}")
+            service_logger.debug(f"CMS_REQUEST | URL: {cls.cms_url}{url} | Auth present: {bool(cls.cms_api_key)}")
 
-            response = requests.get(url, headers=headers, timeout=10)
+            response = await HttpClient.client(cls.cms_url).get(url, headers=headers, timeout=10)
             service_logger.debug(f"CMS_RESPONSE_STATUS: {response.status_code}")
 
             try:
@@ -183,7 +289,7 @@ class ContentService:
                     detail="Invalid response from CMS"
                 )
 
-            if not response.ok:
+            if not response.is_success:
                 service_logger.error(
                     f"CMS_REQUEST_FAILED | Status: {response.status_code} | Response: {response.text[:200]}"
                 )
@@ -264,7 +370,7 @@ class ContentService:
             service_logger.info(f"FORMATTED_PLANS_COUNT: {len(formatted_plans)}")
             return formatted_plans
 
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             service_logger.error(f"CMS_REQUEST_EXCEPTION | Error: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -13,7 +13,9 @@ from app.schemas.macronutrients_schema import (
     MacrosResponse,
     ObjectiveType
 )
-from app.models.macronutrients import Macros
+from app.models.macronutrients import Macronutrients, Macros
+from app.utils.macros_utils import MacrosUtils
+from app.utils.response_cache import ResponseCache
 
 macronutrients_service_logger = logging.getLogger("dreamfit_api.macronutrients_service")
 
@@ -58,29 +60,19 @@ class MacronutrientsService:
             macronutrients_data = {
                 "mentee_id": data.mentee_id,
                 "coach_id": coach_id,
-                "calories": str(calculations["final_calories"]),
+                "calories": calculations["final_calories"],
                 "macros": Macros(
-                    protein=f"{calculations['protein_grams']}g",
-                    fat=f"{calculations['fat_grams']}g",
-                    carbs=f"{calculations['carbs_grams']}g"
+                    protein=calculations["protein_grams"],
+                    fat=calculations["fat_grams"],
+                    carbs=calculations["carbs_grams"]
                 ),
                 "created_at": datetime.now(timezone.utc)
             }
 
             saved_macronutrients = await MacronutrientsRepository.create(macronutrients_data)
+            await ResponseCache.invalidate(f"macros:{data.mentee_id}")
 
-            macronutrients_response = MacronutrientsResponse(
-                id=str(saved_macronutrients.id),
-                mentee_id=saved_macronutrients.mentee_id,
-                coach_id=saved_macronutrients.coach_id,
-                calories=saved_macronutrients.calories,
-                macros=MacrosResponse(
-                    protein=saved_macronutrients.macros.protein,
-                    fat=saved_macronutrients.macros.fat,
-                    carbs=saved_macronutrients.macros.carbs
-                ),
-                created_at=saved_macronutrients.created_at.isoformat()
-            )
+            macronutrients_response = MacronutrientsService._to_response(saved_macronutrients)
 
             response = MacronutrientsCalculationResponse(
                 bmr=calculations["bmr"],
@@ -147,6 +139,21 @@ class MacronutrientsService:
             "carbs_calories": carbs_calories
         }
 
+    @staticmethod
+    def _to_response(macro: Macronutrients) -> MacronutrientsResponse:
+        return MacronutrientsResponse(
+            id=str(macro.id),
+            mentee_id=macro.mentee_id,
+            coach_id=macro.coach_id,
+            calories=MacrosUtils.format_calories(macro.calories),
+            macros=MacrosResponse(
+                protein=MacrosUtils.format_grams(macro.macros.protein),
+                fat=MacrosUtils.format_grams(macro.macros.fat),
+                carbs=MacrosUtils.format_grams(macro.macros.carbs)
+            ),
+            created_at=macro.created_at.isoformat()
+        )
+
     @staticmethod
     async def get_macronutrients_by_mentee(mentee_id: str, requestor_id: str) -> List[MacronutrientsResponse]:
         macronutrients_service_logger.info(
@@ -175,20 +182,7 @@ class MacronutrientsService:
 
             macronutrients_list = await MacronutrientsRepository.get_by_mentee_id(mentee_id)
 
-            response = []
-            for macro in macronutrients_list:
-                response.append(MacronutrientsResponse(
-                    id=str(macro.id),
-                    mentee_id=macro.mentee_id,
-                    coach_id=macro.coach_id,
-                    calories=macro.calories,
-                    macros=MacrosResponse(
-                        protein=macro.macros.protein,
-                        fat=macro.macros.fat,
-                        carbs=macro.macros.carbs
-                    ),
-                    created_at=macro.created_at.isoformat()
-                ))
+            response = [MacronutrientsService._to_response(macro) for macro in macronutrients_list]
 
             macronutrients_service_logger.info(
                 f"GET_MACRONUTRIENTS_BY_MENTEE_SUCCESS | MenteeID: {mentee_id} | Count: {len(response)}"
@@ -243,18 +237,7 @@ class MacronutrientsService:
                     detail="No macronutrients found for this mentee"
                 )
 
-            response = MacronutrientsResponse(
-                id=str(latest_macro.id),
-                mentee_id=latest_macro.mentee_id,
-                coach_id=latest_macro.coach_id,
-                calories=latest_macro.calories,
-                macros=MacrosResponse(
-                    protein=latest_macro.macros.protein,
-                    fat=latest_macro.macros.fat,
-                    carbs=latest_macro.macros.carbs
-                ),
-                created_at=latest_macro.created_at.isoformat()
-            )
+            response = MacronutrientsService._to_response(latest_macro)
 
             macronutrients_service_logger.info(
                 f"GET_LATEST_MACRONUTRIENTS_SUCCESS | MenteeID: {mentee_id} | MacroID: {latest_macro.id}"
@@ -1,18 +1,25 @@
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
+from uuid import uuid4
 
 from fastapi import HTTPException, status
-from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
 
 from app.repositories.meal_plan_repository import MealPlanRepository
 from app.repositories.mentee_profile_repository import MenteeProfileRepository
 from app.repositories.macronutrients_repository import MacronutrientsRepository
 from app.services.openai_service import OpenAIService
 from app.schemas.meal_plan_schema import CreateMealPlanRequest
+from app.schemas.response_schemas import ResponsePayload
+from app.utils.compression_utils import CompressionUtils
+from app.utils.metrics import Metrics
+from app.utils.response_cache import ResponseCache
 
 meal_plan_logger = logging.getLogger("dreamfit_api.meal_plan_service")
 
+MEAL_PLAN_MESSAGE = "OK"
+
 
 class MealPlanService:
     @staticmethod
@@ -40,10 +47,10 @@ class MealPlanService:
                     detail="Debes calcular los macronutrientes del alumno antes de crear un plan de alimentación"
                 )
 
-            calories = int(macros.calories)
-            protein = int(macros.macros.protein.replace('g', ''))
-            fat = int(macros.macros.fat.replace('g', ''))
-            carbs = int(macros.macros.carbs.replace('g', ''))
+            calories = macros.calories
+            protein = macros.macros.protein
+            fat = macros.macros.fat
+            carbs = macros.macros.carbs
 
             meal_plan_logger.debug(
                 f"USING_MACROS | Calories: {calories} | Protein: {protein}g | "
@@ -61,33 +68,47 @@ class MealPlanService:
                 notes=request_data.notes or ""
             )
 
-            await MealPlanRepository.delete_previous_plans(request_data.mentee_id)
-            meal_plan_logger.debug(f"PREVIOUS_PLANS_DELETED | MenteeID: {request_data.mentee_id}")
-
             plan_data = {
                 "mentee_id": request_data.mentee_id,
                 "coach_id": coach_id,
                 "calories": generated_plan["calories"],
                 "dailyMacros": generated_plan["dailyMacros"],
                 "days": generated_plan["days"],
-                "created_at": datetime.now(timezone.utc)
+                "created_at": datetime.now(timezone.utc),
+                "revision": uuid4().hex
             }
 
-            created_plan = await MealPlanRepository.create(plan_data)
-            meal_plan_logger.info(f"MEAL_PLAN_CREATED | PlanID: {created_plan.id}")
+            try:
+                plan = await MealPlanRepository.replace_for_mentee(plan_data)
+            except ValidationError as e:
+                error = e.errors(include_url=False)[0]
+                meal_plan_logger.error(
+                    f"OPENAI_INVALID_VALUES | MenteeID: {request_data.mentee_id} | "
+                    f"Field: {'.'.join(str(part) for part in error['loc'])} | Error: {error['msg']}"
+                )
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Invalid meal plan values from OpenAI"
+                )
+            plan_id = str(plan["_id"])
+            meal_plan_logger.info(f"MEAL_PLAN_REPLACED | PlanID: {plan_id}")
+
+            if await MenteeProfileRepository.set_plan_pointer(request_data.mentee_id, "mealPlan", plan_id):
+                meal_plan_logger.debug(f"MENTEE_STATUS_UPDATED | MenteeID: {request_data.mentee_id} | PlanID: {plan_id}")
+            else:
+                meal_plan_logger.warning(f"MENTEE_NOT_FOUND_FOR_STATUS_UPDATE | MenteeID: {request_data.mentee_id}")
 
-            await MealPlanService._update_mentee_meal_plan_status(
-                request_data.mentee_id,
-                str(created_plan.id)
-            )
+            await ResponseCache.invalidate(f"meal-plan:{request_data.mentee_id}", f"mentee:{request_data.mentee_id}")
+
+            await MealPlanService._store_rendered_plan(plan_id, plan_data["revision"], plan)
 
             meal_plan_logger.info(
                 f"CREATE_MEAL_PLAN_SUCCESS | CoachID: {coach_id} | "
-                f"MenteeID: {request_data.mentee_id} | PlanID: {created_plan.id}"
+                f"MenteeID: {request_data.mentee_id} | PlanID: {plan_id}"
             )
 
             return {
-                "plan_id": str(created_plan.id),
+                "plan_id": plan_id,
                 "message": "Plan de alimentación creado exitosamente"
             }
 
@@ -107,7 +128,7 @@ class MealPlanService:
     async def get_meal_plan_by_mentee(
             mentee_id: str,
             logged_user_id: str
-    ) -> Dict[str, Any]:
+    ) -> Tuple[str, bytes]:
 
         meal_plan_logger.info(
             f"GET_MEAL_PLAN_START | MenteeID: {mentee_id} | UserID: {logged_user_id}"
@@ -125,7 +146,7 @@ class MealPlanService:
                         detail="No tienes permiso para acceder a este plan de alimentación"
                     )
 
-            plan = await MealPlanRepository.get_by_mentee_id(mentee_id)
+            plan = await MealPlanRepository.get_rendered_by_mentee_id(mentee_id)
 
             if not plan:
                 meal_plan_logger.warning(f"PLAN_NOT_FOUND | MenteeID: {mentee_id}")
@@ -134,11 +155,19 @@ class MealPlanService:
                     detail="No se encontró un plan de alimentación para este alumno"
                 )
 
+            plan_id = str(plan["_id"])
+            if plan.get("rendered") and plan.get("rendered_revision") == plan.get("revision"):
+                Metrics.increment("plans.rendered.hit")
+                body = bytes(plan["rendered"])
+            else:
+                Metrics.increment("plans.rendered.miss")
+                body = await MealPlanService._render_plan(plan_id, plan.get("revision"))
+
             meal_plan_logger.info(
-                f"GET_MEAL_PLAN_SUCCESS | MenteeID: {mentee_id} | PlanID: {plan.id}"
+                f"GET_MEAL_PLAN_SUCCESS | MenteeID: {mentee_id} | PlanID: {plan_id}"
             )
 
-            return MealPlanService._format_meal_plan_response(plan)
+            return plan_id, body
 
         except HTTPException:
             raise
@@ -151,6 +180,35 @@ class MealPlanService:
                 detail=f"Error retrieving meal plan: {str(e)}"
             )
 
+    @staticmethod
+    async def _render_plan(
+            plan_id: str,
+            expected_revision: Optional[str],
+            plan: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        if plan is None:
+            plan = await MealPlanRepository.get_response_by_id(plan_id)
+        if not plan:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No se encontró un plan de alimentación para este alumno"
+            )
+
+        body = CompressionUtils.compress(ResponsePayload.encode(MEAL_PLAN_MESSAGE, plan))
+        revision = expected_revision or uuid4().hex
+        stored = await MealPlanRepository.set_rendered(plan_id, expected_revision, revision, body)
+        meal_plan_logger.debug(
+            f"MEAL_PLAN_RENDERED | PlanID: {plan_id} | Revision: {revision} | Stored: {stored} | Bytes: {len(body)}"
+        )
+        return body
+
+    @staticmethod
+    async def _store_rendered_plan(plan_id: str, revision: str, plan: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            await MealPlanService._render_plan(plan_id, revision, plan)
+        except Exception as e:
+            meal_plan_logger.error(f"MEAL_PLAN_RENDER_FAILED | PlanID: {plan_id} | Error: {str(e)}")
+
     @staticmethod
     async def _validate_mentee_belongs_to_coach(coach_id: str, mentee_id: str) -> None:
         mentee_profile = await MenteeProfileRepository.get_by_user_id(mentee_id)
@@ -176,31 +234,3 @@ class MealPlanService:
     async def _get_mentee_macronutrients(mentee_id: str):
         macros_list = await MacronutrientsRepository.get_by_mentee_id(mentee_id)
         return macros_list[0] if macros_list else None
-
-    @staticmethod
-    async def _update_mentee_meal_plan_status(mentee_id: str, plan_id: str) -> None:
-        mentee_profile = await MenteeProfileRepository.get_by_user_id(mentee_id)
-
-        if mentee_profile:
-            mentee_profile.userPlans.mealPlan.active = True
-            mentee_profile.userPlans.mealPlan.planId = plan_id
-            await mentee_profile.save()
-            meal_plan_logger.debug(
-                f"MENTEE_STATUS_UPDATED | MenteeID: {mentee_id} | PlanID: {plan_id}"
-            )
-
-    @staticmethod
-    def _format_meal_plan_response(plan) -> Dict[str, Any]:
-        plan_dict = jsonable_encoder(plan)
-
-        return {
-            "_id": plan_dict["_id"],
-            "coach_id": plan_dict["coach_id"],
-            "mentee_id": plan_dict["mentee_id"],
-            "created_at": plan_dict["created_at"],
-            "mealPlan": {
-                "calories": plan_dict["calories"],
-                "dailyMacros": plan_dict["dailyMacros"],
-                "days": plan_dict["days"]
-            }
-        }
\ No newline at end of file
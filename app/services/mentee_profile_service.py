@@ -1,35 +1,71 @@
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
+from bson import ObjectId
 from fastapi import HTTPException, status
 from fastapi.encoders import jsonable_encoder
 
 from app.models.mentee_profile import MenteeProfile
+from app.models.physical_data import BodyMeasurement, MeasurementMeta
 from app.repositories.mentee_profile_repository import MenteeProfileRepository
 from app.repositories.physical_data_repository import PhysicalDataRepository
+from app.repositories.latest_measurements_repository import LatestMeasurementsRepository
+from app.repositories.partial_update import PartialUpdate
+from app.schemas.mentee_profile_schema import UpdateMenteeProfileRequest
 from app.schemas.physical_data_schema import RequestPhysicalData
+from app.utils.enums import MeasurementKind
+from app.utils.pagination_utils import PaginationUtils
+from app.utils.response_cache import ResponseCache
 
 mentee_service_logger = logging.getLogger("dreamfit_api.mentee_service")
 
+MENTEES_DEFAULT_LIMIT = 50
+MENTEES_MAX_LIMIT = 200
+
 
 class MenteeProfileService:
     @staticmethod
-    async def get_by_coach(coach_id: str) -> list:
-        mentee_service_logger.info(f"GET_MENTEES_BY_COACH_START | CoachID: {coach_id}")
+    async def get_by_coach(
+            coach_id: str,
+            name_prefix: Optional[str] = None,
+            cursor: Optional[str] = None,
+            limit: int = MENTEES_DEFAULT_LIMIT
+    ) -> Dict[str, Any]:
+        mentee_service_logger.info(
+            f"GET_MENTEES_BY_COACH_START | CoachID: {coach_id} | Prefix: {name_prefix} | Limit: {limit}"
+        )
 
         try:
-            mentees = await MenteeProfileRepository.get_by_coach(coach_id)
-
-            if len(mentees) > 0:
-                mentee_service_logger.info(
-                    f"GET_MENTEES_BY_COACH_SUCCESS | CoachID: {coach_id} | Count: {len(mentees)}"
-                )
-                return [mentee.model_dump() for mentee in mentees]
+            after = None
+            if cursor:
+                position = PaginationUtils.decode_cursor(cursor)
+                if not isinstance(position.get("name"), str) or not ObjectId.is_valid(position.get("id")):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid pagination cursor"
+                    )
+                after = (position["name"], ObjectId(position["id"]))
+
+            mentees = await MenteeProfileRepository.get_by_coach(coach_id, name_prefix, after, limit + 1)
+
+            next_cursor = None
+            if len(mentees) > limit:
+                last = mentees[limit - 1]
+                next_cursor = PaginationUtils.encode_cursor({"name": last["name"], "id": str(last["_id"])})
+                mentees = mentees[:limit]
+
+            for mentee in mentees:
+                mentee.pop("_id", None)
 
-            mentee_service_logger.info(f"GET_MENTEES_BY_COACH_EMPTY | CoachID: {coach_id}")
-            return []
+            mentee_service_logger.info(
+                f"GET_MENTEES_BY_COACH_SUCCESS | CoachID: {coach_id} | Count: {len(mentees)} | "
+                f"HasMore: {next_cursor is not None}"
+            )
+            return {"mentees": mentees, "next_cursor": next_cursor}
 
+        except HTTPException:
+            raise
         except Exception as e:
             mentee_service_logger.error(
                 f"GET_MENTEES_BY_COACH_ERROR | CoachID: {coach_id} | Error: {str(e)}"
@@ -45,59 +81,31 @@ class MenteeProfileService:
 
         try:
             current_date = datetime.now(timezone.utc)
-            results: Dict[str, Any] = {}
-
-            weight_data = data.weight.dict()
-            weight_data["date"] = current_date
-            weight_data["user_id"] = mentee_id
-            results["weight"] = await PhysicalDataRepository.create_weight_record(weight_data)
-            mentee_service_logger.debug(f"WEIGHT_RECORD_CREATED | MenteeID: {mentee_id}")
-
-            chest_data = data.chest.dict()
-            chest_data["date"] = current_date
-            chest_data["user_id"] = mentee_id
-            results["chest"] = await PhysicalDataRepository.create_chest_measurement(chest_data)
-            mentee_service_logger.debug(f"CHEST_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
-
-            waist_data = data.waist.dict()
-            waist_data["date"] = current_date
-            waist_data["user_id"] = mentee_id
-            results["waist"] = await PhysicalDataRepository.create_waist_measurement(waist_data)
-            mentee_service_logger.debug(f"WAIST_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
-
-            hips_data = data.hips.dict()
-            hips_data["date"] = current_date
-            hips_data["user_id"] = mentee_id
-            results["hips"] = await PhysicalDataRepository.create_hips_measurement(hips_data)
-            mentee_service_logger.debug(f"HIPS_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
-
-            neck_data = data.neck.dict()
-            neck_data["date"] = current_date
-            neck_data["user_id"] = mentee_id
-            results["neck"] = await PhysicalDataRepository.create_neck_measurement(neck_data)
-            mentee_service_logger.debug(f"NECK_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
-
-            leg_data = {"measurements": data.leg.dict()}
-            leg_data["date"] = current_date
-            leg_data["user_id"] = mentee_id
-            results["leg"] = await PhysicalDataRepository.create_leg_measurement(leg_data)
-            mentee_service_logger.debug(f"LEG_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
-
-            arms_data = {"measurements": data.arms.dict()}
-            arms_data["date"] = current_date
-            arms_data["user_id"] = mentee_id
-            results["arms"] = await PhysicalDataRepository.create_arm_measurement(arms_data)
-            mentee_service_logger.debug(f"ARM_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
-
-            calves_data = {"measurements": data.calves.dict()}
-            calves_data["date"] = current_date
-            calves_data["user_id"] = mentee_id
-            results["calves"] = await PhysicalDataRepository.create_calf_measurement(calves_data)
-            mentee_service_logger.debug(f"CALF_MEASUREMENT_CREATED | MenteeID: {mentee_id}")
+
+            snapshot = {
+                "weight": (MeasurementKind.weight, data.weight.dict()),
+                "chest": (MeasurementKind.chest, data.chest.dict()),
+                "waist": (MeasurementKind.waist, data.waist.dict()),
+                "hips": (MeasurementKind.hips, data.hips.dict()),
+                "neck": (MeasurementKind.neck, data.neck.dict()),
+                "leg": (MeasurementKind.leg, {"measurements": data.leg.dict()}),
+                "arms": (MeasurementKind.arm, {"measurements": data.arms.dict()}),
+                "calves": (MeasurementKind.calf, {"measurements": data.calves.dict()})
+            }
+            records = {
+                measurement_type: cls._build_measurement(mentee_id, current_date, kind, fields)
+                for measurement_type, (kind, fields) in snapshot.items()
+            }
+
+            created = await PhysicalDataRepository.create_snapshot(records)
+            results = {measurement_type: str(record.id) for measurement_type, record in created.items()}
+
+            await cls._update_latest_measurements(mentee_id, created.values())
 
             mentee_service_logger.info(
                 f"ADD_PHYSICAL_DATA_SUCCESS | MenteeID: {mentee_id} | RecordsCreated: {len(results)}"
             )
+            return results
 
         except Exception as e:
             mentee_service_logger.error(
@@ -109,11 +117,15 @@ class MenteeProfileService:
             )
 
     @staticmethod
-    async def update_profile(user_id: str, update_data: dict) -> MenteeProfile:
+    async def update_profile(user_id: str, update_data: UpdateMenteeProfileRequest) -> dict:
         mentee_service_logger.info(f"UPDATE_PROFILE_START | MenteeID: {user_id}")
 
         try:
-            profile = await MenteeProfileRepository.get_by_user_id(user_id)
+            profile = await MenteeProfileRepository.update_by_user_id(
+                user_id,
+                PartialUpdate.to_set(update_data),
+                {"_id": 0, "user_id": 0, "coach_id": 0}
+            )
 
             if not profile:
                 mentee_service_logger.warning(f"UPDATE_PROFILE_NOT_FOUND | MenteeID: {user_id}")
@@ -122,19 +134,10 @@ class MenteeProfileService:
                     detail="Mentee profile not found"
                 )
 
-            update_dict = update_data.dict(exclude_unset=True)
-
-            profile.age = update_dict["age"]
-            profile.gender = update_dict["gender"]
-            profile.height = update_dict["height"]
-            profile.supplements = update_dict["supplements"]
-            profile.weeklyExerciseFrequency = update_dict["weeklyExerciseFrequency"]
-            profile.activityLevel = update_dict["activityLevel"]
-
-            await profile.save()
+            await ResponseCache.invalidate(f"mentee:{user_id}")
 
             mentee_service_logger.info(f"UPDATE_PROFILE_SUCCESS | MenteeID: {user_id}")
-            return profile.dict()
+            return profile
 
         except HTTPException:
             raise
@@ -173,4 +176,32 @@ class MenteeProfileService:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="invalid user id provided"
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    async def _update_latest_measurements(mentee_id: str, records) -> None:
+        try:
+            await LatestMeasurementsRepository.apply_records(mentee_id, records)
+        except Exception as e:
+            mentee_service_logger.error(
+                f"LATEST_MEASUREMENTS_UPDATE_FAILED | MenteeID: {mentee_id} | Error: {str(e)}"
+            )
+            try:
+                await LatestMeasurementsRepository.delete_by_user_id(mentee_id)
+            except Exception as delete_error:
+                mentee_service_logger.error(
+                    f"LATEST_MEASUREMENTS_INVALIDATE_FAILED | MenteeID: {mentee_id} | Error: {str(delete_error)}"
+                )
+
+    @staticmethod
+    def _build_measurement(
+            mentee_id: str,
+            date: datetime,
+            kind: MeasurementKind,
+            fields: Dict[str, Any]
+    ) -> BodyMeasurement:
+        return BodyMeasurement(
+            meta=MeasurementMeta(user_id=mentee_id, kind=kind),
+            date=date,
+            **fields
+        )
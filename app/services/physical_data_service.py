@@ -1,19 +1,59 @@
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+from bson import ObjectId
 from fastapi import HTTPException, status
 
 from app.repositories.physical_data_repository import PhysicalDataRepository
 from app.repositories.mentee_profile_repository import MenteeProfileRepository
+from app.repositories.latest_measurements_repository import LatestMeasurementsRepository
+from app.utils.enums import MeasurementKind, WeightResolution, WeightUnit
+from app.utils.pagination_utils import PaginationUtils
 
 physical_service_logger = logging.getLogger("dreamfit_api.physical_service")
 
+WEIGHT_RECORDS_DEFAULT_LIMIT = 200
+WEIGHT_RECORDS_MAX_LIMIT = 1000
+
 
 class PhysicalDataService:
     @staticmethod
-    async def get_weight_records_by_user_id(user_id: str) -> List[dict]:
-        physical_service_logger.info(f"GET_WEIGHT_RECORDS_START | UserID: {user_id}")
+    async def get_weight_records_by_user_id(
+            user_id: str,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            resolution: WeightResolution = WeightResolution.raw,
+            cursor: Optional[str] = None,
+            limit: int = WEIGHT_RECORDS_DEFAULT_LIMIT
+    ) -> Dict[str, Any]:
+        physical_service_logger.info(
+            f"GET_WEIGHT_RECORDS_START | UserID: {user_id} | Resolution: {resolution.value} | "
+            f"Start: {start} | End: {end} | Limit: {limit}"
+        )
 
         try:
+            start = PhysicalDataService._as_utc(start)
+            end = PhysicalDataService._as_utc(end)
+            if start and end and start > end:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="start must be before end"
+                )
+
+            before = None
+            if cursor:
+                position = PaginationUtils.decode_cursor(cursor)
+                is_raw = resolution == WeightResolution.raw
+                if position.get("resolution") != resolution.value or \
+                        not isinstance(position.get("before"), datetime) or \
+                        (is_raw and not ObjectId.is_valid(position.get("id"))):
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Invalid pagination cursor"
+                    )
+                before = (position["before"], ObjectId(position["id"])) if is_raw else position["before"]
+
             mentee_profile = await MenteeProfileRepository.get_by_user_id(user_id)
             if not mentee_profile:
                 physical_service_logger.warning(f"GET_WEIGHT_RECORDS_USER_NOT_FOUND | UserID: {user_id}")
@@ -22,20 +62,45 @@ class PhysicalDataService:
                     detail="User not found"
                 )
 
-            weight_records = await PhysicalDataRepository.get_weight_records_by_user_id(user_id)
-
-            formatted_records = []
-            for record in weight_records:
-                formatted_records.append({
-                    "value": record.value,
-                    "date": record.date.isoformat(),
-                    "units": record.units
-                })
+            if resolution == WeightResolution.raw:
+                weight_records = await PhysicalDataRepository.get_weight_records(
+                    user_id, start, end, before, limit + 1
+                )
+                formatted_records = [
+                    {
+                        "value": record.value,
+                        "date": record.date.isoformat(),
+                        "units": record.units
+                    }
+                    for record in weight_records[:limit]
+                ]
+            else:
+                # Buckets are reported in the unit of the latest weigh-in; records logged in the other
+                # unit are converted before grouping so one bucket never mixes kg and lb.
+                latest = await PhysicalDataRepository.get_weight_records(user_id, None, None, None, 1)
+                units = WeightUnit(latest[0].units) if latest and latest[0].units else WeightUnit.kg
+                weight_records = await PhysicalDataRepository.get_weight_buckets(
+                    user_id, resolution, start, end, before, limit + 1, units
+                )
+                formatted_records = [
+                    {**bucket, "date": bucket["date"].isoformat()}
+                    for bucket in weight_records[:limit]
+                ]
+
+            next_cursor = None
+            if len(weight_records) > limit:
+                last_record = weight_records[limit - 1]
+                if resolution == WeightResolution.raw:
+                    position = {"resolution": resolution.value, "before": last_record.date, "id": str(last_record.id)}
+                else:
+                    position = {"resolution": resolution.value, "before": last_record["date"]}
+                next_cursor = PaginationUtils.encode_cursor(position)
 
             physical_service_logger.info(
-                f"GET_WEIGHT_RECORDS_SUCCESS | UserID: {user_id} | RecordCount: {len(formatted_records)}"
+                f"GET_WEIGHT_RECORDS_SUCCESS | UserID: {user_id} | RecordCount: {len(formatted_records)} | "
+                f"HasMore: {next_cursor is not None}"
             )
-            return formatted_records
+            return {"records": formatted_records, "next_cursor": next_cursor}
 
         except HTTPException:
             raise
@@ -53,7 +118,11 @@ class PhysicalDataService:
         physical_service_logger.info(f"GET_BODY_MEASUREMENTS_START | UserID: {user_id}")
 
         try:
-            mentee_profile = await MenteeProfileRepository.get_by_user_id(user_id)
+            mentee_profile, snapshot = await asyncio.gather(
+                MenteeProfileRepository.get_by_user_id(user_id),
+                LatestMeasurementsRepository.get_by_user_id(user_id)
+            )
+
             if not mentee_profile:
                 physical_service_logger.warning(f"GET_BODY_MEASUREMENTS_USER_NOT_FOUND | UserID: {user_id}")
                 raise HTTPException(
@@ -61,81 +130,20 @@ class PhysicalDataService:
                     detail="User not found"
                 )
 
-            measurements = {}
+            if not snapshot:
+                snapshot = await LatestMeasurementsRepository.rebuild(user_id)
+                physical_service_logger.info(
+                    f"LATEST_MEASUREMENTS_REBUILT | UserID: {user_id} | MeasurementTypes: {len(snapshot.measurements)}"
+                )
 
-            arm_record = await PhysicalDataRepository.get_latest_arm_measurement(user_id)
-            if arm_record:
-                measurements["arm"] = {
-                    "left": {
-                        "value": arm_record.measurements.left.value,
-                        "units": arm_record.measurements.left.units
-                    },
-                    "right": {
-                        "value": arm_record.measurements.right.value,
-                        "units": arm_record.measurements.right.units
-                    }
-                }
-                physical_service_logger.debug(f"ARM_MEASUREMENT_FOUND | UserID: {user_id}")
-
-            calf_record = await PhysicalDataRepository.get_latest_calf_measurement(user_id)
-            if calf_record:
-                measurements["calf"] = {
-                    "left": {
-                        "value": calf_record.measurements.left.value,
-                        "units": calf_record.measurements.left.units
-                    },
-                    "right": {
-                        "value": calf_record.measurements.right.value,
-                        "units": calf_record.measurements.right.units
-                    }
-                }
-                physical_service_logger.debug(f"CALF_MEASUREMENT_FOUND | UserID: {user_id}")
-
-            chest_record = await PhysicalDataRepository.get_latest_chest_measurement(user_id)
-            if chest_record:
-                measurements["chest"] = {
-                    "value": chest_record.value,
-                    "units": chest_record.units
-                }
-                physical_service_logger.debug(f"CHEST_MEASUREMENT_FOUND | UserID: {user_id}")
-
-            hips_record = await PhysicalDataRepository.get_latest_hips_measurement(user_id)
-            if hips_record:
-                measurements["hips"] = {
-                    "value": hips_record.value,
-                    "units": hips_record.units
-                }
-                physical_service_logger.debug(f"HIPS_MEASUREMENT_FOUND | UserID: {user_id}")
-
-            leg_record = await PhysicalDataRepository.get_latest_leg_measurement(user_id)
-            if leg_record:
-                measurements["leg"] = {
-                    "left": {
-                        "value": leg_record.measurements.left.value,
-                        "units": leg_record.measurements.left.units
-                    },
-                    "right": {
-                        "value": leg_record.measurements.right.value,
-                        "units": leg_record.measurements.right.units
-                    }
-                }
-                physical_service_logger.debug(f"LEG_MEASUREMENT_FOUND | UserID: {user_id}")
-
-            neck_record = await PhysicalDataRepository.get_latest_neck_measurement(user_id)
-            if neck_record:
-                measurements["neck"] = {
-                    "value": neck_record.value,
-                    "units": neck_record.units
-                }
-                physical_service_logger.debug(f"NECK_MEASUREMENT_FOUND | UserID: {user_id}")
-
-            waist_record = await PhysicalDataRepository.get_latest_waist_measurement(user_id)
-            if waist_record:
-                measurements["waist"] = {
-                    "value": waist_record.value,
-                    "units": waist_record.units
-                }
-                physical_service_logger.debug(f"WAIST_MEASUREMENT_FOUND | UserID: {user_id}")
+            measurements = {}
+            for kind, formatter in BODY_MEASUREMENT_FORMATTERS.items():
+                record = snapshot.measurements.get(kind.value)
+                if record:
+                    measurements[kind.value] = formatter(record)
+                    physical_service_logger.debug(
+                        f"{kind.value.upper()}_MEASUREMENT_FOUND | UserID: {user_id}"
+                    )
 
             physical_service_logger.info(
                 f"GET_BODY_MEASUREMENTS_SUCCESS | UserID: {user_id} | MeasurementTypes: {len(measurements)}"
@@ -151,4 +159,41 @@ class PhysicalDataService:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error retrieving body measurements"
-            )
\ No newline at end of file
+            )
+
+    @staticmethod
+    def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+        if value and value.tzinfo:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @staticmethod
+    def _format_single_measurement(record) -> Dict[str, Any]:
+        return {
+            "value": record.value,
+            "units": record.units
+        }
+
+    @staticmethod
+    def _format_bilateral_measurement(record) -> Dict[str, Any]:
+        return {
+            "left": {
+                "value": record.measurements.left.value,
+                "units": record.measurements.left.units
+            },
+            "right": {
+                "value": record.measurements.right.value,
+                "units": record.measurements.right.units
+            }
+        }
+
+
+BODY_MEASUREMENT_FORMATTERS = {
+    MeasurementKind.arm: PhysicalDataService._format_bilateral_measurement,
+    MeasurementKind.calf: PhysicalDataService._format_bilateral_measurement,
+    MeasurementKind.chest: PhysicalDataService._format_single_measurement,
+    MeasurementKind.hips: PhysicalDataService._format_single_measurement,
+    MeasurementKind.leg: PhysicalDataService._format_bilateral_measurement,
+    MeasurementKind.neck: PhysicalDataService._format_single_measurement,
+    MeasurementKind.waist: PhysicalDataService._format_single_measurement,
+}
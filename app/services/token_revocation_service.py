@@ -0,0 +1,136 @@
+import logging
+import time
+from typing import Optional
+
+from app.config import redis_client, REFRESH_TOKEN_EXPIRE_DAYS, REVOCATION_BLOOM_CAPACITY, \
+    REVOCATION_BLOOM_ERROR_RATE
+from app.utils.bloom_filter import BloomFilter
+from app.utils.metrics import Metrics
+from app.utils.redis_events import RedisEvents
+
+revocation_logger = logging.getLogger("dreamfit_api.token_revocation_service")
+
+REVOCATIONS_CHANNEL = "dreamfit:token-revocations"
+JTI_KEY_PREFIX = "revoked:jti:"
+USER_KEY_PREFIX = "revoked:user:"
+
+
+class TokenRevocationService:
+    """Redis deny-list of token ids, fronted by a per-worker Bloom filter.
+
+    A negative Bloom lookup proves a token was never revoked, so the common
+    case needs no network call. Other workers learn about new revocations
+    through Redis pub/sub and rebuild the filter from Redis on (re)connect;
+    until the first rebuild completes every check goes to Redis.
+
+    User-wide revocation bumps a per-user token generation. Tokens carry the
+    generation they were issued under in the "gen" claim, and any token from
+    an older generation is rejected.
+    """
+
+    _bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+    _synced = False
+
+    @classmethod
+    def start(cls) -> None:
+        if redis_client is None:
+            revocation_logger.warning("REDIS_NOT_CONFIGURED | Token revocation is disabled")
+            return
+        RedisEvents.subscribe(REVOCATIONS_CHANNEL, cls._on_revocation, resync=cls._resync)
+
+    @classmethod
+    async def revoke_token(cls, jti: str, expires_at: int) -> None:
+        ttl = int(expires_at - time.time())
+        if not jti or ttl <= 0:
+            return
+        if redis_client is None:
+            revocation_logger.warning(f"REVOKE_TOKEN_SKIPPED | JTI: {jti} | Reason: Redis not configured")
+            return
+
+        await redis_client.set(f"{JTI_KEY_PREFIX}{jti}", 1, ex=ttl)
+        cls._bloom.add(f"jti:{jti}")
+        await RedisEvents.publish(REVOCATIONS_CHANNEL, {"item": f"jti:{jti}"})
+        revocation_logger.info(f"TOKEN_REVOKED | JTI: {jti}")
+
+    @classmethod
+    async def revoke_user_tokens(cls, user_id: str) -> None:
+        if redis_client is None:
+            revocation_logger.warning(f"REVOKE_USER_TOKENS_SKIPPED | UserID: {user_id} | Reason: Redis not configured")
+            return
+
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(f"{USER_KEY_PREFIX}{user_id}")
+            pipe.expire(f"{USER_KEY_PREFIX}{user_id}", REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600)
+            await pipe.execute()
+        cls._bloom.add(f"user:{user_id}")
+        await RedisEvents.publish(REVOCATIONS_CHANNEL, {"item": f"user:{user_id}"})
+        revocation_logger.info(f"USER_TOKENS_REVOKED | UserID: {user_id}")
+
+    @classmethod
+    async def current_generation(cls, user_id: str) -> int:
+        if redis_client is None:
+            return 0
+        try:
+            generation = await redis_client.get(f"{USER_KEY_PREFIX}{user_id}")
+        except Exception as e:
+            revocation_logger.error(f"TOKEN_GENERATION_READ_FAILED | UserID: {user_id} | Error: {str(e)}")
+            return 0
+        return int(generation or 0)
+
+    @classmethod
+    async def is_revoked(cls, claims: dict) -> bool:
+        if redis_client is None:
+            return False
+
+        jti: Optional[str] = claims.get("jti")
+        user_id: Optional[str] = claims.get("userId")
+
+        if cls._synced:
+            jti_suspect = bool(jti) and f"jti:{jti}" in cls._bloom
+            user_suspect = bool(user_id) and f"user:{user_id}" in cls._bloom
+
+            if not jti_suspect and not user_suspect:
+                Metrics.increment("token_revocation.bloom_negative")
+                return False
+        else:
+            Metrics.increment("token_revocation.unsynced_check")
+
+        Metrics.increment("token_revocation.redis_check")
+
+        try:
+            revoked_jti, generation = await redis_client.mget(
+                f"{JTI_KEY_PREFIX}{jti}",
+                f"{USER_KEY_PREFIX}{user_id}"
+            )
+        except Exception as e:
+            revocation_logger.error(f"REVOCATION_CHECK_FAILED | JTI: {jti} | UserID: {user_id} | Error: {str(e)}")
+            return True
+
+        if revoked_jti is not None:
+            return True
+
+        if generation is not None and int(claims.get("gen", 0)) < int(generation):
+            return True
+
+        return False
+
+    @classmethod
+    def _on_revocation(cls, message: dict) -> None:
+        cls._bloom.add(message["item"])
+
+    @classmethod
+    async def _resync(cls) -> None:
+        bloom = BloomFilter(REVOCATION_BLOOM_CAPACITY, REVOCATION_BLOOM_ERROR_RATE)
+        count = 0
+
+        async for key in redis_client.scan_iter(match="revoked:*", count=1000):
+            key = key.decode() if isinstance(key, bytes) else key
+            if key.startswith(JTI_KEY_PREFIX):
+                bloom.add(f"jti:{key[len(JTI_KEY_PREFIX):]}")
+            elif key.startswith(USER_KEY_PREFIX):
+                bloom.add(f"user:{key[len(USER_KEY_PREFIX):]}")
+            count += 1
+
+        cls._bloom = bloom
+        cls._synced = True
+        revocation_logger.info(f"REVOCATION_FILTER_RESYNCED | Entries: {count}")
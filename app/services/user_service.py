@@ -1,17 +1,21 @@
 import logging
 from datetime import datetime, timezone, timedelta
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
+from jose import JWTError, ExpiredSignatureError, jwt
 
 from app.config import ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS, SECRET_KEY, ALGORITHM
 from app.repositories.user_repository import UserRepository
 from app.repositories.coach_profile_repository import CoachProfileRepository
 from app.repositories.coach_code_repository import CoachCodeRepository
 from app.repositories.mentee_profile_repository import MenteeProfileRepository
+from app.repositories.partial_update import PartialUpdate
 from app.models.user import User
 from app.models.coach_code import CoachCode
+from app.services.token_revocation_service import TokenRevocationService
 from app.utils.auth_utils import AuthUtils
+from app.utils.password_hasher import PasswordHasher
 from app.utils.enums import RoleName
+from app.utils.response_cache import ResponseCache
 
 user_logger = logging.getLogger("dreamfit_api.user_service")
 
@@ -31,7 +35,7 @@ class UserService:
             await cls._validate_coach_code(RoleName(role).value, coach_code)
             user_logger.debug(f"COACH_CODE_VALIDATION_PASSED | Role: {role}")
 
-            hashed_password = AuthUtils.get_password_hash(password)
+            hashed_password = await PasswordHasher.hash(password)
             user_data = {
                 "email": email,
                 "password": hashed_password,
@@ -189,7 +193,7 @@ class UserService:
         user_logger.info(f"LOGIN_START | Email: {email}")
 
         try:
-            user = await UserRepository.get_by_email(email)
+            user = await UserRepository.get_with_profile_by_email(email)
 
             if not user:
                 user_logger.warning(f"LOGIN_USER_NOT_FOUND | Email: {email}")
@@ -198,34 +202,17 @@ class UserService:
                     detail="Invalid credentials"
                 )
 
-            if not AuthUtils.verify_password(password, user.password):
+            if not await PasswordHasher.verify(password, user["password"]):
                 user_logger.warning(f"LOGIN_INVALID_PASSWORD | Email: {email}")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Invalid credentials"
                 )
 
-            user_logger.info(f"LOGIN_CREDENTIALS_VALID | UserID: {user.id} | Email: {email}")
+            user_logger.info(f"LOGIN_CREDENTIALS_VALID | UserID: {user['user_id']} | Email: {email}")
 
-            token_data = {
-                "sub": user.email,
-                "userId": str(user.id),
-                "role": user.role,
-            }
-
-            if user.role == RoleName.coach:
-                user_data = await CoachProfileRepository.get_by_user_id(str(user.id))
-                coach_code = await CoachCodeRepository.get_by_user_id(str(user.id))
-                token_data.update({
-                    "firstName": user_data.name,
-                    "coachCode": coach_code.code
-                })
-                user_logger.debug(f"COACH_DATA_LOADED | UserID: {user.id}")
-
-            elif user.role == RoleName.mentee:
-                user_data = await MenteeProfileRepository.get_by_user_id(str(user.id))
-                token_data.update({"firstName": user_data.name})
-                user_logger.debug(f"MENTEE_DATA_LOADED | UserID: {user.id}")
+            token_data = cls._build_token_data(user)
+            token_data["gen"] = await TokenRevocationService.current_generation(user["user_id"])
 
             access_token = AuthUtils.create_token(
                 data=token_data,
@@ -234,10 +221,11 @@ class UserService:
 
             refresh_token = AuthUtils.create_token(
                 data=token_data,
-                expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+                expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+                token_type="refresh"
             )
 
-            user_logger.info(f"LOGIN_SUCCESS | UserID: {user.id} | Email: {email}")
+            user_logger.info(f"LOGIN_SUCCESS | UserID: {user['user_id']} | Email: {email}")
             return {"access_token": access_token, "refresh_token": refresh_token}
 
         except HTTPException:
@@ -249,6 +237,24 @@ class UserService:
                 detail="Login error"
             )
 
+    @staticmethod
+    def _build_token_data(user: dict) -> dict:
+        token_data = {
+            "sub": user["email"],
+            "userId": user["user_id"],
+            "role": user["role"],
+        }
+
+        if user["role"] == RoleName.coach:
+            token_data.update({
+                "firstName": user.get("first_name"),
+                "coachCode": user.get("coach_code")
+            })
+        elif user["role"] == RoleName.mentee:
+            token_data.update({"firstName": user.get("first_name")})
+
+        return token_data
+
     @classmethod
     async def refresh_token(cls, refresh_token: str) -> dict:
         user_logger.info("TOKEN_REFRESH_START")
@@ -257,7 +263,7 @@ class UserService:
             payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
             email = payload.get("sub")
 
-            if email is None:
+            if email is None or payload.get("userId") is None or payload.get("type") not in (None, "refresh"):
                 user_logger.warning("TOKEN_REFRESH_INVALID_TOKEN")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -274,31 +280,14 @@ class UserService:
             )
 
         try:
-            user = await UserRepository.get_by_email(email)
-
-            if not user:
-                user_logger.warning(f"TOKEN_REFRESH_USER_NOT_FOUND | Email: {email}")
+            if await TokenRevocationService.is_revoked(payload):
+                user_logger.warning(f"TOKEN_REFRESH_REVOKED | Email: {email} | JTI: {payload.get('jti')}")
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="User not found"
+                    detail="Refresh token has been revoked"
                 )
 
-            token_data = {
-                "sub": user.email,
-                "userId": str(user.id),
-                "role": user.role,
-            }
-
-            if user.role == RoleName.coach:
-                user_data = await CoachProfileRepository.get_by_user_id(str(user.id))
-                coach_code = await CoachCodeRepository.get_by_user_id(str(user.id))
-                token_data.update({
-                    "firstName": user_data.name,
-                    "coachCode": coach_code.code
-                })
-            elif user.role == RoleName.mentee:
-                user_data = await MenteeProfileRepository.get_by_user_id(str(user.id))
-                token_data.update({"firstName": user_data.name})
+            token_data = AuthUtils.strip_reserved_claims(payload)
 
             new_access_token = AuthUtils.create_token(
                 data=token_data,
@@ -307,10 +296,11 @@ class UserService:
 
             new_refresh_token = AuthUtils.create_token(
                 data=token_data,
-                expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+                expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+                token_type="refresh"
             )
 
-            user_logger.info(f"TOKEN_REFRESH_SUCCESS | UserID: {user.id}")
+            user_logger.info(f"TOKEN_REFRESH_SUCCESS | UserID: {token_data['userId']}")
             return {"access_token": new_access_token, "refresh_token": new_refresh_token}
 
         except HTTPException:
@@ -322,6 +312,32 @@ class UserService:
                 detail="Token refresh error"
             )
 
+    @classmethod
+    async def logout(cls, refresh_token: str) -> None:
+        user_logger.info("LOGOUT_START")
+
+        try:
+            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+        except ExpiredSignatureError:
+            user_logger.info("LOGOUT_TOKEN_ALREADY_EXPIRED")
+            return
+        except JWTError as e:
+            user_logger.warning(f"LOGOUT_JWT_ERROR | Error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token"
+            )
+
+        try:
+            await TokenRevocationService.revoke_token(payload.get("jti"), payload.get("exp"))
+            user_logger.info(f"LOGOUT_SUCCESS | UserID: {payload.get('userId')}")
+        except Exception as e:
+            user_logger.error(f"LOGOUT_ERROR | UserID: {payload.get('userId')} | Error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Logout error"
+            )
+
     @classmethod
     async def get_user_profile(cls, user_id: str) -> dict:
         user_logger.info(f"GET_USER_PROFILE_START | UserID: {user_id}")
@@ -369,38 +385,46 @@ class UserService:
         user_logger.info(f"UPDATE_USER_PROFILE_START | UserID: {user_id}")
 
         try:
+            fields = PartialUpdate.to_set({
+                "name": update_data.first_name or None,
+                "last_name": update_data.last_name or None
+            })
+            projection = {"_id": 0, "name": 1, "last_name": 1}
+
             if role == RoleName.coach:
-                profile = await CoachProfileRepository.get_by_user_id(user_id)
+                profile = await CoachProfileRepository.update_by_user_id(user_id, fields, projection)
                 if not profile:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail="Perfil de entrenador no encontrado"
                     )
 
-                if update_data.first_name:
-                    profile.name = update_data.first_name
-                if update_data.last_name:
-                    profile.last_name = update_data.last_name
-
-                await profile.save()
-
             elif role == RoleName.mentee:
-                profile = await MenteeProfileRepository.get_by_user_id(user_id)
+                profile = await MenteeProfileRepository.update_by_user_id(user_id, fields, projection)
                 if not profile:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail="Perfil de asesorado no encontrado"
                     )
+                await ResponseCache.invalidate(f"mentee:{user_id}")
 
-                if update_data.first_name:
-                    profile.name = update_data.first_name
-                if update_data.last_name:
-                    profile.last_name = update_data.last_name
+            else:
+                return await cls.get_user_profile(user_id)
 
-                await profile.save()
+            user = await UserRepository.get_by_id(user_id)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Usuario no encontrado"
+                )
 
             user_logger.info(f"UPDATE_USER_PROFILE_SUCCESS | UserID: {user_id}")
-            return await cls.get_user_profile(user_id)
+            return {
+                "email": user.email,
+                "role": user.role,
+                "first_name": profile["name"],
+                "last_name": profile["last_name"]
+            }
 
         except HTTPException:
             raise
@@ -425,14 +449,18 @@ class UserService:
                     detail="Usuario no encontrado"
                 )
 
-            if not AuthUtils.verify_password(current_password, user.password):
+            if not await PasswordHasher.verify(current_password, user.password):
                 user_logger.warning(f"CHANGE_PASSWORD_INVALID_CURRENT | UserID: {user_id}")
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Contraseña actual incorrecta"
                 )
 
-            user.password = AuthUtils.get_password_hash(new_password)
+            new_hash = await PasswordHasher.hash(new_password)
+            # Revoked before the save: if Redis is down the request fails with the old password still
+            # in place, instead of reporting an error for a password that was already changed.
+            await TokenRevocationService.revoke_user_tokens(user_id)
+            user.password = new_hash
             await user.save()
 
             user_logger.info(f"CHANGE_PASSWORD_SUCCESS | UserID: {user_id}")
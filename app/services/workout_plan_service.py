@@ -1,14 +1,24 @@
 import logging
+from uuid import uuid4
 from fastapi import HTTPException, status
-from typing import Dict, Any
-from fastapi.encoders import jsonable_encoder
+from typing import Dict, Any, Optional, Tuple
 
 from app.repositories.workout_plan_repository import WorkoutPlanRepository
 from app.repositories.mentee_profile_repository import MenteeProfileRepository
-from app.schemas.workout_plan_schema import CreateWorkoutPlanRequest
+from app.schemas.workout_plan_schema import CreateWorkoutPlanRequest, PatchWorkoutPlanRequest
+from app.schemas.response_schemas import ResponsePayload
+from app.utils.compression_utils import CompressionUtils
+from app.utils.enums import PlanView
+from app.utils.metrics import Metrics
+from app.utils.patch_utils import PatchUtils
+from app.utils.response_cache import ResponseCache
 
 workout_service_logger = logging.getLogger("dreamfit_api.workout_service")
 
+PATCHABLE_FIELDS = {"trainingObjective", "days"}
+
+CURRENT_PLAN_MESSAGE = "Current workout plan retrieved successfully"
+
 
 class WorkoutPlanService:
     @staticmethod
@@ -24,30 +34,32 @@ class WorkoutPlanService:
             workout_service_logger.debug(
                 f"MENTEE_VALIDATION_PASSED | CoachID: {coach_id} | MenteeID: {request_data.mentee_id}")
 
-            await WorkoutPlanRepository.delete_previous_plans(request_data.mentee_id)
-            workout_service_logger.debug(f"PREVIOUS_PLANS_DELETED | MenteeID: {request_data.mentee_id}")
-
             plan_data = {
                 "coach_id": coach_id,
                 "mentee_id": request_data.mentee_id,
                 "trainingObjective": request_data.trainingObjective,
-                "days": [day.dict() for day in request_data.days]
+                "days": [day.dict() for day in request_data.days],
+                "revision": uuid4().hex
             }
 
-            created_plan = await WorkoutPlanRepository.create(plan_data)
-            workout_service_logger.info(f"WORKOUT_PLAN_CREATED | PlanID: {created_plan.id}")
+            plan = await WorkoutPlanRepository.replace_for_mentee(plan_data)
+            plan_id = str(plan["_id"])
+            workout_service_logger.info(f"WORKOUT_PLAN_REPLACED | PlanID: {plan_id}")
 
-            await WorkoutPlanService._update_mentee_workout_plan_status(
-                request_data.mentee_id,
-                str(created_plan.id)
-            )
-            workout_service_logger.debug(f"MENTEE_STATUS_UPDATED | MenteeID: {request_data.mentee_id}")
+            if await MenteeProfileRepository.set_plan_pointer(request_data.mentee_id, "workoutsPlan", plan_id):
+                workout_service_logger.debug(f"MENTEE_STATUS_UPDATED | MenteeID: {request_data.mentee_id}")
+            else:
+                workout_service_logger.warning(f"MENTEE_NOT_FOUND_FOR_STATUS_UPDATE | MenteeID: {request_data.mentee_id}")
+
+            await ResponseCache.invalidate(f"workout-plan:{request_data.mentee_id}", f"mentee:{request_data.mentee_id}")
+
+            await WorkoutPlanService._store_rendered_plan(plan_id, plan_data["revision"], plan)
 
             workout_service_logger.info(
                 f"CREATE_WORKOUT_PLAN_SUCCESS | CoachID: {coach_id} | "
-                f"MenteeID: {request_data.mentee_id} | PlanID: {created_plan.id}"
+                f"MenteeID: {request_data.mentee_id} | PlanID: {plan_id}"
             )
-            return {"plan_id": str(created_plan.id)}
+            return {"plan_id": plan_id}
 
         except HTTPException:
             raise
@@ -68,23 +80,6 @@ class WorkoutPlanService:
         )
 
         try:
-            existing_plan = await WorkoutPlanRepository.get_by_id(plan_id)
-            if not existing_plan:
-                workout_service_logger.warning(f"WORKOUT_PLAN_NOT_FOUND | PlanID: {plan_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Workout plan not found"
-                )
-
-            if existing_plan.coach_id != coach_id:
-                workout_service_logger.warning(
-                    f"UPDATE_PLAN_ACCESS_DENIED | PlanID: {plan_id} | CoachID: {coach_id} | PlanCoachID: {existing_plan.coach_id}"
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You can only update your own workout plans"
-                )
-
             await WorkoutPlanService._validate_mentee_belongs_to_coach(
                 coach_id, request_data.mentee_id
             )
@@ -93,11 +88,17 @@ class WorkoutPlanService:
 
             update_data = {
                 "trainingObjective": request_data.trainingObjective,
-                "days": [day.dict() for day in request_data.days]
+                "days": [day.dict() for day in request_data.days],
+                "revision": uuid4().hex
             }
 
-            updated_plan = await WorkoutPlanRepository.update(plan_id, update_data)
+            updated_plan = await WorkoutPlanRepository.update(plan_id, update_data, coach_id)
+            if not updated_plan:
+                await WorkoutPlanService._raise_plan_not_writable(plan_id, coach_id)
             workout_service_logger.info(f"WORKOUT_PLAN_UPDATED | PlanID: {plan_id}")
+            await ResponseCache.invalidate(f"workout-plan:{updated_plan['mentee_id']}")
+
+            await WorkoutPlanService._store_rendered_plan(plan_id, update_data["revision"], updated_plan)
 
             workout_service_logger.info(
                 f"UPDATE_WORKOUT_PLAN_SUCCESS | PlanID: {plan_id} | CoachID: {coach_id} | "
@@ -117,12 +118,47 @@ class WorkoutPlanService:
                 detail=f"Error updating workout plan: {str(e)}"
             )
 
+    @staticmethod
+    async def patch_workout_plan(plan_id: str, coach_id: str, request_data: PatchWorkoutPlanRequest) -> Dict[str, Any]:
+        workout_service_logger.info(
+            f"PATCH_WORKOUT_PLAN_START | PlanID: {plan_id} | CoachID: {coach_id} | "
+            f"Revision: {request_data.revision} | Operations: {len(request_data.operations)}"
+        )
+
+        try:
+            patch = PatchUtils.compile(request_data.operations, CreateWorkoutPlanRequest, PATCHABLE_FIELDS)
+            revision = uuid4().hex
+
+            patched_plan = await WorkoutPlanRepository.apply_patch(
+                plan_id, coach_id, request_data.revision, revision, patch
+            )
+            if not patched_plan:
+                await WorkoutPlanService._raise_patch_rejected(plan_id, coach_id, request_data.revision)
+            workout_service_logger.info(f"WORKOUT_PLAN_PATCHED | PlanID: {plan_id} | Revision: {revision}")
+            await ResponseCache.invalidate(f"workout-plan:{patched_plan['mentee_id']}")
+
+            await WorkoutPlanService._store_rendered_plan(plan_id, revision, patched_plan)
+
+            workout_service_logger.info(f"PATCH_WORKOUT_PLAN_SUCCESS | PlanID: {plan_id} | CoachID: {coach_id}")
+            return {"plan_id": plan_id, "revision": revision}
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            workout_service_logger.error(
+                f"PATCH_WORKOUT_PLAN_ERROR | PlanID: {plan_id} | CoachID: {coach_id} | Error: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Error patching workout plan: {str(e)}"
+            )
+
     @staticmethod
     async def get_workout_plan_by_id(plan_id: str, logged_user_id: str) -> Dict[str, Any]:
         workout_service_logger.info(f"GET_WORKOUT_PLAN_START | PlanID: {plan_id} | UserID: {logged_user_id}")
 
         try:
-            plan = await WorkoutPlanRepository.get_by_id(plan_id)
+            plan = await WorkoutPlanRepository.get_response_by_id(plan_id)
 
             if not plan:
                 workout_service_logger.warning(f"WORKOUT_PLAN_NOT_FOUND | PlanID: {plan_id}")
@@ -131,10 +167,10 @@ class WorkoutPlanService:
                     detail="Workout plan not found"
                 )
 
-            if plan.coach_id != logged_user_id and plan.mentee_id != logged_user_id:
+            if plan["coach_id"] != logged_user_id and plan["mentee_id"] != logged_user_id:
                 workout_service_logger.warning(
                     f"WORKOUT_PLAN_ACCESS_DENIED | PlanID: {plan_id} | "
-                    f"UserID: {logged_user_id} | CoachID: {plan.coach_id} | MenteeID: {plan.mentee_id}"
+                    f"UserID: {logged_user_id} | CoachID: {plan['coach_id']} | MenteeID: {plan['mentee_id']}"
                 )
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
@@ -142,7 +178,7 @@ class WorkoutPlanService:
                 )
 
             workout_service_logger.info(f"GET_WORKOUT_PLAN_SUCCESS | PlanID: {plan_id}")
-            return WorkoutPlanService._format_workout_plan_response(plan)
+            return plan
 
         except HTTPException:
             raise
@@ -156,7 +192,11 @@ class WorkoutPlanService:
             )
 
     @staticmethod
-    async def get_workout_plans_by_coach(coach_id: str, logged_user_id: str) -> list:
+    async def get_workout_plans_by_coach(
+            coach_id: str,
+            logged_user_id: str,
+            view: PlanView = PlanView.full
+    ) -> list:
         workout_service_logger.info(f"GET_PLANS_BY_COACH_START | CoachID: {coach_id} | UserID: {logged_user_id}")
 
         try:
@@ -169,11 +209,19 @@ class WorkoutPlanService:
                     detail="You can only access your own workout plans"
                 )
 
-            plans = await WorkoutPlanRepository.get_by_coach_id(coach_id)
+            if view == PlanView.summary:
+                summaries = await WorkoutPlanRepository.get_summaries(WorkoutPlanRepository.coach_query(coach_id))
+                workout_service_logger.info(
+                    f"GET_PLANS_BY_COACH_SUCCESS | CoachID: {coach_id} | "
+                    f"PlanCount: {len(summaries)} | View: summary"
+                )
+                return [WorkoutPlanService._format_workout_plan_summary(summary) for summary in summaries]
+
+            plans = await WorkoutPlanRepository.get_response_documents(WorkoutPlanRepository.coach_query(coach_id))
             workout_service_logger.info(
                 f"GET_PLANS_BY_COACH_SUCCESS | CoachID: {coach_id} | PlanCount: {len(plans)}"
             )
-            return [WorkoutPlanService._format_workout_plan_response(plan) for plan in plans]
+            return plans
 
         except HTTPException:
             raise
@@ -187,7 +235,11 @@ class WorkoutPlanService:
             )
 
     @staticmethod
-    async def get_workout_plans_by_mentee(mentee_id: str, logged_user_id: str) -> list:
+    async def get_workout_plans_by_mentee(
+            mentee_id: str,
+            logged_user_id: str,
+            view: PlanView = PlanView.full
+    ) -> list:
         workout_service_logger.info(f"GET_PLANS_BY_MENTEE_START | MenteeID: {mentee_id} | UserID: {logged_user_id}")
 
         try:
@@ -202,11 +254,19 @@ class WorkoutPlanService:
                         detail="You don't have permission to access these workout plans"
                     )
 
-            plans = await WorkoutPlanRepository.get_by_mentee_id(mentee_id)
+            if view == PlanView.summary:
+                summaries = await WorkoutPlanRepository.get_summaries(WorkoutPlanRepository.mentee_query(mentee_id))
+                workout_service_logger.info(
+                    f"GET_PLANS_BY_MENTEE_SUCCESS | MenteeID: {mentee_id} | "
+                    f"PlanCount: {len(summaries)} | View: summary"
+                )
+                return [WorkoutPlanService._format_workout_plan_summary(summary) for summary in summaries]
+
+            plans = await WorkoutPlanRepository.get_response_documents(WorkoutPlanRepository.mentee_query(mentee_id))
             workout_service_logger.info(
                 f"GET_PLANS_BY_MENTEE_SUCCESS | MenteeID: {mentee_id} | PlanCount: {len(plans)}"
             )
-            return [WorkoutPlanService._format_workout_plan_response(plan) for plan in plans]
+            return plans
 
         except HTTPException:
             raise
@@ -220,7 +280,7 @@ class WorkoutPlanService:
             )
 
     @staticmethod
-    async def get_current_workout_plan_by_mentee(mentee_id: str, logged_user_id: str) -> Dict[str, Any]:
+    async def get_current_workout_plan_by_mentee(mentee_id: str, logged_user_id: str) -> Tuple[str, bytes]:
         workout_service_logger.info(f"GET_CURRENT_PLAN_START | MenteeID: {mentee_id} | UserID: {logged_user_id}")
 
         try:
@@ -235,7 +295,7 @@ class WorkoutPlanService:
                         detail="You don't have permission to access this workout plan"
                     )
 
-            plan = await WorkoutPlanRepository.get_active_plan_by_mentee(mentee_id)
+            plan = await WorkoutPlanRepository.get_rendered_by_mentee(mentee_id)
 
             if not plan:
                 workout_service_logger.warning(f"CURRENT_PLAN_NOT_FOUND | MenteeID: {mentee_id}")
@@ -244,10 +304,18 @@ class WorkoutPlanService:
                     detail="No workout plan found for this mentee"
                 )
 
+            plan_id = str(plan["_id"])
+            if plan.get("rendered") and plan.get("rendered_revision") == plan.get("revision"):
+                Metrics.increment("plans.rendered.hit")
+                body = bytes(plan["rendered"])
+            else:
+                Metrics.increment("plans.rendered.miss")
+                body = await WorkoutPlanService._render_plan(plan_id, plan.get("revision"))
+
             workout_service_logger.info(
-                f"GET_CURRENT_PLAN_SUCCESS | MenteeID: {mentee_id} | PlanID: {plan.id}"
+                f"GET_CURRENT_PLAN_SUCCESS | MenteeID: {mentee_id} | PlanID: {plan_id}"
             )
-            return WorkoutPlanService._format_workout_plan_response(plan)
+            return plan_id, body
 
         except HTTPException:
             raise
@@ -261,17 +329,86 @@ class WorkoutPlanService:
             )
 
     @staticmethod
-    def _format_workout_plan_response(plan) -> Dict[str, Any]:
-        plan_dict = jsonable_encoder(plan)
+    async def _render_plan(
+            plan_id: str,
+            expected_revision: Optional[str],
+            plan: Optional[Dict[str, Any]] = None
+    ) -> bytes:
+        if plan is None:
+            plan = await WorkoutPlanRepository.get_response_by_id(plan_id)
+        if not plan:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Workout plan not found"
+            )
+
+        body = CompressionUtils.compress(ResponsePayload.encode(CURRENT_PLAN_MESSAGE, plan))
+        revision = expected_revision or uuid4().hex
+        stored = await WorkoutPlanRepository.set_rendered(plan_id, expected_revision, revision, body)
+        workout_service_logger.debug(
+            f"WORKOUT_PLAN_RENDERED | PlanID: {plan_id} | Revision: {revision} | Stored: {stored} | Bytes: {len(body)}"
+        )
+        return body
+
+    @staticmethod
+    async def _store_rendered_plan(plan_id: str, revision: str, plan: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            await WorkoutPlanService._render_plan(plan_id, revision, plan)
+        except Exception as e:
+            workout_service_logger.error(f"WORKOUT_PLAN_RENDER_FAILED | PlanID: {plan_id} | Error: {str(e)}")
+
+    @staticmethod
+    async def _raise_plan_not_writable(plan_id: str, coach_id: str) -> None:
+        existing_plan = await WorkoutPlanRepository.get_by_id(plan_id)
+        if not existing_plan:
+            workout_service_logger.warning(f"WORKOUT_PLAN_NOT_FOUND | PlanID: {plan_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Workout plan not found"
+            )
+
+        workout_service_logger.warning(
+            f"UPDATE_PLAN_ACCESS_DENIED | PlanID: {plan_id} | CoachID: {coach_id} | PlanCoachID: {existing_plan.coach_id}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only update your own workout plans"
+        )
+
+    @staticmethod
+    async def _raise_patch_rejected(plan_id: str, coach_id: str, expected_revision: Optional[str]) -> None:
+        existing_plan = await WorkoutPlanRepository.get_by_id(plan_id)
+        if not existing_plan or existing_plan.coach_id != coach_id:
+            await WorkoutPlanService._raise_plan_not_writable(plan_id, coach_id)
+
+        if existing_plan.revision != expected_revision:
+            workout_service_logger.warning(
+                f"PATCH_REVISION_CONFLICT | PlanID: {plan_id} | Expected: {expected_revision} | "
+                f"Current: {existing_plan.revision}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="The workout plan was modified by another request, reload it and try again"
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="The patch addresses a day, muscular group or workout that does not exist"
+        )
+
+    @staticmethod
+    def _format_workout_plan_summary(summary: Dict[str, Any]) -> Dict[str, Any]:
+        created_at = summary.get("created_at")
 
         return {
-            "_id": plan_dict["_id"],
-            "coach_id": plan_dict["coach_id"],
-            "mentee_id": plan_dict["mentee_id"],
-            "created_at": plan_dict["created_at"],
+            "_id": summary["_id"],
+            "coach_id": summary["coach_id"],
+            "mentee_id": summary["mentee_id"],
+            "created_at": created_at.isoformat() if created_at else None,
             "workoutPlan": {
-                "trainingObjective": plan_dict["trainingObjective"],
-                "days": plan_dict["days"]
+                "trainingObjective": summary["trainingObjective"],
+                "dayCount": len(summary["days"]),
+                "days": summary["days"]
             }
         }
 
@@ -313,24 +450,3 @@ class WorkoutPlanService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error validating mentee-coach relationship"
             )
-
-    @staticmethod
-    async def _update_mentee_workout_plan_status(mentee_id: str, plan_id: str) -> None:
-        workout_service_logger.debug(f"UPDATING_MENTEE_STATUS | MenteeID: {mentee_id} | PlanID: {plan_id}")
-
-        try:
-            mentee_profile = await MenteeProfileRepository.get_by_user_id(mentee_id)
-
-            if mentee_profile:
-                mentee_profile.userPlans.workoutsPlan.active = True
-                mentee_profile.userPlans.workoutsPlan.planId = plan_id
-                await mentee_profile.save()
-                workout_service_logger.debug(f"MENTEE_STATUS_UPDATED_SUCCESS | MenteeID: {mentee_id}")
-            else:
-                workout_service_logger.warning(f"MENTEE_NOT_FOUND_FOR_STATUS_UPDATE | MenteeID: {mentee_id}")
-
-        except Exception as e:
-            workout_service_logger.warning(
-                f"MENTEE_STATUS_UPDATE_FAILED | MenteeID: {mentee_id} | "
-                f"PlanID: {plan_id} | Error: {str(e)}"
-            )
\ No newline at end of file
@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
+RESERVED_CLAIMS = ("exp", "iat", "jti", "type")
+
 
 class AuthUtils:
     pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
@@ -17,15 +20,20 @@ class AuthUtils:
         return cls.pwd_context.verify(plain_password, hashed_password)
 
     @staticmethod
-    def create_token(data: dict, expires_delta: timedelta = None) -> str:
+    def create_token(data: dict, expires_delta: timedelta = None, token_type: str = "access") -> str:
         to_encode = data.copy()
+        now = datetime.now(timezone.utc)
 
         if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
+            expire = now + expires_delta
         else:
-            expire = datetime.now(timezone.utc) + \
+            expire = now + \
                 timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
-        to_encode.update({'exp': expire})
+        to_encode.update({'exp': expire, 'iat': now, 'jti': uuid4().hex, 'type': token_type})
 
         return jwt.encode(to_encode, SECRET_KEY, ALGORITHM)
+
+    @staticmethod
+    def strip_reserved_claims(claims: dict) -> dict:
+        return {key: value for key, value in claims.items() if key not in RESERVED_CLAIMS}
@@ -0,0 +1,53 @@
+import gzip
+from typing import Dict
+
+from fastapi import Request, Response, status
+
+GZIP_LEVEL = 6
+
+
+class CompressionUtils:
+    @staticmethod
+    def compress(body: bytes) -> bytes:
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    @staticmethod
+    def accepts_gzip(request: Request) -> bool:
+        qualities = CompressionUtils.coding_qualities(request.headers.get("accept-encoding", ""))
+        quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+        return quality > 0
+
+    @staticmethod
+    def coding_qualities(accept_encoding: str) -> Dict[str, float]:
+        qualities = {}
+        for item in accept_encoding.lower().split(","):
+            coding, *params = [part.strip() for part in item.split(";")]
+            if not coding:
+                continue
+            quality = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[coding] = quality
+        return qualities
+
+    @staticmethod
+    def json_response(request: Request, compressed_body: bytes, status_code: int = status.HTTP_200_OK) -> Response:
+        if CompressionUtils.accepts_gzip(request):
+            return Response(
+                status_code=status_code,
+                content=compressed_body,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+            )
+
+        return Response(
+            status_code=status_code,
+            content=gzip.decompress(compressed_body),
+            media_type="application/json",
+            headers={"Vary": "Accept-Encoding"}
+        )
@@ -0,0 +1,200 @@
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import CONTENT_SNAPSHOT_PATH, CONTENT_SNAPSHOT_REFRESH_SECONDS, CONTENT_SNAPSHOT_CHECK_SECONDS, \
+    SWR_PARTIAL_SOFT_TTL_SECONDS
+from app.utils.metrics import Metrics
+
+content_snapshot_logger = logging.getLogger("dreamfit_api.content_snapshot")
+
+MAGIC = b"DFCS"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHd")
+ENTRY = struct.Struct("<32sQQd?")
+RELOAD_CHECK_SECONDS = 1.0
+LOCK_WAIT_SECONDS = 30.0
+
+Section = Tuple[float, bytes, bool]
+
+
+class ContentSnapshot:
+    """Read-only, memory-mapped snapshot of rendered CMS responses shared by every worker.
+
+    The file holds a header, a fixed-size table of (name, offset, length, fetched_at, complete)
+    entries and the gzip-rendered bodies. Writers build a new file and os.replace it into place; readers notice
+    the new inode and remap, so the bodies live once in the page cache whatever the worker count.
+    One worker at a time refreshes it, under an exclusive file lock. A section built from partial
+    upstream data makes the snapshot due again once it is older than the partial soft TTL.
+    """
+
+    _mm: Optional[mmap.mmap] = None
+    _inode: Optional[int] = None
+    _rejected_inode: Optional[int] = None
+    _index: Dict[str, Tuple[int, int, float, bool]] = {}
+    _checked_at = 0.0
+    _task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def start(cls, build: Callable[[], Awaitable[Dict[str, Section]]]) -> None:
+        cls.reload()
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._refresh_loop(build))
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def refresh_now(cls, build: Callable[[], Awaitable[Dict[str, Section]]]) -> None:
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while not await cls._refresh_locked(build, force=True):
+            if time.monotonic() >= deadline:
+                raise TimeoutError("Content snapshot lock is busy")
+            await asyncio.sleep(0.1)
+
+    @classmethod
+    def section(cls, name: str) -> Optional[Tuple[bytes, int]]:
+        now = time.monotonic()
+        if now - cls._checked_at >= RELOAD_CHECK_SECONDS:
+            cls._checked_at = now
+            cls.reload()
+
+        entry = cls._index.get(name)
+        if entry is None:
+            Metrics.increment(f"content_snapshot.{name}.miss")
+            return None
+
+        offset, length, fetched_at, _ = entry
+        Metrics.increment(f"content_snapshot.{name}.hit")
+        return bytes(cls._mm[offset:offset + length]), max(0, int(time.time() - fetched_at))
+
+    @classmethod
+    def write(cls, sections: Dict[str, Section]) -> None:
+        cls.reload()
+        merged = {name: (fetched_at, bytes(cls._mm[offset:offset + length]), complete)
+                  for name, (offset, length, fetched_at, complete) in cls._index.items()}
+        merged.update(sections)
+
+        offset = HEADER.size + ENTRY.size * len(merged)
+        table, bodies = [], []
+        for name, (fetched_at, body, complete) in merged.items():
+            table.append(ENTRY.pack(name.encode(), offset, len(body), fetched_at, complete))
+            bodies.append(body)
+            offset += len(body)
+
+        directory = os.path.dirname(CONTENT_SNAPSHOT_PATH) or "."
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".content-snapshot-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(merged), time.time()))
+                tmp.writelines(table + bodies)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, CONTENT_SNAPSHOT_PATH)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+        cls.reload()
+        content_snapshot_logger.info(f"CONTENT_SNAPSHOT_WRITTEN | Sections: {list(merged)} | Bytes: {offset}")
+
+    @classmethod
+    def reload(cls) -> None:
+        try:
+            inode = os.stat(CONTENT_SNAPSHOT_PATH).st_ino
+        except FileNotFoundError:
+            return
+        if inode in (cls._inode, cls._rejected_inode):
+            return
+
+        mm = None
+        try:
+            with open(CONTENT_SNAPSHOT_PATH, "rb") as snapshot_file:
+                inode = os.fstat(snapshot_file.fileno()).st_ino
+                mm = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, version, count, _ = HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"unsupported snapshot version {version}")
+
+            index = {}
+            for position in range(count):
+                name, offset, length, fetched_at, complete = ENTRY.unpack_from(mm, HEADER.size + ENTRY.size * position)
+                index[name.rstrip(b"\0").decode()] = (offset, length, fetched_at, complete)
+        except Exception as e:
+            # Remember the bad file so it is not remapped on every check; the refresh loop replaces it.
+            if mm is not None:
+                mm.close()
+            cls._rejected_inode = inode
+            content_snapshot_logger.error(f"CONTENT_SNAPSHOT_LOAD_ERROR | Inode: {inode} | Error: {str(e)}")
+            return
+
+        previous = cls._mm
+        cls._mm, cls._inode, cls._index = mm, inode, index
+        if previous is not None:
+            previous.close()
+        content_snapshot_logger.info(f"CONTENT_SNAPSHOT_LOADED | Sections: {list(index)}")
+
+    @classmethod
+    async def _refresh_loop(cls, build: Callable[[], Awaitable[Dict[str, Section]]]) -> None:
+        while True:
+            try:
+                if cls._is_due():
+                    await cls._refresh_locked(build)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                Metrics.increment("content_snapshot.refresh_error")
+                content_snapshot_logger.error(f"CONTENT_SNAPSHOT_REFRESH_ERROR | Error: {str(e)}")
+            await asyncio.sleep(CONTENT_SNAPSHOT_CHECK_SECONDS)
+
+    @classmethod
+    async def _refresh_locked(cls, build: Callable[[], Awaitable[Dict[str, Section]]], force: bool = False) -> bool:
+        with open(f"{CONTENT_SNAPSHOT_PATH}.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+
+            try:
+                if not force and not cls._is_due():
+                    return True
+                started = time.perf_counter()
+                sections = await build()
+                if sections:
+                    cls.write(sections)
+                Metrics.observe("content_snapshot.refresh", time.perf_counter() - started)
+                return True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @classmethod
+    def _is_due(cls) -> bool:
+        try:
+            stat = os.stat(CONTENT_SNAPSHOT_PATH)
+        except FileNotFoundError:
+            return True
+
+        now = time.time()
+        if now - stat.st_mtime >= CONTENT_SNAPSHOT_REFRESH_SECONDS:
+            return True
+        cls.reload()
+        if cls._mm is None or stat.st_ino == cls._rejected_inode:
+            return True
+        return any(
+            not complete and now - fetched_at >= SWR_PARTIAL_SOFT_TTL_SECONDS
+            for _, _, fetched_at, complete in cls._index.values()
+        )
@@ -42,4 +42,29 @@ class Suplement(str, Enum):
 class ObjectiveType(str, Enum):
     bulking = "bulking"
     cutting = "cutting"
-    maintenance = "maintenance"
\ No newline at end of file
+    maintenance = "maintenance"
+
+class MeasurementKind(str, Enum):
+    weight = "weight"
+    chest = "chest"
+    waist = "waist"
+    hips = "hips"
+    neck = "neck"
+    leg = "leg"
+    arm = "arm"
+    calf = "calf"
+
+class WeightResolution(str, Enum):
+    raw = "raw"
+    day = "day"
+    week = "week"
+    month = "month"
+
+class PlanView(str, Enum):
+    full = "full"
+    summary = "summary"
+
+class PatchOp(str, Enum):
+    add = "add"
+    remove = "remove"
+    replace = "replace"
@@ -0,0 +1,49 @@
+import importlib.util
+import logging
+from typing import Dict
+
+import httpx
+
+from app.config import HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_MAX_KEEPALIVE_PER_HOST, HTTP_KEEPALIVE_EXPIRY_SECONDS
+
+http_client_logger = logging.getLogger("dreamfit_api.http_client")
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HttpClient:
+    """Pooled async HTTP clients for upstream services, one connection pool per base URL."""
+
+    _clients: Dict[str, httpx.AsyncClient] = {}
+
+    @classmethod
+    def start(cls, *base_urls: str) -> None:
+        for base_url in base_urls:
+            cls.client(base_url)
+
+    @classmethod
+    def client(cls, base_url: str) -> httpx.AsyncClient:
+        client = cls._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE_PER_HOST,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+            cls._clients[base_url] = client
+            http_client_logger.info(f"HTTP_CLIENT_CREATED | BaseURL: {base_url} | HTTP2: {HTTP2_AVAILABLE}")
+        return client
+
+    @classmethod
+    async def stop(cls) -> None:
+        for base_url, client in list(cls._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                http_client_logger.error(f"HTTP_CLIENT_CLOSE_ERROR | BaseURL: {base_url} | Error: {str(e)}")
+        cls._clients.clear()
+        http_client_logger.info("HTTP_CLIENTS_CLOSED")
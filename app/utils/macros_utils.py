@@ -0,0 +1,54 @@
+import math
+import re
+from typing import Annotated, Any, Dict, Union
+
+from pydantic import BeforeValidator
+
+AMOUNT_PATTERN = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:g|kcal)?", re.IGNORECASE)
+
+
+class MacrosUtils:
+    @staticmethod
+    def parse_amount(value: Any) -> Union[int, float]:
+        # Whole amounts are stored as ints and fractional ones as floats, so "35.5g" keeps its
+        # decimal and $toString renders both without a trailing ".0".
+        amount = None
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            amount = value
+        elif isinstance(value, str):
+            match = AMOUNT_PATTERN.fullmatch(value.strip())
+            if match:
+                amount = float(match.group(1).replace(",", "."))
+        if amount is None or not math.isfinite(amount):
+            raise ValueError(f"Invalid macronutrient amount: {value!r}")
+        return int(amount) if float(amount).is_integer() else float(amount)
+
+    @staticmethod
+    def format_grams(value: Union[int, float]) -> str:
+        return f"{value}g"
+
+    @staticmethod
+    def format_calories(value: Union[int, float]) -> str:
+        return str(value)
+
+    @staticmethod
+    def grams_expression(field: str) -> Dict[str, Any]:
+        return {
+            "$cond": [
+                {"$eq": [{"$type": field}, "string"]},
+                field,
+                {"$concat": [{"$toString": field}, "g"]}
+            ]
+        }
+
+    @staticmethod
+    def macros_expression(field: str) -> Dict[str, Any]:
+        return {
+            "protein": MacrosUtils.grams_expression(f"{field}.protein"),
+            "fat": MacrosUtils.grams_expression(f"{field}.fat"),
+            "carbs": MacrosUtils.grams_expression(f"{field}.carbs")
+        }
+
+
+Grams = Annotated[Union[int, float], BeforeValidator(MacrosUtils.parse_amount)]
+Calories = Annotated[Union[int, float], BeforeValidator(MacrosUtils.parse_amount)]
@@ -0,0 +1,34 @@
+import threading
+from typing import Dict, Any
+
+
+class Metrics:
+    _counters: Dict[str, int] = {}
+    _timings: Dict[str, Dict[str, float]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def increment(cls, name: str, value: int = 1) -> None:
+        with cls._lock:
+            cls._counters[name] = cls._counters.get(name, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, seconds: float) -> None:
+        with cls._lock:
+            timing = cls._timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+
+    @classmethod
+    def snapshot(cls) -> Dict[str, Any]:
+        with cls._lock:
+            timings = {
+                name: {
+                    "count": int(timing["count"]),
+                    "avg_ms": round(timing["total"] / timing["count"] * 1000, 3) if timing["count"] else 0.0,
+                    "max_ms": round(timing["max"] * 1000, 3),
+                }
+                for name, timing in cls._timings.items()
+            }
+            return {"counters": dict(cls._counters), "timings": timings}
@@ -0,0 +1,16 @@
+from pymongo import monitoring
+
+from app.utils.metrics import Metrics
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        Metrics.increment("mongo.commands")
+        Metrics.increment(f"mongo.commands.{event.command_name}")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        Metrics.observe(f"mongo.command.{event.command_name}", event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        Metrics.increment(f"mongo.commands.{event.command_name}.failed")
+        Metrics.observe(f"mongo.command.{event.command_name}", event.duration_micros / 1_000_000)
@@ -0,0 +1,38 @@
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict
+
+from fastapi import HTTPException, status
+
+pagination_logger = logging.getLogger("dreamfit_api.pagination_utils")
+
+
+class PaginationUtils:
+    @staticmethod
+    def encode_cursor(values: Dict[str, Any]) -> str:
+        encoded = {
+            key: {"$date": value.isoformat()} if isinstance(value, datetime) else value
+            for key, value in values.items()
+        }
+        raw = json.dumps(encoded, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            decoded = json.loads(raw)
+            if not isinstance(decoded, dict):
+                raise ValueError("cursor is not an object")
+            return {
+                key: datetime.fromisoformat(value["$date"]) if isinstance(value, dict) and "$date" in value else value
+                for key, value in decoded.items()
+            }
+        except (ValueError, TypeError, KeyError) as e:
+            pagination_logger.warning(f"INVALID_CURSOR | Cursor: {cursor[:64]} | Error: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
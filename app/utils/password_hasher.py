@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_TIMEOUT_SECONDS
+from app.utils.auth_utils import AuthUtils
+from app.utils.metrics import Metrics
+
+password_hasher_logger = logging.getLogger("dreamfit_api.password_hasher")
+
+
+def _timed_hash(password: str) -> Tuple[str, float, float]:
+    started_at = time.time()
+    hashed_password = AuthUtils.get_password_hash(password)
+    return hashed_password, started_at, time.time()
+
+
+def _timed_verify(plain_password: str, hashed_password: str) -> Tuple[bool, float, float]:
+    started_at = time.time()
+    is_valid = AuthUtils.verify_password(plain_password, hashed_password)
+    return is_valid, started_at, time.time()
+
+
+class PasswordHasher:
+    """Runs bcrypt in a process pool so hashing never blocks the event loop."""
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _pending = 0
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            password_hasher_logger.info(f"PASSWORD_HASHER_STARTED | Workers: {PASSWORD_HASH_WORKERS}")
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+            password_hasher_logger.info("PASSWORD_HASHER_STOPPED")
+
+    @classmethod
+    async def hash(cls, password: str) -> str:
+        return await cls._run("hash", _timed_hash, password)
+
+    @classmethod
+    async def verify(cls, plain_password: str, hashed_password: str) -> bool:
+        return await cls._run("verify", _timed_verify, plain_password, hashed_password)
+
+    @classmethod
+    async def _run(cls, operation: str, func, *args):
+        if cls._pending >= PASSWORD_HASH_MAX_PENDING:
+            Metrics.increment(f"password_hasher.{operation}.rejected")
+            password_hasher_logger.warning(
+                f"PASSWORD_HASHER_QUEUE_FULL | Operation: {operation} | Pending: {cls._pending}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please try again"
+            )
+
+        cls.start()
+        submitted_at = time.time()
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(cls._executor, func, *args)
+        except BrokenProcessPool:
+            cls._handle_broken_pool(operation)
+
+        cls._pending += 1
+        future.add_done_callback(cls._release)
+
+        try:
+            result, started_at, finished_at = await asyncio.wait_for(
+                asyncio.shield(future),
+                timeout=PASSWORD_HASH_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            Metrics.increment(f"password_hasher.{operation}.timeout")
+            password_hasher_logger.error(
+                f"PASSWORD_HASHER_TIMEOUT | Operation: {operation} | "
+                f"Timeout: {PASSWORD_HASH_TIMEOUT_SECONDS}s | Pending: {cls._pending}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, please try again"
+            )
+        except BrokenProcessPool:
+            cls._handle_broken_pool(operation)
+
+        Metrics.observe(f"password_hasher.{operation}.wait", max(0.0, started_at - submitted_at))
+        Metrics.observe(f"password_hasher.{operation}.execution", finished_at - started_at)
+        return result
+
+    @classmethod
+    def _release(cls, _future) -> None:
+        cls._pending -= 1
+
+    @classmethod
+    def _handle_broken_pool(cls, operation: str) -> None:
+        Metrics.increment(f"password_hasher.{operation}.broken_pool")
+        password_hasher_logger.error(f"PASSWORD_HASHER_POOL_BROKEN | Operation: {operation}")
+        cls.stop()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please try again"
+        )
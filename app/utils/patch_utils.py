@@ -0,0 +1,199 @@
+import logging
+from functools import lru_cache
+from inspect import isclass
+from typing import Any, Dict, List, Set, Tuple, Type, Union, get_args, get_origin
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from app.utils.enums import PatchOp
+
+patch_logger = logging.getLogger("dreamfit_api.patch_utils")
+
+Segment = Union[str, int]
+
+
+@lru_cache(maxsize=64)
+def _adapter(annotation: Any) -> TypeAdapter:
+    return TypeAdapter(annotation)
+
+
+class PatchUtils:
+    @staticmethod
+    def compile(operations: List[Any], model: Type[BaseModel], root_fields: Set[str]) -> Dict[str, Any]:
+        """Compiles JSON Patch operations into one update-pipeline $set stage.
+
+        Array indexes in every operation refer to the document before the patch, so removals,
+        replacements and inserts in the same array are applied together with $filter, $map and
+        $concatArrays instead of in separate writes.
+        """
+        edits: Dict[Segment, Dict[str, Any]] = {}
+        required: Set[str] = set()
+        touched: List[Tuple[Segment, ...]] = []
+
+        for operation in operations:
+            segments, annotation, in_list = PatchUtils._resolve(operation.path, model, root_fields)
+            dotted = ".".join(str(segment) for segment in segments)
+            parent = ".".join(str(segment) for segment in segments[:-1])
+            last = segments[-1]
+
+            if operation.op == PatchOp.remove:
+                if not in_list or last == "-":
+                    PatchUtils._reject(operation.path, "Only array elements can be removed")
+                PatchUtils._node(edits, segments[:-1])["removed"].add(last)
+                required.add(dotted)
+                touched.append(segments)
+
+            elif operation.op == PatchOp.add and in_list:
+                node = PatchUtils._node(edits, segments[:-1])
+                if "push" in node:
+                    PatchUtils._reject(operation.path, "Only one element can be added to an array per patch")
+                node["push"] = (None if last == "-" else last, PatchUtils._validate(operation, annotation))
+                if len(segments) > 2:
+                    required.add(parent)
+                touched.append(segments[:-1])
+
+            else:
+                if last == "-":
+                    PatchUtils._reject(operation.path, "'-' can only be used to add an element")
+                PatchUtils._node(edits, segments)["value"] = PatchUtils._validate(operation, annotation)
+                if len(segments) > 1:
+                    required.add(dotted if in_list else parent)
+                touched.append(segments)
+
+        PatchUtils._reject_overlaps(touched, "Operations in one patch cannot target overlapping paths")
+
+        return {
+            "set": {field: PatchUtils._expression(node, f"${field}", 0) for field, node in edits.items()},
+            "required": sorted(required)
+        }
+
+    @staticmethod
+    def _node(edits: Dict[Segment, Dict[str, Any]], segments: Tuple[Segment, ...]) -> Dict[str, Any]:
+        node = edits.setdefault(segments[0], {"children": {}, "removed": set()})
+        for segment in segments[1:]:
+            node = node["children"].setdefault(segment, {"children": {}, "removed": set()})
+        return node
+
+    @staticmethod
+    def _expression(node: Dict[str, Any], source: Any, depth: int) -> Any:
+        if "value" in node:
+            return {"$literal": node["value"]}
+
+        if "push" in node:
+            array = f"$$array{depth}"
+            position, value = node["push"]
+            if position is None:
+                inserted = {"$concatArrays": [array, [{"$literal": value}]]}
+            else:
+                inserted = {"$concatArrays": [
+                    {"$slice": [array, position]},
+                    [{"$literal": value}],
+                    {"$slice": [array, position, {"$max": [{"$size": array}, 1]}]}
+                ]}
+            return {"$let": {"vars": {f"array{depth}": {"$ifNull": [source, []]}}, "in": inserted}}
+
+        children = node["children"]
+        if node["removed"] or any(isinstance(segment, int) for segment in children):
+            array, index = f"$$array{depth}", f"$$index{depth}"
+            indexes = {"$range": [0, {"$size": array}]}
+            if node["removed"]:
+                indexes = {"$filter": {
+                    "input": indexes,
+                    "as": f"index{depth}",
+                    "cond": {"$not": [{"$in": [index, sorted(node["removed"])]}]}
+                }}
+            element = {"$arrayElemAt": [array, index]}
+            if children:
+                element = {"$switch": {
+                    "branches": [
+                        {
+                            "case": {"$eq": [index, segment]},
+                            "then": PatchUtils._expression(child, {"$arrayElemAt": [array, segment]}, depth + 1)
+                        }
+                        for segment, child in sorted(children.items())
+                    ],
+                    "default": element
+                }}
+            return {"$let": {
+                "vars": {f"array{depth}": source},
+                "in": {"$map": {"input": indexes, "as": f"index{depth}", "in": element}}
+            }}
+
+        document = f"$$document{depth}"
+        return {"$let": {
+            "vars": {f"document{depth}": source},
+            "in": {"$mergeObjects": [
+                document,
+                {
+                    field: PatchUtils._expression(child, f"{document}.{field}", depth + 1)
+                    for field, child in children.items()
+                }
+            ]}
+        }}
+
+    @staticmethod
+    def _resolve(path: str, model: Type[BaseModel], root_fields: Set[str]) -> Tuple[Tuple[Segment, ...], Any, bool]:
+        if not path.startswith("/") or path == "/":
+            PatchUtils._reject(path, "Path must be a JSON pointer")
+
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+        segments: List[Segment] = []
+        annotation: Any = model
+        in_list = False
+
+        for position, token in enumerate(tokens):
+            current = PatchUtils._unwrap_optional(annotation)
+
+            if get_origin(current) is list:
+                if token == "-" and position == len(tokens) - 1:
+                    segments.append(token)
+                elif token.isdigit():
+                    segments.append(int(token))
+                else:
+                    PatchUtils._reject(path, f"'{token}' is not an array index")
+                annotation = get_args(current)[0]
+                in_list = True
+
+            elif isclass(current) and issubclass(current, BaseModel):
+                if token not in current.model_fields or (position == 0 and token not in root_fields):
+                    PatchUtils._reject(path, f"'{token}' cannot be patched")
+                segments.append(token)
+                annotation = current.model_fields[token].annotation
+                in_list = False
+
+            else:
+                PatchUtils._reject(path, f"'{token}' does not exist")
+
+        return tuple(segments), annotation, in_list
+
+    @staticmethod
+    def _reject_overlaps(paths: List[Tuple[Segment, ...]], reason: str) -> None:
+        for index, path in enumerate(paths):
+            for other in paths[index + 1:]:
+                if path[:len(other)] == other or other[:len(path)] == path:
+                    PatchUtils._reject("/" + "/".join(str(segment) for segment in path), reason)
+
+    @staticmethod
+    def _unwrap_optional(annotation: Any) -> Any:
+        if get_origin(annotation) is Union:
+            args = [arg for arg in get_args(annotation) if arg is not type(None)]
+            if len(args) == 1:
+                return args[0]
+        return annotation
+
+    @staticmethod
+    def _validate(operation: Any, annotation: Any) -> Any:
+        adapter = _adapter(annotation)
+        try:
+            return adapter.dump_python(adapter.validate_python(operation.value))
+        except ValidationError as e:
+            PatchUtils._reject(operation.path, str(e.errors(include_url=False)[0]["msg"]))
+
+    @staticmethod
+    def _reject(path: str, reason: str) -> None:
+        patch_logger.warning(f"INVALID_PATCH | Path: {path} | Reason: {reason}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid patch operation at {path}: {reason}"
+        )
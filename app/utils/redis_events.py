@@ -0,0 +1,87 @@
+import asyncio
+import json
+import logging
+from typing import Callable, Dict, List, Optional
+
+from app.config import redis_client
+
+redis_events_logger = logging.getLogger("dreamfit_api.redis_events")
+
+
+class RedisEvents:
+    """Process-wide Redis pub/sub bus shared by every worker."""
+
+    _handlers: Dict[str, List[Callable]] = {}
+    _resync_callbacks: List[Callable] = []
+    _task: Optional[asyncio.Task] = None
+    reconnect_delay_seconds = 2
+
+    @classmethod
+    def subscribe(cls, channel: str, handler: Callable, resync: Callable = None) -> None:
+        cls._handlers.setdefault(channel, []).append(handler)
+        if resync is not None:
+            cls._resync_callbacks.append(resync)
+
+    @classmethod
+    async def publish(cls, channel: str, message: dict) -> None:
+        if redis_client is None:
+            redis_events_logger.warning(f"REDIS_NOT_CONFIGURED | Channel: {channel}")
+            return
+        await redis_client.publish(channel, json.dumps(message))
+
+    @classmethod
+    def start(cls) -> None:
+        if redis_client is None:
+            redis_events_logger.warning("REDIS_NOT_CONFIGURED | Pub/sub listener disabled")
+            return
+        if cls._task is None and cls._handlers:
+            cls._task = asyncio.create_task(cls._listen())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            try:
+                await cls._task
+            except asyncio.CancelledError:
+                pass
+            cls._task = None
+
+    @classmethod
+    async def _listen(cls) -> None:
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.subscribe(*cls._handlers.keys())
+                redis_events_logger.info(f"REDIS_EVENTS_SUBSCRIBED | Channels: {list(cls._handlers.keys())}")
+
+                for resync in cls._resync_callbacks:
+                    await cls._call(resync)
+
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    channel = message["channel"].decode() if isinstance(message["channel"], bytes) else message["channel"]
+                    payload = json.loads(message["data"])
+                    for handler in cls._handlers.get(channel, []):
+                        await cls._call(handler, payload)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                redis_events_logger.error(f"REDIS_EVENTS_CONNECTION_ERROR | Error: {str(e)}")
+                await asyncio.sleep(cls.reconnect_delay_seconds)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    @staticmethod
+    async def _call(callback: Callable, *args) -> None:
+        try:
+            result = callback(*args)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            redis_events_logger.error(f"REDIS_EVENTS_HANDLER_ERROR | Handler: {callback.__qualname__} | Error: {str(e)}")
@@ -0,0 +1,164 @@
+import functools
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response, status
+
+from app.config import redis_client, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_LOCAL_TTL_SECONDS
+from app.utils.compression_utils import CompressionUtils
+from app.utils.metrics import Metrics
+from app.utils.redis_events import RedisEvents
+
+response_cache_logger = logging.getLogger("dreamfit_api.response_cache")
+
+INVALIDATIONS_CHANNEL = "dreamfit:cache-invalidations"
+ENTRY_KEY_PREFIX = "cache:response:"
+TAG_VERSION_KEY_PREFIX = "cache:tag-version:"
+
+
+class ResponseCache:
+    """Two-tier cache of successful GET responses: a per-worker LRU in front of Redis.
+
+    Entries are keyed by route, path and query parameters, principal and accepted encoding,
+    plus the current version of every tag the route declares. Invalidating a tag bumps its
+    version in Redis and announces it over pub/sub, so stale entries are never looked up again
+    and simply expire.
+    """
+
+    _entries: "OrderedDict[str, Tuple[float, bytes, int, Dict[str, str]]]" = OrderedDict()
+    _tag_versions: Dict[str, int] = {}
+
+    @classmethod
+    def start(cls) -> None:
+        if redis_client is None:
+            response_cache_logger.warning("REDIS_NOT_CONFIGURED | Response cache is disabled")
+            return
+        RedisEvents.subscribe(INVALIDATIONS_CHANNEL, cls._on_invalidation, resync=cls.clear)
+
+    @classmethod
+    def cached(cls, name: str, ttl: int, tags: Callable[[dict], List[str]]):
+        def decorator(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                request: Request = kwargs["request"]
+                if redis_client is None:
+                    return await endpoint(*args, **kwargs)
+
+                try:
+                    key = await cls._key_for(name, request, tags(request.path_params))
+                    cached = await cls._get(key)
+                except Exception as e:
+                    response_cache_logger.error(f"RESPONSE_CACHE_READ_ERROR | Route: {name} | Error: {str(e)}")
+                    Metrics.increment(f"response_cache.{name}.error")
+                    return await endpoint(*args, **kwargs)
+
+                if cached is not None:
+                    tier, (body, status_code, headers) = cached
+                    Metrics.increment(f"response_cache.{name}.{tier}_hit")
+                    return Response(content=body, status_code=status_code, headers=headers)
+
+                Metrics.increment(f"response_cache.{name}.miss")
+                response = await endpoint(*args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    try:
+                        await cls._set(key, response, ttl)
+                    except Exception as e:
+                        response_cache_logger.error(f"RESPONSE_CACHE_WRITE_ERROR | Route: {name} | Error: {str(e)}")
+                return response
+
+            return wrapper
+
+        return decorator
+
+    @classmethod
+    async def invalidate(cls, *tags: str) -> None:
+        if redis_client is None or not tags:
+            return
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(f"{TAG_VERSION_KEY_PREFIX}{tag}")
+                versions = await pipe.execute()
+
+            bumped = dict(zip(tags, versions))
+            cls._apply_versions(bumped)
+            await RedisEvents.publish(INVALIDATIONS_CHANNEL, {"versions": bumped})
+            Metrics.increment("response_cache.invalidations", len(tags))
+            response_cache_logger.debug(f"RESPONSE_CACHE_INVALIDATED | Tags: {list(tags)}")
+        except Exception as e:
+            Metrics.increment("response_cache.invalidation_error")
+            response_cache_logger.error(f"RESPONSE_CACHE_INVALIDATION_ERROR | Tags: {list(tags)} | Error: {str(e)}")
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries.clear()
+        cls._tag_versions.clear()
+
+    @classmethod
+    def _on_invalidation(cls, message: dict) -> None:
+        cls._apply_versions(message.get("versions", {}))
+
+    @classmethod
+    def _apply_versions(cls, versions: Dict[str, int]) -> None:
+        if len(cls._tag_versions) > RESPONSE_CACHE_MAX_ENTRIES * 4:
+            cls._tag_versions.clear()
+        for tag, version in versions.items():
+            cls._tag_versions[tag] = max(int(version), cls._tag_versions.get(tag, 0))
+
+    @classmethod
+    async def _key_for(cls, name: str, request: Request, tags: Iterable[str]) -> str:
+        tags = sorted(tags)
+        missing = [tag for tag in tags if tag not in cls._tag_versions]
+        if missing:
+            versions = await redis_client.mget([f"{TAG_VERSION_KEY_PREFIX}{tag}" for tag in missing])
+            cls._apply_versions({tag: int(version or 0) for tag, version in zip(missing, versions)})
+
+        principal = getattr(request.state, "principal", None)
+        parts = [
+            name,
+            json.dumps(request.path_params, sort_keys=True),
+            str(sorted(request.query_params.multi_items())),
+            principal.user_id if principal else "anonymous",
+            "gzip" if CompressionUtils.accepts_gzip(request) else "identity",
+            ",".join(f"{tag}={cls._tag_versions[tag]}" for tag in tags),
+        ]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    @classmethod
+    async def _get(cls, key: str) -> Optional[Tuple[str, Tuple[bytes, int, Dict[str, str]]]]:
+        entry = cls._entries.get(key)
+        if entry is not None:
+            expires_at, body, status_code, headers = entry
+            if expires_at > time.time():
+                cls._entries.move_to_end(key)
+                return "local", (body, status_code, headers)
+            del cls._entries[key]
+
+        raw = await redis_client.get(f"{ENTRY_KEY_PREFIX}{key}")
+        if raw is None:
+            return None
+
+        meta, body = raw.split(b"\n", 1)
+        meta = json.loads(meta)
+        cls._store_local(key, body, meta["status"], meta["headers"], meta["ttl"])
+        return "redis", (body, meta["status"], meta["headers"])
+
+    @classmethod
+    async def _set(cls, key: str, response: Response, ttl: int) -> None:
+        headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+        meta = json.dumps({"status": response.status_code, "headers": headers, "ttl": ttl}).encode()
+        await redis_client.set(f"{ENTRY_KEY_PREFIX}{key}", meta + b"\n" + response.body, ex=ttl)
+        cls._store_local(key, response.body, response.status_code, headers, ttl)
+
+    @classmethod
+    def _store_local(cls, key: str, body: bytes, status_code: int, headers: Dict[str, str], ttl: int) -> None:
+        cls._entries[key] = (time.time() + min(ttl, RESPONSE_CACHE_LOCAL_TTL_SECONDS), body, status_code, headers)
+        cls._entries.move_to_end(key)
+
+        while len(cls._entries) > RESPONSE_CACHE_MAX_ENTRIES:
+            cls._entries.popitem(last=False)
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from app.config import redis_client, SWR_REFRESH_LOCK_SECONDS, SWR_PARTIAL_SOFT_TTL_SECONDS
+from app.utils.metrics import Metrics
+
+swr_cache_logger = logging.getLogger("dreamfit_api.swr_cache")
+
+ENTRY_KEY_PREFIX = "swr:entry:"
+LOCK_KEY_PREFIX = "swr:lock:"
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+STORE_ENTRY_SCRIPT = """
+local current = redis.call("get", KEYS[1])
+if current and cjson.decode(current)["fetched_at"] >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class SWRCache:
+    """Stale-while-revalidate cache for slow-changing upstream data, shared through Redis.
+
+    Entries younger than the soft TTL are served as they are. Between the soft and the hard TTL
+    the stale entry is served while one worker refreshes it in the background. Past the hard TTL
+    callers wait for a refresh, and if the upstream fails the last good entry is served instead.
+    Entries are kept without expiry so the last good snapshot is always available. Values the
+    caller reports as incomplete only stay fresh for a short while, so they are retried sooner.
+    An entry is stamped with the time its load started and never replaces one that started later.
+    """
+
+    _entries: Dict[str, Tuple[float, Any, bool]] = {}
+    _inflight: Dict[str, asyncio.Task] = {}
+    _background: Set[asyncio.Task] = set()
+    poll_interval_seconds = 0.1
+
+    @classmethod
+    async def get(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            soft_ttl: int,
+            hard_ttl: int,
+            is_complete: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, int]:
+        entry = cls._entries.get(key)
+        if entry is None or time.time() - entry[0] >= cls._fresh_for(entry, soft_ttl):
+            entry = await cls._read(key)
+        age = time.time() - entry[0] if entry else None
+
+        if entry is not None and age < cls._fresh_for(entry, soft_ttl):
+            Metrics.increment(f"swr_cache.{key}.fresh")
+            return entry[1], int(age)
+
+        if entry is not None and age < hard_ttl:
+            Metrics.increment(f"swr_cache.{key}.stale")
+            cls._refresh_in_background(key, loader, is_complete)
+            return entry[1], int(age)
+
+        Metrics.increment(f"swr_cache.{key}.miss")
+        try:
+            refreshed = await cls._refresh(key, loader, is_complete, wait_for_peer=True)
+        except Exception as e:
+            if entry is None:
+                raise
+            swr_cache_logger.warning(f"SWR_CACHE_REFRESH_FAILED | Key: {key} | Age: {int(age)}s | Error: {str(e)}")
+            refreshed = None
+
+        if refreshed is None:
+            Metrics.increment(f"swr_cache.{key}.fallback")
+            return entry[1], int(age)
+
+        fetched_at, value, _ = refreshed
+        return value, int(time.time() - fetched_at)
+
+    @classmethod
+    async def refresh(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            is_complete: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[float, Any, bool]:
+        # Forced refreshes follow upstream changes, so they never reuse a load that may have
+        # started before the change, whether in flight in this worker or in a peer.
+        return await cls._load(key, loader, is_complete)
+
+    @classmethod
+    def forget(cls, key: str) -> None:
+        cls._entries.pop(key, None)
+
+    @classmethod
+    def peek(cls, key: str) -> Optional[Any]:
+        entry = cls._entries.get(key)
+        return entry[1] if entry else None
+
+    @staticmethod
+    def _fresh_for(entry: Tuple[float, Any, bool], soft_ttl: int) -> int:
+        return soft_ttl if entry[2] else min(soft_ttl, SWR_PARTIAL_SOFT_TTL_SECONDS)
+
+    @classmethod
+    def _refresh_in_background(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            is_complete: Optional[Callable[[Any], bool]]
+    ) -> None:
+        if key in cls._inflight:
+            return
+
+        task = asyncio.create_task(cls._refresh_quietly(key, loader, is_complete))
+        cls._background.add(task)
+        task.add_done_callback(cls._background.discard)
+
+    @classmethod
+    async def _refresh_quietly(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            is_complete: Optional[Callable[[Any], bool]]
+    ) -> None:
+        try:
+            await cls._refresh(key, loader, is_complete, wait_for_peer=False)
+        except Exception as e:
+            swr_cache_logger.error(f"SWR_CACHE_BACKGROUND_REFRESH_FAILED | Key: {key} | Error: {str(e)}")
+
+    @classmethod
+    async def _refresh(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            is_complete: Optional[Callable[[Any], bool]],
+            wait_for_peer: bool
+    ) -> Optional[Tuple[float, Any, bool]]:
+        task = cls._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(cls._refresh_once(key, loader, is_complete, wait_for_peer))
+            cls._inflight[key] = task
+            task.add_done_callback(lambda _: cls._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def _refresh_once(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            is_complete: Optional[Callable[[Any], bool]],
+            wait_for_peer: bool
+    ) -> Optional[Tuple[float, Any, bool]]:
+        token = uuid.uuid4().hex
+        if not await cls._acquire(key, token):
+            if not wait_for_peer:
+                return None
+            refreshed = await cls._wait_for_peer(key)
+            if refreshed is not None:
+                return refreshed
+
+        try:
+            return await cls._load(key, loader, is_complete)
+        finally:
+            await cls._release(key, token)
+
+    @classmethod
+    async def _load(
+            cls,
+            key: str,
+            loader: Callable[[], Awaitable[Any]],
+            is_complete: Optional[Callable[[Any], bool]]
+    ) -> Tuple[float, Any, bool]:
+        try:
+            started_at, started = time.time(), time.perf_counter()
+            value = await loader()
+            Metrics.observe(f"swr_cache.{key}.refresh", time.perf_counter() - started)
+
+            entry = (started_at, value, is_complete(value) if is_complete else True)
+            current = cls._entries.get(key)
+            if current is None or entry[0] >= current[0]:
+                cls._entries[key] = entry
+            if redis_client is not None:
+                payload = json.dumps({"fetched_at": entry[0], "value": value, "complete": entry[2]})
+                await redis_client.eval(STORE_ENTRY_SCRIPT, 1, f"{ENTRY_KEY_PREFIX}{key}", payload, entry[0])
+            swr_cache_logger.info(f"SWR_CACHE_REFRESHED | Key: {key} | Complete: {entry[2]}")
+            return entry
+        except Exception:
+            Metrics.increment(f"swr_cache.{key}.refresh_error")
+            raise
+
+    @classmethod
+    async def _wait_for_peer(cls, key: str) -> Optional[Tuple[float, Any, bool]]:
+        known = cls._entries.get(key)
+        deadline = time.monotonic() + SWR_REFRESH_LOCK_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(cls.poll_interval_seconds)
+            entry = await cls._read(key)
+            if entry is not None and (known is None or entry[0] > known[0]):
+                return entry
+            try:
+                if not await redis_client.exists(f"{LOCK_KEY_PREFIX}{key}"):
+                    break
+            except Exception as e:
+                swr_cache_logger.error(f"SWR_CACHE_LOCK_CHECK_ERROR | Key: {key} | Error: {str(e)}")
+                break
+        return None
+
+    @classmethod
+    async def _read(cls, key: str) -> Optional[Tuple[float, Any, bool]]:
+        entry = cls._entries.get(key)
+        if redis_client is None:
+            return entry
+
+        try:
+            raw = await redis_client.get(f"{ENTRY_KEY_PREFIX}{key}")
+        except Exception as e:
+            swr_cache_logger.error(f"SWR_CACHE_READ_ERROR | Key: {key} | Error: {str(e)}")
+            return entry
+
+        if raw is not None:
+            stored = json.loads(raw)
+            if entry is None or stored["fetched_at"] > entry[0]:
+                entry = (stored["fetched_at"], stored["value"], stored.get("complete", True))
+                cls._entries[key] = entry
+        return entry
+
+    @classmethod
+    async def _acquire(cls, key: str, token: str) -> bool:
+        if redis_client is None:
+            return True
+        try:
+            return bool(await redis_client.set(
+                f"{LOCK_KEY_PREFIX}{key}", token, nx=True, ex=SWR_REFRESH_LOCK_SECONDS
+            ))
+        except Exception as e:
+            swr_cache_logger.error(f"SWR_CACHE_LOCK_ERROR | Key: {key} | Error: {str(e)}")
+            return True
+
+    @classmethod
+    async def _release(cls, key: str, token: str) -> None:
+        if redis_client is None:
+            return
+        try:
+            await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, f"{LOCK_KEY_PREFIX}{key}", token)
+        except Exception as e:
+            swr_cache_logger.error(f"SWR_CACHE_UNLOCK_ERROR | Key: {key} | Error: {str(e)}")
@@ -0,0 +1,38 @@
+"""Rebuilds the latest_measurements snapshots from the body_measurements history.
+
+Usage: python -m scripts.backfill_latest_measurements [user_id ...]
+
+Without arguments every user with measurement history is rebuilt.
+"""
+import asyncio
+import sys
+
+from beanie import init_beanie
+
+from app.config import db, DOCUMENT_MODELS, sync_indexes
+from app.models.physical_data import BodyMeasurement
+from app.repositories.latest_measurements_repository import LatestMeasurementsRepository
+
+CONCURRENCY = 16
+
+
+async def main(user_ids: list) -> None:
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+    await sync_indexes(DOCUMENT_MODELS)
+
+    if not user_ids:
+        user_ids = await BodyMeasurement.get_motor_collection().distinct("meta.user_id")
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def rebuild(user_id: str) -> None:
+        async with semaphore:
+            snapshot = await LatestMeasurementsRepository.rebuild(user_id)
+            print(f"{user_id} rebuilt with {len(snapshot.measurements)} measurement types")
+
+    await asyncio.gather(*(rebuild(user_id) for user_id in user_ids))
+    print(f"{len(user_ids)} snapshots rebuilt")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
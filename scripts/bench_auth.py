@@ -0,0 +1,57 @@
+"""Micro-benchmark of the per-request cost of require_roles.
+
+Usage: python -m scripts.bench_auth [iterations]
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import timedelta
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DATABASE_NAME", "bench")
+
+from starlette.requests import Request
+
+from app.security.auth_middleware import get_principal, require_roles
+from app.security.token_cache import TokenCache
+from app.utils.auth_utils import AuthUtils
+from app.utils.enums import RoleName
+
+
+def _build_request() -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/bench", "headers": [], "client": ("127.0.0.1", 0)})
+
+
+async def _measure(checker, token: str, iterations: int, use_cache: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        if not use_cache:
+            TokenCache.clear()
+        request = _build_request()
+        principal = await get_principal(request=request, token=token)
+        await checker(request=request, principal=principal)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main(iterations: int):
+    token = AuthUtils.create_token(
+        data={"sub": "bench@dreamfit.app", "userId": "bench-user", "role": RoleName.mentee},
+        expires_delta=timedelta(minutes=30)
+    )
+    checker = require_roles([RoleName.coach, RoleName.mentee])
+
+    uncached = await _measure(checker, token, iterations, use_cache=False)
+    cached = await _measure(checker, token, iterations, use_cache=True)
+
+    print(f"iterations: {iterations}")
+    print(f"jwt.decode every request: {uncached:.2f} us/request")
+    print(f"verified token cache:     {cached:.2f} us/request")
+    print(f"speedup:                  {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,104 @@
+"""Measures event-loop lag while CMS requests are in flight against a slow local CMS.
+
+Compares a blocking HTTP call made inside a coroutine (how ContentService used to call the CMS)
+with the pooled async client the service uses now.
+
+Usage: python -m scripts.bench_event_loop_lag [cms_delay_seconds] [concurrent_requests]
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_DAYS", "7")
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DATABASE_NAME", "bench")
+
+from app.services.content_service import ContentService
+from app.utils.http_client import HttpClient
+
+TICK_SECONDS = 0.01
+BODY = json.dumps({"data": [{"name": "Chest", "workouts": []}]}).encode()
+
+
+def _start_slow_cms(delay: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _blocking_fetch():
+    with urllib.request.urlopen(f"{ContentService.cms_url}/muscular-groups", timeout=30) as response:
+        return json.loads(response.read())["data"]
+
+
+async def _measure(fetch, concurrency: int) -> dict:
+    lags = []
+    running = True
+
+    async def ticker():
+        while running:
+            expected = time.perf_counter() + TICK_SECONDS
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK_SECONDS * 5)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[fetch() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    running = False
+    await ticker_task
+
+    return {
+        "elapsed_s": elapsed,
+        "max_lag_ms": max(lags) * 1000,
+        "ticks": len(lags)
+    }
+
+
+async def main(delay: float, concurrency: int):
+    server = _start_slow_cms(delay)
+    ContentService.cms_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+    HttpClient.start(ContentService.cms_url)
+
+    try:
+        blocking = await _measure(_blocking_fetch, concurrency)
+        pooled = await _measure(ContentService._fetch_workouts, concurrency)
+    finally:
+        await HttpClient.stop()
+        server.shutdown()
+
+    print(f"cms delay: {delay}s | concurrent requests: {concurrency}")
+    for name, result in (("blocking call", blocking), ("pooled async client", pooled)):
+        print(
+            f"{name:20} total {result['elapsed_s']:.2f}s | "
+            f"max loop lag {result['max_lag_ms']:.1f} ms | {result['ticks']} ticks of {TICK_SECONDS * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 0.5,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    ))
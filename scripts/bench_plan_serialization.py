@@ -0,0 +1,95 @@
+"""Compares the model-based and raw-document read paths for a 7-day workout plan.
+
+Needs a reachable MONGO_URI; the plan is inserted into DATABASE_NAME and removed afterwards.
+
+Usage: python -m scripts.bench_plan_serialization [iterations]
+"""
+import asyncio
+import sys
+import time
+
+from beanie import init_beanie
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.config import db
+from app.models.workout_plan import WorkoutPlan
+from app.repositories.workout_plan_repository import WorkoutPlanRepository
+from app.schemas.response_schemas import ResponsePayload
+
+
+def build_plan() -> WorkoutPlan:
+    workout = {
+        "name": "Press banca", "muscularGroup": "Pecho", "sets": "4", "reps": "8-10",
+        "element": "Barra", "weight": {"value": "60", "units": "kg"}, "rest": "90s",
+        "technique": "Drop set", "RIR": "2", "videoUrl": "https://videos.dreamfit.app/press-banca.mp4"
+    }
+    return WorkoutPlan(
+        coach_id="bench-coach",
+        mentee_id="bench-mentee",
+        trainingObjective="Hipertrofia",
+        days=[
+            {
+                "dayNumber": str(day),
+                "muscularGroups": [
+                    {"group": f"Grupo {group}", "workouts": [dict(workout, order=order) for order in range(6)]}
+                    for group in range(3)
+                ]
+            }
+            for day in range(1, 8)
+        ]
+    )
+
+
+async def model_path(plan_id: str) -> bytes:
+    plan = await WorkoutPlanRepository.get_by_id(plan_id)
+    plan_dict = jsonable_encoder(plan)
+    data = {
+        "_id": plan_dict["_id"],
+        "coach_id": plan_dict["coach_id"],
+        "mentee_id": plan_dict["mentee_id"],
+        "created_at": plan_dict["created_at"],
+        "workoutPlan": {
+            "trainingObjective": plan_dict["trainingObjective"],
+            "days": plan_dict["days"]
+        }
+    }
+    return JSONResponse(content=ResponsePayload.create("OK", data)).body
+
+
+async def raw_path(plan_id: str) -> bytes:
+    plan = await WorkoutPlanRepository.get_response_by_id(plan_id)
+    return ResponsePayload.encode("OK", plan)
+
+
+async def measure(path, plan_id: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await path(plan_id)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def main(iterations: int):
+    await init_beanie(database=db, document_models=[WorkoutPlan], skip_indexes=True)
+    plan = await build_plan().insert()
+    plan_id = str(plan.id)
+
+    try:
+        model_body = await model_path(plan_id)
+        raw_body = await raw_path(plan_id)
+        if model_body != raw_body:
+            print("warning: the two paths produced different bodies")
+
+        model = await measure(model_path, plan_id, iterations)
+        raw = await measure(raw_path, plan_id, iterations)
+    finally:
+        await plan.delete()
+
+    print(f"iterations: {iterations} | body: {len(raw_body)} bytes")
+    print(f"model + jsonable_encoder: {model:.2f} us/request")
+    print(f"projected raw document:  {raw:.2f} us/request")
+    print(f"speedup:                 {model / raw:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,141 @@
+"""Runs explain() on every repository query and fails if any of them does a COLLSCAN.
+
+Usage: python -m scripts.check_query_plans
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from beanie import init_beanie
+from bson import ObjectId
+
+from app.config import db, DOCUMENT_MODELS, sync_indexes
+from app.models.user import User
+from app.models.coach_code import CoachCode
+from app.models.coach_profile import CoachProfile
+from app.models.mentee_profile import MenteeProfile
+from app.models.workout_plan import WorkoutPlan
+from app.models.meal_plan import MealPlan
+from app.models.macronutrients import Macronutrients
+from app.models.physical_data import BodyMeasurement
+from app.models.latest_measurements import LatestMeasurements
+from app.repositories.coach_code_repository import CoachCodeRepository
+from app.repositories.coach_profile_repository import CoachProfileRepository
+from app.repositories.latest_measurements_repository import LatestMeasurementsRepository
+from app.repositories.macronutrients_repository import MacronutrientsRepository, LATEST_FIRST
+from app.repositories.meal_plan_repository import MealPlanRepository, LATEST_FIRST as MEAL_LATEST_FIRST
+from app.repositories.mentee_profile_repository import MenteeProfileRepository, COACH_PAGE_SORT
+from app.repositories.physical_data_repository import PhysicalDataRepository, WEIGHT_SORT
+from app.repositories.user_repository import UserRepository
+from app.repositories.workout_plan_repository import WorkoutPlanRepository
+from app.utils.enums import WeightResolution, WeightUnit
+
+SAMPLE_ID = "000000000000000000000000"
+SAMPLE_OBJECT_ID = ObjectId(SAMPLE_ID)
+SAMPLE_EMAIL = "check@dreamfit.app"
+SAMPLE_END = datetime(2025, 1, 1)
+SAMPLE_START = SAMPLE_END - timedelta(days=90)
+
+
+def find_queries() -> list:
+    return [
+        ("UserRepository.get_by_email", User, UserRepository.email_query(SAMPLE_EMAIL), None),
+        ("CoachCodeRepository.get_by_code", CoachCode, CoachCodeRepository.code_query(SAMPLE_ID), None),
+        ("CoachCodeRepository.get_by_user_id", CoachCode, CoachCodeRepository.user_query(SAMPLE_ID), None),
+        ("CoachProfileRepository.get_by_user_id", CoachProfile, CoachProfileRepository.user_query(SAMPLE_ID), None),
+        ("MenteeProfileRepository.get_by_user_id", MenteeProfile, MenteeProfileRepository.user_query(SAMPLE_ID), None),
+        ("MenteeProfileRepository.get_by_coach", MenteeProfile,
+         MenteeProfileRepository.coach_page_query(SAMPLE_ID), COACH_PAGE_SORT),
+        ("MenteeProfileRepository.get_by_coach(name_prefix)", MenteeProfile,
+         MenteeProfileRepository.coach_page_query(SAMPLE_ID, "An"), COACH_PAGE_SORT),
+        ("MenteeProfileRepository.get_by_coach(after)", MenteeProfile,
+         MenteeProfileRepository.coach_page_query(SAMPLE_ID, None, ("Ana", SAMPLE_OBJECT_ID)), COACH_PAGE_SORT),
+        ("MenteeProfileRepository.get_by_coach(name_prefix, after)", MenteeProfile,
+         MenteeProfileRepository.coach_page_query(SAMPLE_ID, "An", ("Ana", SAMPLE_OBJECT_ID)), COACH_PAGE_SORT),
+        ("WorkoutPlanRepository.get_by_mentee_id", WorkoutPlan, WorkoutPlanRepository.mentee_query(SAMPLE_ID), None),
+        ("WorkoutPlanRepository.get_by_coach_id", WorkoutPlan, WorkoutPlanRepository.coach_query(SAMPLE_ID), None),
+        ("WorkoutPlanRepository.get_rendered_by_mentee", WorkoutPlan,
+         WorkoutPlanRepository.mentee_query(SAMPLE_ID), None),
+        ("MealPlanRepository.get_by_mentee_id", MealPlan,
+         MealPlanRepository.mentee_query(SAMPLE_ID), MEAL_LATEST_FIRST),
+        ("MealPlanRepository.get_rendered_by_mentee_id", MealPlan,
+         MealPlanRepository.mentee_query(SAMPLE_ID), MEAL_LATEST_FIRST),
+        ("MacronutrientsRepository.get_by_mentee_id", Macronutrients,
+         MacronutrientsRepository.mentee_query(SAMPLE_ID), LATEST_FIRST),
+        ("MacronutrientsRepository.get_by_coach_id", Macronutrients,
+         MacronutrientsRepository.coach_query(SAMPLE_ID), LATEST_FIRST),
+        ("PhysicalDataRepository.get_weight_records", BodyMeasurement,
+         PhysicalDataRepository.weight_query(SAMPLE_ID, None, None, None), WEIGHT_SORT),
+        ("PhysicalDataRepository.get_weight_records(range, before)", BodyMeasurement,
+         PhysicalDataRepository.weight_query(SAMPLE_ID, SAMPLE_START, SAMPLE_END, SAMPLE_END, SAMPLE_OBJECT_ID),
+         WEIGHT_SORT),
+        ("LatestMeasurementsRepository.get_by_user_id", LatestMeasurements,
+         LatestMeasurementsRepository.user_query(SAMPLE_ID), None),
+    ]
+
+
+def aggregations() -> list:
+    # Called after init_beanie: with_profile_pipeline looks up CoachProfile's collection name.
+    return [
+        ("UserRepository.get_with_profile_by_email", User, UserRepository.with_profile_pipeline(SAMPLE_EMAIL)),
+        ("WorkoutPlanRepository.get_response_by_id", WorkoutPlan,
+         WorkoutPlanRepository.response_pipeline({"_id": SAMPLE_OBJECT_ID}, limit=1)),
+        ("WorkoutPlanRepository.get_response_documents(coach)", WorkoutPlan,
+         WorkoutPlanRepository.response_pipeline(WorkoutPlanRepository.coach_query(SAMPLE_ID))),
+        ("WorkoutPlanRepository.get_response_documents(mentee)", WorkoutPlan,
+         WorkoutPlanRepository.response_pipeline(WorkoutPlanRepository.mentee_query(SAMPLE_ID))),
+        ("WorkoutPlanRepository.get_summaries(coach)", WorkoutPlan,
+         WorkoutPlanRepository.summaries_pipeline(WorkoutPlanRepository.coach_query(SAMPLE_ID))),
+        ("WorkoutPlanRepository.get_summaries(mentee)", WorkoutPlan,
+         WorkoutPlanRepository.summaries_pipeline(WorkoutPlanRepository.mentee_query(SAMPLE_ID))),
+        ("MealPlanRepository.get_response_by_id", MealPlan, MealPlanRepository.response_pipeline(SAMPLE_OBJECT_ID)),
+        ("PhysicalDataRepository.get_latest_measurements", BodyMeasurement,
+         PhysicalDataRepository.latest_measurements_pipeline(SAMPLE_ID)),
+    ] + [
+        (f"PhysicalDataRepository.get_weight_buckets({resolution.value})", BodyMeasurement,
+         PhysicalDataRepository.weight_buckets_pipeline(
+             SAMPLE_ID, resolution, SAMPLE_START, SAMPLE_END, None, 52, WeightUnit.kg
+         ))
+        for resolution in WeightResolution if resolution != WeightResolution.raw
+    ]
+
+
+def find_scans(plan) -> list:
+    scans = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN" or plan.get("strategy") == "NestedLoopJoin":
+            scans.append(plan.get("namespace") or plan.get("from") or plan.get("stage"))
+        for value in plan.values():
+            scans.extend(find_scans(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            scans.extend(find_scans(item))
+    return scans
+
+
+async def main() -> int:
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+    await sync_indexes(DOCUMENT_MODELS)
+
+    failures = 0
+
+    commands = [
+        (name, {"find": model.get_collection_name(), "filter": query, "sort": dict(sort or [])})
+        for name, model, query, sort in find_queries()
+    ] + [
+        (name, {"aggregate": model.get_collection_name(), "pipeline": pipeline, "cursor": {}})
+        for name, model, pipeline in aggregations()
+    ]
+
+    for name, command in commands:
+        explain = await db.command("explain", command, verbosity="queryPlanner")
+        scans = find_scans(explain)
+        failures += bool(scans)
+        print(f"{'COLLSCAN' if scans else 'OK':8} {name} {scans if scans else ''}")
+
+    print(f"{failures} queries without index support")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,84 @@
+"""Counts the MongoDB commands issued when a mentee's workout plan is replaced.
+
+Compares the previous delete / insert / profile re-read + save sequence with
+the upsert + targeted pointer update now used by WorkoutPlanService. Commands
+are counted by the MongoCommandMetrics listener registered on the app client.
+
+Needs a reachable MONGO_URI; the bench documents are removed afterwards.
+
+Usage: python -m scripts.count_plan_round_trips
+"""
+import asyncio
+from uuid import uuid4
+
+from beanie import init_beanie
+
+from app.config import db, DOCUMENT_MODELS
+from app.models.mentee_profile import MenteeProfile
+from app.models.workout_plan import WorkoutPlan
+from app.repositories.mentee_profile_repository import MenteeProfileRepository
+from app.repositories.workout_plan_repository import WorkoutPlanRepository
+from app.utils.metrics import Metrics
+
+MENTEE_ID = "bench-round-trips-mentee"
+
+
+def plan_data() -> dict:
+    return {
+        "coach_id": "bench-round-trips-coach",
+        "mentee_id": MENTEE_ID,
+        "trainingObjective": "Hipertrofia",
+        "days": [{"dayNumber": "1", "muscularGroups": []}],
+        "revision": uuid4().hex
+    }
+
+
+async def previous_sequence() -> None:
+    await WorkoutPlan.find(WorkoutPlan.mentee_id == MENTEE_ID).delete()
+    plan = await WorkoutPlan(**plan_data()).insert()
+    profile = await MenteeProfile.find_one(MenteeProfile.user_id == MENTEE_ID)
+    profile.userPlans.workoutsPlan.active = True
+    profile.userPlans.workoutsPlan.planId = str(plan.id)
+    await profile.save()
+
+
+async def current_sequence() -> None:
+    plan = await WorkoutPlanRepository.replace_for_mentee(plan_data())
+    await MenteeProfileRepository.set_plan_pointer(MENTEE_ID, "workoutsPlan", plan["_id"])
+
+
+async def count_commands(sequence) -> dict:
+    before = Metrics.snapshot()["counters"]
+    await sequence()
+    after = Metrics.snapshot()["counters"]
+    return {
+        name[len("mongo.commands."):]: after[name] - before.get(name, 0)
+        for name in after
+        if name.startswith("mongo.commands.") and after[name] != before.get(name, 0)
+    }
+
+
+async def main():
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+    profile = await MenteeProfile(
+        user_id=MENTEE_ID,
+        name="Bench",
+        last_name="Round Trips",
+        coach_id="bench-round-trips-coach",
+        userPlans={
+            "mealPlan": {"active": False, "planId": ""},
+            "workoutsPlan": {"active": False, "planId": ""}
+        }
+    ).insert()
+
+    try:
+        for label, sequence in (("previous", previous_sequence), ("current", current_sequence)):
+            commands = await count_commands(sequence)
+            print(f"{label}: {sum(commands.values())} round-trips | {commands}")
+    finally:
+        await WorkoutPlan.find(WorkoutPlan.mentee_id == MENTEE_ID).delete()
+        await profile.delete()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""Keeps only the newest workout and meal plan per mentee.
+
+Usage: python -m scripts.dedupe_plans [--dry-run]
+
+Run before deploying the unique mentee_id indexes on workout_plans and
+meal_plans; the mentee profile pointers are moved to the surviving plan.
+"""
+import asyncio
+import sys
+
+from beanie import init_beanie
+
+from app.config import db, DOCUMENT_MODELS, sync_indexes
+from app.models.meal_plan import MealPlan
+from app.models.workout_plan import WorkoutPlan
+from app.repositories.mentee_profile_repository import MenteeProfileRepository
+
+PLAN_POINTERS = [
+    (WorkoutPlan, "workoutsPlan"),
+    (MealPlan, "mealPlan"),
+]
+
+DUPLICATES_PIPELINE = [
+    {"$sort": {"mentee_id": 1, "created_at": -1, "_id": -1}},
+    {"$group": {"_id": "$mentee_id", "plan_ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+    {"$match": {"count": {"$gt": 1}}},
+]
+
+
+async def dedupe(model, plan_type: str, dry_run: bool) -> int:
+    collection = model.get_motor_collection()
+    removed = 0
+
+    async for group in collection.aggregate(DUPLICATES_PIPELINE, allowDiskUse=True):
+        keep, *stale = group["plan_ids"]
+        print(f"{collection.name} | {group['_id']} | keep {keep} | remove {len(stale)}")
+        if dry_run:
+            removed += len(stale)
+            continue
+
+        await MenteeProfileRepository.set_plan_pointer(group["_id"], plan_type, str(keep))
+        result = await collection.delete_many({"_id": {"$in": stale}})
+        removed += result.deleted_count
+
+    return removed
+
+
+async def main(dry_run: bool) -> None:
+    await init_beanie(database=db, document_models=DOCUMENT_MODELS, skip_indexes=True)
+
+    for model, plan_type in PLAN_POINTERS:
+        removed = await dedupe(model, plan_type, dry_run)
+        print(f"{model.get_motor_collection().name}: {removed} duplicate plans {'found' if dry_run else 'removed'}")
+
+    if not dry_run:
+        await sync_indexes(DOCUMENT_MODELS)
+
+
+if __name__ == "__main__":
+    asyncio.run(main("--dry-run" in sys.argv[1:]))
@@ -0,0 +1,118 @@
+"""Streams the legacy per-kind measurement collections into the body_measurements time-series collection.
+
+Usage: python -m scripts.migrate_body_measurements [batch_size]
+
+Each kind records the last legacy (date, _id) it copied in a checkpoint document and resumes after it,
+so the script can be re-run safely even once the app is writing new measurements to the target.
+Legacy collections are left untouched.
+"""
+import asyncio
+import sys
+
+from beanie import init_beanie
+
+from app.config import db, sync_indexes
+from app.models.physical_data import BodyMeasurement
+from app.utils.enums import MeasurementKind
+
+# Beanie ignored the old Settings.collection values, so the legacy data lives under the class names.
+LEGACY_COLLECTIONS = {
+    MeasurementKind.weight: "WeightRecord",
+    MeasurementKind.chest: "ChestMeasurement",
+    MeasurementKind.waist: "WaistMeasurement",
+    MeasurementKind.hips: "HipsMeasurement",
+    MeasurementKind.neck: "NeckMeasurement",
+    MeasurementKind.leg: "LegMeasurement",
+    MeasurementKind.arm: "ArmMeasurement",
+    MeasurementKind.calf: "CalfMeasurement",
+}
+
+MEASUREMENT_FIELDS = ("value", "units", "measurements")
+CHECKPOINT_COLLECTION = "BodyMeasurementMigration"
+
+
+def to_body_measurement(document: dict, kind: MeasurementKind) -> dict:
+    converted = {
+        "_id": document["_id"],
+        "meta": {"user_id": document["user_id"], "kind": kind.value},
+        "date": document["date"],
+    }
+    for field in MEASUREMENT_FIELDS:
+        if field in document:
+            converted[field] = document[field]
+    return converted
+
+
+async def migrate_kind(kind: MeasurementKind, source_name: str, batch_size: int) -> int:
+    source = db[source_name]
+
+    query = {}
+    checkpoint = await db[CHECKPOINT_COLLECTION].find_one({"_id": kind.value})
+    if checkpoint:
+        query = {"$or": [
+            {"date": {"$gt": checkpoint["date"]}},
+            {"date": checkpoint["date"], "_id": {"$gt": checkpoint["last_id"]}}
+        ]}
+
+    migrated = 0
+    batch = []
+    # A crash between a batch insert and its checkpoint write leaves that batch in the target,
+    # so the first batch after a checkpoint is checked for documents that are already there.
+    verify = checkpoint is not None
+    cursor = source.find(query, batch_size=batch_size, allow_disk_use=True).sort([("date", 1), ("_id", 1)])
+    async for document in cursor:
+        batch.append(to_body_measurement(document, kind))
+        if len(batch) >= batch_size:
+            migrated += await insert_batch(kind, batch, verify)
+            verify = False
+            batch = []
+
+    if batch:
+        migrated += await insert_batch(kind, batch, verify)
+
+    return migrated
+
+
+async def insert_batch(kind: MeasurementKind, batch: list, verify: bool) -> int:
+    target = BodyMeasurement.get_motor_collection()
+    if verify:
+        existing = await target.find(
+            {
+                "meta.kind": kind.value,
+                "date": {"$gte": batch[0]["date"], "$lte": batch[-1]["date"]},
+                "_id": {"$in": [document["_id"] for document in batch]}
+            },
+            {"_id": 1}
+        ).to_list(length=None)
+        existing_ids = {document["_id"] for document in existing}
+        pending = [document for document in batch if document["_id"] not in existing_ids]
+    else:
+        pending = batch
+
+    if pending:
+        await target.insert_many(pending, ordered=True)
+
+    last = batch[-1]
+    await db[CHECKPOINT_COLLECTION].update_one(
+        {"_id": kind.value},
+        {"$set": {"date": last["date"], "last_id": last["_id"]}},
+        upsert=True
+    )
+    return len(pending)
+
+
+async def main(batch_size: int) -> None:
+    await init_beanie(database=db, document_models=[BodyMeasurement], skip_indexes=True)
+    await sync_indexes([BodyMeasurement])
+
+    existing = set(await db.list_collection_names())
+    for kind, source_name in LEGACY_COLLECTIONS.items():
+        if source_name not in existing:
+            print(f"{kind.value:8} skipped, {source_name} does not exist")
+            continue
+        migrated = await migrate_kind(kind, source_name, batch_size)
+        print(f"{kind.value:8} migrated {migrated} documents from {source_name}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
@@ -0,0 +1,88 @@
+"""Converts macronutrient grams and calories stored as strings ("150g", "2200") to numbers.
+
+Usage: python -m scripts.migrate_numeric_macros [batch_size]
+
+Only documents that still hold a string amount are selected, so the script can be re-run safely.
+Documents whose amounts cannot be parsed are reported and left untouched.
+"""
+import asyncio
+import sys
+
+from beanie import init_beanie
+from pydantic import ValidationError
+from pymongo import UpdateOne
+
+from app.config import db
+from app.models.macronutrients import Macronutrients
+from app.models.meal_plan import MealPlan
+
+STRING_AMOUNTS = {"$type": "string"}
+
+MIGRATIONS = [
+    (
+        Macronutrients,
+        {"calories", "macros"},
+        {"$or": [
+            {"calories": STRING_AMOUNTS},
+            {"macros.protein": STRING_AMOUNTS},
+            {"macros.fat": STRING_AMOUNTS},
+            {"macros.carbs": STRING_AMOUNTS},
+        ]}
+    ),
+    (
+        MealPlan,
+        {"calories", "dailyMacros", "days"},
+        {"$or": [
+            {"calories": STRING_AMOUNTS},
+            {"dailyMacros.protein": STRING_AMOUNTS},
+            {"dailyMacros.fat": STRING_AMOUNTS},
+            {"dailyMacros.carbs": STRING_AMOUNTS},
+            {"days.meals.mealMacros.protein": STRING_AMOUNTS},
+            {"days.meals.mealMacros.fat": STRING_AMOUNTS},
+            {"days.meals.mealMacros.carbs": STRING_AMOUNTS},
+        ]}
+    ),
+]
+
+
+async def migrate(model, fields: set, query: dict, batch_size: int) -> tuple:
+    collection = model.get_motor_collection()
+    converted = failed = 0
+    last_id = None
+
+    while True:
+        page_query = {"$and": [query, {"_id": {"$gt": last_id}}]} if last_id else query
+        documents = await collection.find(page_query, {"rendered": 0}).sort("_id", 1).limit(batch_size).to_list(
+            length=batch_size
+        )
+        if not documents:
+            break
+        last_id = documents[-1]["_id"]
+
+        operations = []
+        for document in documents:
+            try:
+                numeric = model.model_validate(document).model_dump(include=fields)
+            except ValidationError as e:
+                failed += 1
+                print(f"{collection.name} | {document['_id']} | skipped: {e.errors(include_url=False)[0]['msg']}")
+                continue
+            operations.append(UpdateOne({"_id": document["_id"]}, {"$set": numeric}))
+
+        if operations:
+            result = await collection.bulk_write(operations, ordered=False)
+            converted += result.modified_count
+
+    return converted, failed
+
+
+async def main(batch_size: int) -> None:
+    await init_beanie(database=db, document_models=[Macronutrients, MealPlan], skip_indexes=True)
+
+    for model, fields, query in MIGRATIONS:
+        converted, failed = await migrate(model, fields, query, batch_size)
+        print(f"{model.get_motor_collection().name}: {converted} converted, {failed} skipped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.schemas.workout_plan_schema import CreateWorkoutPlanRequest, PatchOperation
+from app.utils.patch_utils import PatchUtils
+
+PATCHABLE_FIELDS = {"trainingObjective", "days"}
+
+WORKOUT = {
+    "name": "Bench press",
+    "muscularGroup": "Chest",
+    "order": 1,
+    "sets": "4",
+    "reps": "8",
+}
+
+
+def compile_patch(*operations):
+    return PatchUtils.compile(
+        [PatchOperation(**operation) for operation in operations],
+        CreateWorkoutPlanRequest,
+        PATCHABLE_FIELDS
+    )
+
+
+def assert_rejected(*operations, reason):
+    with pytest.raises(HTTPException) as error:
+        compile_patch(*operations)
+    assert error.value.status_code == 422
+    assert reason in error.value.detail
+
+
+def test_append_to_root_array_uses_concat_arrays():
+    day = {"dayNumber": "4", "muscularGroups": []}
+    patch = compile_patch({"op": "add", "path": "/days/-", "value": day})
+
+    assert patch["required"] == []
+    assert patch["set"]["days"] == {"$let": {
+        "vars": {"array0": {"$ifNull": ["$days", []]}},
+        "in": {"$concatArrays": ["$$array0", [{"$literal": day}]]}
+    }}
+
+
+def test_append_to_nested_array_requires_the_array():
+    patch = compile_patch({"op": "add", "path": "/days/0/muscularGroups/1/workouts/-", "value": WORKOUT})
+
+    assert patch["required"] == ["days.0.muscularGroups.1.workouts"]
+    day = patch["set"]["days"]["$let"]["in"]["$map"]["in"]["$switch"]
+    assert [branch["case"] for branch in day["branches"]] == [{"$eq": ["$$index0", 0]}]
+    assert "$concatArrays" in json.dumps(day["branches"][0]["then"])
+
+
+def test_insert_at_index_slices_around_the_position():
+    patch = compile_patch({"op": "add", "path": "/days/2", "value": {"dayNumber": "3", "muscularGroups": []}})
+
+    inserted = patch["set"]["days"]["$let"]["in"]["$concatArrays"]
+    assert inserted[0] == {"$slice": ["$$array0", 2]}
+    assert inserted[2]["$slice"][:2] == ["$$array0", 2]
+
+
+def test_removals_and_replacements_in_one_array_are_one_expression():
+    patch = compile_patch(
+        {"op": "remove", "path": "/days/1"},
+        {"op": "remove", "path": "/days/3"},
+        {"op": "replace", "path": "/days/2/dayNumber", "value": "2"}
+    )
+
+    assert patch["required"] == ["days.1", "days.2", "days.3"]
+    days = patch["set"]["days"]["$let"]["in"]["$map"]
+    assert days["input"]["$filter"]["cond"] == {"$not": [{"$in": ["$$index0", [1, 3]]}]}
+    assert [branch["case"] for branch in days["in"]["$switch"]["branches"]] == [{"$eq": ["$$index0", 2]}]
+
+
+def test_replace_root_field_is_a_literal():
+    patch = compile_patch({"op": "replace", "path": "/trainingObjective", "value": "Strength"})
+
+    assert patch == {"set": {"trainingObjective": {"$literal": "Strength"}}, "required": []}
+
+
+def test_overlapping_paths_are_rejected():
+    assert_rejected(
+        {"op": "replace", "path": "/days/0", "value": {"dayNumber": "1", "muscularGroups": []}},
+        {"op": "replace", "path": "/days/0/dayNumber", "value": "2"},
+        reason="overlapping paths"
+    )
+
+
+def test_add_and_replace_in_the_same_array_are_rejected():
+    assert_rejected(
+        {"op": "add", "path": "/days/0/muscularGroups/-", "value": {"group": "Back", "workouts": []}},
+        {"op": "replace", "path": "/days/0/muscularGroups/0/group", "value": "Legs"},
+        reason="overlapping paths"
+    )
+
+
+def test_two_adds_to_the_same_array_are_rejected():
+    assert_rejected(
+        {"op": "add", "path": "/days/-", "value": {"dayNumber": "5", "muscularGroups": []}},
+        {"op": "add", "path": "/days/0", "value": {"dayNumber": "0", "muscularGroups": []}},
+        reason="Only one element can be added"
+    )
+
+
+def test_remove_inside_a_removed_element_is_rejected():
+    assert_rejected(
+        {"op": "remove", "path": "/days/0"},
+        {"op": "remove", "path": "/days/0/muscularGroups/1"},
+        reason="overlapping paths"
+    )
+
+
+def test_removes_at_different_levels_of_a_nested_array_compile():
+    patch = compile_patch(
+        {"op": "remove", "path": "/days/0"},
+        {"op": "remove", "path": "/days/1/muscularGroups/1"}
+    )
+
+    assert patch["required"] == ["days.0", "days.1.muscularGroups.1"]
+    days = patch["set"]["days"]["$let"]["in"]["$map"]
+    assert days["input"]["$filter"]["cond"] == {"$not": [{"$in": ["$$index0", [0]]}]}
+    assert [branch["case"] for branch in days["in"]["$switch"]["branches"]] == [{"$eq": ["$$index0", 1]}]
+
+
+@pytest.mark.parametrize("path, reason", [
+    ("/days/first", "is not an array index"),
+    ("/days/-1", "is not an array index"),
+    ("/days/0/unknown", "cannot be patched"),
+    ("/trainingObjective/0", "does not exist"),
+    ("days/0", "must be a JSON pointer"),
+    ("/", "must be a JSON pointer"),
+])
+def test_invalid_paths_are_rejected(path, reason):
+    assert_rejected({"op": "replace", "path": path, "value": "x"}, reason=reason)
+
+
+def test_remove_requires_an_array_element():
+    assert_rejected({"op": "remove", "path": "/trainingObjective"}, reason="Only array elements can be removed")
+    assert_rejected({"op": "remove", "path": "/days/-"}, reason="Only array elements can be removed")
+
+
+def test_dash_is_only_valid_for_add():
+    assert_rejected({"op": "replace", "path": "/days/-", "value": {}}, reason="'-' can only be used to add")
+
+
+def test_invalid_values_are_rejected():
+    assert_rejected({"op": "replace", "path": "/days/0/muscularGroups", "value": "Chest"}, reason="/days/0")
+
+
+def test_fields_outside_root_fields_are_rejected():
+    assert_rejected({"op": "replace", "path": "/mentee_id", "value": "someone-else"}, reason="cannot be patched")